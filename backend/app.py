@@ -1,31 +1,40 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import joblib
 import numpy as np
 import pandas as pd
 import random
 from datetime import datetime
 import os
 
+from feature_store import (CIRCUIT_TEMPERATURE_RANGES, CIRCUITS, CONSTRUCTORS, DRIVERS,
+                           numerical_feature_indices)
+from model_registry import ModelRegistry
+from process_stats import process_memory
+from prediction_logger import PredictionLogger
+from response_cache import ResponseCache
+from results_store import ResultsStore
+from tire_strategy import sample_tire_strategies
+from static_payloads import StaticPayload
+from simulation import simulate_race_outcomes, simulate_many_races, DEFAULT_SIMULATION_RUNS, MAX_SIMULATION_RUNS
+
 app = Flask(__name__)
 CORS(app)
 
-# Load enhanced models
-try:
-    models = {
-        'position': joblib.load("models/position_enhanced_model.pkl"),
-        'podium': joblib.load("models/podium_enhanced_model.pkl"),
-        'winner': joblib.load("models/winner_enhanced_model.pkl") if os.path.exists("models/winner_enhanced_model.pkl") else None,
-        'points': joblib.load("models/points_enhanced_model.pkl")
-    }
-    label_encoders = joblib.load("models/enhanced_label_encoders.pkl")
-    scaler = joblib.load("models/feature_scaler.pkl")
-    feature_names = joblib.load("models/feature_names.pkl")
-    print("✅ Enhanced models loaded successfully")
-except FileNotFoundError as e:
-    print(f"⚠️ Enhanced models not found: {e}")
-    print("Please run train_enhanced_model.py first")
-    models = None
+# 'pickle' loads private joblib copies, 'shared' memory-maps the exported arrays
+# so worker processes share them, 'auto' uses 'shared' when an export exists
+MODEL_LOAD_MODE = os.environ.get('MODEL_LOAD_MODE', 'auto')
+
+# Seconds between checks of models/ for a newly published version (0 disables hot reload)
+MODEL_RELOAD_INTERVAL = float(os.environ.get('MODEL_RELOAD_INTERVAL', 30))
+
+# Per-driver prediction log, written off the request thread
+prediction_logger = PredictionLogger(log_dir="logs")
+
+# Full /api/predict responses, keyed by race setup, seed (None if unseeded) and model version
+prediction_cache = ResponseCache(
+    max_entries=int(os.environ.get('PREDICTION_CACHE_SIZE', 256)),
+    ttl_seconds=float(os.environ.get('PREDICTION_CACHE_TTL', 300))
+)
 
 # Updated F1 2025 data with correct driver lineups
 current_teams = {
@@ -168,339 +177,55 @@ circuits_2025 = [
     {"name": "Yas Marina Circuit", "country": "UAE", "round": 24, "date": "2025-12-07"}
 ]
 
-def get_weather_features(circuit_name, weather):
+# Air temperature (°C) for circuits without a known temperature range
+UNKNOWN_CIRCUIT_TEMPERATURE = 20
+
+def make_request_rng(seed=None):
+    """Independent random stream for one request; seeded requests are fully reproducible"""
+    return np.random.default_rng(seed)
+
+def get_weather_features(circuit_name, weather, rng=None):
     """Generate realistic weather-related features based on circuit location and season"""
-    temp_map = {
-        'Bahrain International Circuit': random.randint(25, 35),
-        'Jeddah Corniche Circuit': random.randint(28, 38),
-        'Albert Park Circuit': random.randint(18, 28),
-        'Suzuka Circuit': random.randint(15, 25),
-        'Shanghai International Circuit': random.randint(12, 22),
-        'Miami International Autodrome': random.randint(26, 35),
-        'Imola': random.randint(16, 26),
-        'Monaco Circuit': random.randint(18, 28),
-        'Circuit de Barcelona-Catalunya': random.randint(16, 26),
-        'Circuit Gilles Villeneuve': random.randint(12, 22),
-        'Red Bull Ring': random.randint(14, 24),
-        'Silverstone Circuit': random.randint(12, 22),
-        'Hungaroring': random.randint(18, 30),
-        'Circuit de Spa-Francorchamps': random.randint(10, 20),
-        'Circuit Zandvoort': random.randint(12, 22),
-        'Monza Circuit': random.randint(16, 26),
-        'Marina Bay Street Circuit': random.randint(26, 32),
-        'Baku City Circuit': random.randint(20, 30),
-        'Circuit of the Americas': random.randint(18, 28),
-        'Autódromo Hermanos Rodríguez': random.randint(16, 24),
-        'Interlagos': random.randint(18, 28),
-        'Las Vegas Strip Circuit': random.randint(10, 25),
-        'Losail International Circuit': random.randint(22, 32),
-        'Yas Marina Circuit': random.randint(24, 32)
-    }
+    if rng is None:
+        rng = make_request_rng()
     
-    temperature = temp_map.get(circuit_name, 20)
+    if circuit_name in CIRCUIT_TEMPERATURE_RANGES:
+        low, high = CIRCUIT_TEMPERATURE_RANGES[circuit_name]
+        temperature = int(rng.integers(low, high + 1))
+    else:
+        temperature = UNKNOWN_CIRCUIT_TEMPERATURE
     
     if weather == "Wet":
-        humidity = random.uniform(80, 95)
-        wind_speed = random.uniform(10, 20)
+        humidity = float(rng.uniform(80, 95))
+        wind_speed = float(rng.uniform(10, 20))
     elif weather == "Mixed":
-        humidity = random.uniform(60, 85)
-        wind_speed = random.uniform(5, 15)
+        humidity = float(rng.uniform(60, 85))
+        wind_speed = float(rng.uniform(5, 15))
     else:
-        humidity = random.uniform(30, 70)
-        wind_speed = random.uniform(0, 10)
+        humidity = float(rng.uniform(30, 70))
+        wind_speed = float(rng.uniform(0, 10))
     
-    track_temp = temperature + random.uniform(5, 25)
+    track_temp = temperature + float(rng.uniform(5, 25))
     
     return temperature, humidity, wind_speed, track_temp
 
-def get_personalized_tire_strategy(driver, constructor, grid_position, weather, circuit_name):
+def get_personalized_tire_strategy(driver, constructor, grid_position, weather, circuit_name, rng=None):
     """
     Generate personalized tire strategy based on driver personality, 
     team strategy, grid position, weather, and circuit characteristics
     """
+    if rng is None:
+        rng = make_request_rng()
     
-    # Driver personality profiles based on real F1 characteristics
-    driver_profiles = {
-        # Aggressive risk-takers
-        'Max Verstappen': {'aggression': 0.9, 'risk_tolerance': 0.85, 'adaptability': 0.9},
-        'Charles Leclerc': {'aggression': 0.85, 'risk_tolerance': 0.8, 'adaptability': 0.8},
-        'Lando Norris': {'aggression': 0.75, 'risk_tolerance': 0.7, 'adaptability': 0.85},
-        'Pierre Gasly': {'aggression': 0.8, 'risk_tolerance': 0.75, 'adaptability': 0.8},
-        
-        # Strategic and calculated
-        'Lewis Hamilton': {'aggression': 0.7, 'risk_tolerance': 0.6, 'adaptability': 0.95},
-        'Fernando Alonso': {'aggression': 0.75, 'risk_tolerance': 0.8, 'adaptability': 0.95},
-        'George Russell': {'aggression': 0.6, 'risk_tolerance': 0.5, 'adaptability': 0.8},
-        'Oscar Piastri': {'aggression': 0.65, 'risk_tolerance': 0.6, 'adaptability': 0.8},
-        
-        # Conservative but opportunistic
-        'Carlos Sainz': {'aggression': 0.7, 'risk_tolerance': 0.65, 'adaptability': 0.75},
-        'Alex Albon': {'aggression': 0.6, 'risk_tolerance': 0.55, 'adaptability': 0.7},
-        'Nico Hülkenberg': {'aggression': 0.65, 'risk_tolerance': 0.6, 'adaptability': 0.8},
-        'Esteban Ocon': {'aggression': 0.6, 'risk_tolerance': 0.55, 'adaptability': 0.7},
-        
-        # Inexperienced but eager
-        'Kimi Antonelli': {'aggression': 0.8, 'risk_tolerance': 0.9, 'adaptability': 0.6},
-        'Oliver Bearman': {'aggression': 0.75, 'risk_tolerance': 0.8, 'adaptability': 0.65},
-        'Franco Colapinto': {'aggression': 0.7, 'risk_tolerance': 0.75, 'adaptability': 0.6},
-        'Gabriel Bortoleto': {'aggression': 0.7, 'risk_tolerance': 0.8, 'adaptability': 0.6},
-        'Isack Hadjar': {'aggression': 0.75, 'risk_tolerance': 0.8, 'adaptability': 0.6},
-        'Liam Lawson': {'aggression': 0.8, 'risk_tolerance': 0.75, 'adaptability': 0.65},
-        
-        # Steady and consistent
-        'Lance Stroll': {'aggression': 0.5, 'risk_tolerance': 0.4, 'adaptability': 0.6},
-        'Yuki Tsunoda': {'aggression': 0.7, 'risk_tolerance': 0.7, 'adaptability': 0.65},
-    }
-    
-    # Team strategy philosophies based on real F1 team approaches
-    team_strategies = {
-        'Red Bull Racing': {'aggression': 0.85, 'risk_tolerance': 0.8, 'innovation': 0.9},
-        'Ferrari': {'aggression': 0.8, 'risk_tolerance': 0.75, 'innovation': 0.7},  # Sometimes strategic errors
-        'McLaren': {'aggression': 0.7, 'risk_tolerance': 0.65, 'innovation': 0.85},
-        'Mercedes': {'aggression': 0.6, 'risk_tolerance': 0.5, 'innovation': 0.8},  # Very calculated
-        'Aston Martin': {'aggression': 0.7, 'risk_tolerance': 0.6, 'innovation': 0.8},
-        'Alpine': {'aggression': 0.75, 'risk_tolerance': 0.7, 'innovation': 0.7},
-        'Williams': {'aggression': 0.6, 'risk_tolerance': 0.8, 'innovation': 0.6},  # Risk due to position
-        'Haas': {'aggression': 0.65, 'risk_tolerance': 0.75, 'innovation': 0.5},
-        'RB': {'aggression': 0.75, 'risk_tolerance': 0.7, 'innovation': 0.75},  # Sister team influence
-        'Kick Sauber': {'aggression': 0.7, 'risk_tolerance': 0.8, 'innovation': 0.6},
-    }
-    
-    # Circuit characteristics affecting strategy
-    circuit_strategy_factors = {
-        # Overtaking difficulty affects strategy aggression
-        'Monaco Circuit': {'overtaking_difficulty': 0.95, 'tire_wear': 0.3, 'strategy_importance': 0.9},
-        'Hungaroring': {'overtaking_difficulty': 0.85, 'tire_wear': 0.4, 'strategy_importance': 0.85},
-        'Marina Bay Street Circuit': {'overtaking_difficulty': 0.8, 'tire_wear': 0.5, 'strategy_importance': 0.8},
-        
-        # High tire wear circuits
-        'Circuit de Spa-Francorchamps': {'overtaking_difficulty': 0.3, 'tire_wear': 0.8, 'strategy_importance': 0.7},
-        'Silverstone Circuit': {'overtaking_difficulty': 0.4, 'tire_wear': 0.75, 'strategy_importance': 0.7},
-        'Circuit de Barcelona-Catalunya': {'overtaking_difficulty': 0.7, 'tire_wear': 0.6, 'strategy_importance': 0.8},
-        
-        # Power circuits with DRS effectiveness
-        'Monza Circuit': {'overtaking_difficulty': 0.2, 'tire_wear': 0.4, 'strategy_importance': 0.5},
-        'Baku City Circuit': {'overtaking_difficulty': 0.3, 'tire_wear': 0.5, 'strategy_importance': 0.6},
-        
-        # Balanced circuits
-        'Circuit Gilles Villeneuve': {'overtaking_difficulty': 0.5, 'tire_wear': 0.6, 'strategy_importance': 0.6},
-        'Circuit of the Americas': {'overtaking_difficulty': 0.4, 'tire_wear': 0.7, 'strategy_importance': 0.65},
-    }
-    
-    # Get driver and team characteristics
-    driver_profile = driver_profiles.get(driver, {'aggression': 0.6, 'risk_tolerance': 0.6, 'adaptability': 0.6})
-    team_strategy = team_strategies.get(constructor, {'aggression': 0.6, 'risk_tolerance': 0.6, 'innovation': 0.6})
-    circuit_factors = circuit_strategy_factors.get(circuit_name, {'overtaking_difficulty': 0.5, 'tire_wear': 0.6, 'strategy_importance': 0.6})
-    
-    # Calculate combined strategy factors
-    combined_aggression = (driver_profile['aggression'] + team_strategy['aggression']) / 2
-    combined_risk = (driver_profile['risk_tolerance'] + team_strategy['risk_tolerance']) / 2
-    
-    # Grid position influence on strategy
-    if grid_position <= 3:
-        # Front runners - more conservative, protect position
-        strategy_aggression = combined_aggression * 0.7
-        alternative_strategy_chance = 0.1
-    elif grid_position <= 6:
-        # Good starting position - balanced approach
-        strategy_aggression = combined_aggression * 0.85
-        alternative_strategy_chance = 0.2
-    elif grid_position <= 10:
-        # Midfield - slightly more aggressive
-        strategy_aggression = combined_aggression * 1.0
-        alternative_strategy_chance = 0.35
-    else:
-        # Back of grid - high risk, high reward
-        strategy_aggression = combined_aggression * 1.3
-        alternative_strategy_chance = 0.5
-    
-    # Adjust for circuit characteristics
-    if circuit_factors['overtaking_difficulty'] > 0.8:
-        # Hard to overtake - more aggressive strategy needed
-        strategy_aggression *= 1.2
-        alternative_strategy_chance += 0.15
-    
-    # Weather-based strategy selection
-    if weather == "Wet":
-        wet_strategies = {
-            'conservative': [
-                "Full Wet → Intermediate → Medium",
-                "Intermediate → Medium",
-                "Full Wet → Intermediate"
-            ],
-            'aggressive': [
-                "Intermediate → Soft (risky dry gamble)",
-                "Full Wet → Medium (early switch)",
-                "Intermediate → Full Wet → Soft"
-            ],
-            'alternative': [
-                "Start on Intermediates (if others on Full Wet)",
-                "Full Wet → Hard (long stint strategy)",
-                "Intermediate → Hard → Soft"
-            ]
-        }
-        
-        # Hamilton and Alonso are wet weather masters - more aggressive in wet
-        if driver in ['Lewis Hamilton', 'Fernando Alonso', 'Max Verstappen']:
-            strategy_aggression *= 1.2
-        
-        if random.random() < alternative_strategy_chance:
-            return random.choice(wet_strategies['alternative'])
-        elif strategy_aggression > 0.7:
-            return random.choice(wet_strategies['aggressive'])
-        else:
-            return random.choice(wet_strategies['conservative'])
-    
-    elif weather == "Mixed":
-        mixed_strategies = {
-            'conservative': [
-                "Intermediate → Medium → Hard",
-                "Intermediate → Hard",
-                "Medium → Hard (if track dries quickly)"
-            ],
-            'aggressive': [
-                "Intermediate → Soft → Medium",
-                "Soft → Intermediate → Soft (double switch)",
-                "Medium → Soft (aggressive dry switch)"
-            ],
-            'alternative': [
-                "Hard → Intermediate (reverse strategy)",
-                "Intermediate → Soft → Hard",
-                "Start on Mediums (dry gamble)"
-            ]
-        }
-        
-        if random.random() < alternative_strategy_chance:
-            return random.choice(mixed_strategies['alternative'])
-        elif strategy_aggression > 0.7:
-            return random.choice(mixed_strategies['aggressive'])
-        else:
-            return random.choice(mixed_strategies['conservative'])
-    
-    else:  # Dry weather
-        # High tire wear circuits favor different strategies
-        if circuit_factors['tire_wear'] > 0.7:
-            # High degradation circuits
-            high_deg_strategies = {
-                'conservative': [
-                    "Medium → Hard",
-                    "Hard → Medium",
-                    "Medium → Medium"
-                ],
-                'aggressive': [
-                    "Soft → Medium → Hard",
-                    "Soft → Hard",
-                    "Medium → Soft (undercut attempt)"
-                ],
-                'alternative': [
-                    "Hard → Soft (reverse strategy)",
-                    "Soft → Medium → Medium",
-                    "Medium → Hard → Soft"
-                ]
-            }
-            strategies = high_deg_strategies
-        else:
-            # Normal/low degradation circuits
-            normal_strategies = {
-                'conservative': [
-                    "Medium → Hard",
-                    "Soft → Medium",
-                    "Hard → Medium"
-                ],
-                'aggressive': [
-                    "Soft → Soft (double stint on softs)",
-                    "Soft → Hard (long second stint)",
-                    "Medium → Soft (late attack)"
-                ],
-                'alternative': [
-                    "Hard → Soft (opposite to field)",
-                    "Soft → Medium → Soft",
-                    "Medium → Medium"
-                ]
-            }
-            strategies = normal_strategies
-        
-        # Mercedes historically conservative, Red Bull more aggressive
-        if constructor == 'Mercedes':
-            strategy_aggression *= 0.8
-        elif constructor == 'Red Bull Racing':
-            strategy_aggression *= 1.1
-        elif constructor == 'Ferrari':
-            # Ferrari sometimes makes questionable strategy calls
-            if random.random() < 0.15:
-                return "Hard → Hard (Ferrari master plan 🤔)"
-        
-        # Special driver considerations
-        if driver == 'Max Verstappen' and grid_position > 5:
-            # Verstappen often goes aggressive when starting behind
-            strategy_aggression *= 1.3
-        elif driver == 'Lewis Hamilton' and circuit_factors['strategy_importance'] > 0.8:
-            # Hamilton excels at strategy-critical circuits
-            strategy_aggression *= 1.1
-        
-        if random.random() < alternative_strategy_chance:
-            return random.choice(strategies['alternative'])
-        elif strategy_aggression > 0.75:
-            return random.choice(strategies['aggressive'])
-        else:
-            return random.choice(strategies['conservative'])
+    return sample_tire_strategies([driver], [constructor], [grid_position], weather, circuit_name, rng)[0]
 
 def get_realistic_driver_performance(driver_name):
     """Enhanced driver performance with 2025 season realism"""
-    
-    # Updated driver performance data for 2025 season
-    driver_data = {
-        # Top Tier - Championship contenders
-        'Max Verstappen': {'experience': 10, 'form': 1.5, 'quali_gap': -0.4, 'win_factor': 1.4},
-        'Lewis Hamilton': {'experience': 18, 'form': 3.2, 'quali_gap': -0.1, 'win_factor': 1.3},
-        'Charles Leclerc': {'experience': 7, 'form': 2.8, 'quali_gap': -0.2, 'win_factor': 1.25},
-        'Lando Norris': {'experience': 6, 'form': 2.1, 'quali_gap': -0.25, 'win_factor': 1.2},
-        
-        # Second Tier - Regular podium contenders  
-        'George Russell': {'experience': 4, 'form': 4.1, 'quali_gap': 0.0, 'win_factor': 1.15},
-        'Fernando Alonso': {'experience': 23, 'form': 5.3, 'quali_gap': 0.1, 'win_factor': 1.2},
-        'Oscar Piastri': {'experience': 2, 'form': 3.4, 'quali_gap': -0.1, 'win_factor': 1.1},
-        'Carlos Sainz': {'experience': 10, 'form': 4.8, 'quali_gap': 0.2, 'win_factor': 1.1},
-        
-        # Midfield - Occasional points
-        'Pierre Gasly': {'experience': 7, 'form': 7.2, 'quali_gap': 0.3, 'win_factor': 1.0},
-        'Alex Albon': {'experience': 5, 'form': 8.5, 'quali_gap': 0.25, 'win_factor': 0.95},
-        'Nico Hülkenberg': {'experience': 15, 'form': 9.2, 'quali_gap': 0.15, 'win_factor': 0.95},
-        'Esteban Ocon': {'experience': 8, 'form': 8.7, 'quali_gap': 0.3, 'win_factor': 0.9},
-        
-        # Lower midfield
-        'Lance Stroll': {'experience': 8, 'form': 11.8, 'quali_gap': 0.4, 'win_factor': 0.85},
-        'Yuki Tsunoda': {'experience': 4, 'form': 10.1, 'quali_gap': 0.35, 'win_factor': 0.9},
-        
-        # Rookies and backmarkers
-        'Kimi Antonelli': {'experience': 1, 'form': 12.5, 'quali_gap': 0.6, 'win_factor': 0.8},
-        'Oliver Bearman': {'experience': 1, 'form': 14.2, 'quali_gap': 0.7, 'win_factor': 0.8},
-        'Franco Colapinto': {'experience': 1, 'form': 15.1, 'quali_gap': 0.8, 'win_factor': 0.75},
-        'Gabriel Bortoleto': {'experience': 1, 'form': 16.3, 'quali_gap': 0.9, 'win_factor': 0.7},
-        'Isack Hadjar': {'experience': 1, 'form': 15.8, 'quali_gap': 0.85, 'win_factor': 0.75},
-        'Liam Lawson': {'experience': 2, 'form': 13.9, 'quali_gap': 0.55, 'win_factor': 0.85}
-    }
-    
-    return driver_data.get(driver_name, {'experience': 3, 'form': 15.0, 'quali_gap': 0.8, 'win_factor': 0.7})
+    return DRIVERS.get(driver_name)
 
 def get_realistic_constructor_performance(constructor_name):
     """Updated constructor performance for 2025 season"""
-    
-    # 2025 season constructor competitiveness
-    constructor_standings = {
-        'McLaren': {'standing': 1, 'efficiency': 0.98, 'pace_factor': 1.0},
-        'Ferrari': {'standing': 2, 'efficiency': 0.95, 'pace_factor': 0.98},
-        'Red Bull Racing': {'standing': 3, 'efficiency': 0.93, 'pace_factor': 0.96},
-        'Mercedes': {'standing': 4, 'efficiency': 0.90, 'pace_factor': 0.94},
-        'Aston Martin': {'standing': 5, 'efficiency': 0.85, 'pace_factor': 0.88},
-        'Alpine': {'standing': 6, 'efficiency': 0.82, 'pace_factor': 0.85},
-        'Williams': {'standing': 9, 'efficiency': 0.78, 'pace_factor': 0.82},
-        'Haas': {'standing': 7, 'efficiency': 0.80, 'pace_factor': 0.83},
-        'RB': {'standing': 8, 'efficiency': 0.79, 'pace_factor': 0.84},
-        'Kick Sauber': {'standing': 10, 'efficiency': 0.75, 'pace_factor': 0.80}
-    }
-    
-    return constructor_standings.get(constructor_name, {'standing': 10, 'efficiency': 0.75, 'pace_factor': 0.80})
+    return CONSTRUCTORS.get(constructor_name)
 
 def calculate_realistic_win_probability(driver, constructor, grid_position, weather):
     """Calculate realistic win probability based on multiple factors"""
@@ -509,13 +234,7 @@ def calculate_realistic_win_probability(driver, constructor, grid_position, weat
     constructor_perf = get_realistic_constructor_performance(constructor)
     
     # Base probability from constructor competitiveness
-    base_prob_map = {
-        'McLaren': 25, 'Ferrari': 22, 'Red Bull Racing': 20, 'Mercedes': 18,
-        'Aston Martin': 8, 'Alpine': 4, 'Williams': 2, 'Haas': 1,
-        'RB': 1.5, 'Kick Sauber': 0.5
-    }
-    
-    base_prob = base_prob_map.get(constructor, 1.0)
+    base_prob = constructor_perf['base_win_probability']
     
     # Apply driver skill factor
     driver_factor = driver_perf['win_factor']
@@ -546,19 +265,7 @@ def calculate_realistic_win_probability(driver, constructor, grid_position, weat
 
 def get_circuit_features(circuit_name):
     """Get circuit-specific characteristics"""
-    circuit_data = {
-        'Monaco Circuit': {'type': 'Street', 'drs_zones': 1, 'lap_length': 3.337},
-        'Marina Bay Street Circuit': {'type': 'Street', 'drs_zones': 3, 'lap_length': 5.063},
-        'Baku City Circuit': {'type': 'Street', 'drs_zones': 2, 'lap_length': 6.003},
-        'Jeddah Corniche Circuit': {'type': 'Street', 'drs_zones': 3, 'lap_length': 6.174},
-        'Las Vegas Strip Circuit': {'type': 'Street', 'drs_zones': 2, 'lap_length': 6.201},
-        'Monza Circuit': {'type': 'Power', 'drs_zones': 2, 'lap_length': 5.793},
-        'Silverstone Circuit': {'type': 'Balanced', 'drs_zones': 2, 'lap_length': 5.891},
-        'Hungaroring': {'type': 'Twisty', 'drs_zones': 1, 'lap_length': 4.381},
-        'Circuit de Spa-Francorchamps': {'type': 'Power', 'drs_zones': 2, 'lap_length': 7.004}
-    }
-    
-    return circuit_data.get(circuit_name, {'type': 'Balanced', 'drs_zones': 2, 'lap_length': 5.0})
+    return CIRCUITS.get(circuit_name)
 
 def get_points_for_position(position):
     """Get F1 points for a given position"""
@@ -568,227 +275,7 @@ def get_points_for_position(position):
     }
     return points_system.get(position, 0)
 
-@app.route('/api/teams', methods=['GET'])
-def get_teams():
-    return jsonify(current_teams)
-
-@app.route('/api/circuits', methods=['GET'])
-def get_circuits():
-    return jsonify(circuits_2025)
-
-@app.route('/api/predict', methods=['POST'])
-def predict_race():
-    if not models:
-        return jsonify({"error": "Models not loaded. Please run train_enhanced_model.py first"}), 500
-    
-    try:
-        data = request.json
-        predictions = []
-        
-        # Get race conditions
-        circuit = data['circuit']
-        weather = data['weather']
-        temp, humidity, wind, track_temp = get_weather_features(circuit, weather)
-        circuit_features = get_circuit_features(circuit)
-        
-        # Store win probabilities for normalization
-        all_win_probs = []
-        
-        for entry in data['entries']:
-            driver = entry['driver']
-            constructor = entry['constructor']
-            grid = entry['grid']
-            
-            try:
-                # Get enhanced features
-                driver_features = get_realistic_driver_performance(driver)
-                constructor_features = get_realistic_constructor_performance(constructor)
-                
-                # Encode categorical variables safely
-                try:
-                    driver_encoded = label_encoders['driver'].transform([driver])[0]
-                except (ValueError, KeyError):
-                    driver_encoded = 0
-                
-                try:
-                    constructor_encoded = label_encoders['constructor'].transform([constructor])[0]
-                except (ValueError, KeyError):
-                    constructor_encoded = 0
-                
-                try:
-                    circuit_encoded = label_encoders['circuit'].transform([circuit])[0]
-                except (ValueError, KeyError):
-                    circuit_encoded = 0
-                
-                try:
-                    weather_encoded = label_encoders['weather'].transform([weather])[0]
-                except (ValueError, KeyError):
-                    weather_encoded = 0
-                
-                # Generate personalized tire strategy
-                tire_strategy = get_personalized_tire_strategy(driver, constructor, grid, weather, circuit)
-                
-                try:
-                    tire_strategy_encoded = label_encoders['tire_strategy'].transform([tire_strategy])[0]
-                except (ValueError, KeyError):
-                    tire_strategy_encoded = 0
-                
-                try:
-                    circuit_type_encoded = label_encoders['circuit_type'].transform([circuit_features['type']])[0]
-                except (ValueError, KeyError):
-                    circuit_type_encoded = 0
-                
-                # Build feature vector matching the enhanced model
-                features = [
-                    grid,  # grid position
-                    constructor_encoded,  # constructor
-                    circuit_encoded,  # circuit
-                    driver_encoded,  # driver
-                    weather_encoded,  # weather
-                    tire_strategy_encoded,  # tire strategy
-                    temp,  # temperature
-                    humidity,  # humidity
-                    wind,  # wind speed
-                    track_temp,  # track temperature
-                    driver_features['experience'],  # driver experience
-                    driver_features['form'],  # recent form
-                    driver_features['quali_gap'],  # qualifying gap
-                    constructor_features['standing'],  # constructor standing
-                    constructor_features['efficiency'],  # budget efficiency
-                    circuit_type_encoded,  # circuit type
-                    circuit_features['drs_zones'],  # DRS zones
-                    circuit_features['lap_length'],  # lap length
-                    random.randint(0, 8),  # safety car laps
-                    random.uniform(2.0, 4.5)  # pit time
-                ]
-                
-                # Scale numerical features
-                feature_array = np.array(features).reshape(1, -1)
-                numerical_indices = [6, 7, 8, 9, 10, 11, 12, 15, 17, 19]  # indices of numerical features
-                feature_array_scaled = feature_array.copy()
-                
-                if scaler and len(numerical_indices) > 0:
-                    try:
-                        feature_array_scaled[:, numerical_indices] = scaler.transform(feature_array[:, numerical_indices])
-                    except:
-                        pass  # Use unscaled if scaling fails
-                
-                # Make predictions using enhanced models
-                try:
-                    position_pred = models['position'].predict(feature_array_scaled)[0]
-                except:
-                    # Fallback position prediction based on grid and performance
-                    position_pred = max(1, min(20, grid + random.randint(-3, 5)))
-                
-                # Calculate realistic win probability
-                win_prob = calculate_realistic_win_probability(driver, constructor, grid, weather)
-                all_win_probs.append(win_prob)
-                
-                predictions.append({
-                    'driver': driver,
-                    'constructor': constructor,
-                    'grid': grid,
-                    'predicted_position': max(1, min(20, round(position_pred))),
-                    'podium_chance': False,  # Will be set based on final position
-                    'points_chance': False,  # Will be set based on final position
-                    'points_earned': 0,  # Will be calculated based on final position
-                    'win_probability': round(win_prob, 2),
-                    'tire_strategy': tire_strategy
-                })
-                
-            except Exception as e:
-                print(f"Error processing {driver}: {e}")
-                # Fallback prediction with realistic values
-                fallback_win_prob = calculate_realistic_win_probability(driver, constructor, grid, weather)
-                all_win_probs.append(fallback_win_prob)
-                
-                # Generate fallback tire strategy
-                fallback_tire_strategy = get_personalized_tire_strategy(driver, constructor, grid, weather, circuit)
-                
-                predictions.append({
-                    'driver': driver,
-                    'constructor': constructor,
-                    'grid': grid,
-                    'predicted_position': min(max(1, grid + random.randint(-3, 5)), 20),
-                    'podium_chance': False,
-                    'points_chance': False,
-                    'points_earned': 0,
-                    'win_probability': round(fallback_win_prob, 2),
-                    'tire_strategy': fallback_tire_strategy
-                })
-        
-        # Normalize win probabilities to sum to ~100%
-        total_win_prob = sum(all_win_probs)
-        if total_win_prob > 0:
-            normalization_factor = 100.0 / total_win_prob
-            for i, pred in enumerate(predictions):
-                pred['win_probability'] = round(all_win_probs[i] * normalization_factor, 2)
-        
-        # Sort by win probability (descending) and assign positions realistically
-        predictions.sort(key=lambda x: x['win_probability'], reverse=True)
-        
-        # Assign positions 1-20 based on win probability ranking
-        for i, pred in enumerate(predictions):
-            position = i + 1
-            pred['predicted_position'] = position
-            
-            # Update podium and points based on final position
-            pred['podium_chance'] = position <= 3
-            pred['points_chance'] = position <= 10
-            pred['points_earned'] = get_points_for_position(position)
-        
-        # Log prediction for analysis
-        log_prediction(data, predictions, temp, track_temp)
-        
-        return jsonify({
-            'success': True,
-            'predictions': predictions,
-            'race_info': {
-                'circuit': circuit,
-                'weather': weather,
-                'temperature': temp,
-                'track_temp': track_temp,
-                'humidity': humidity,
-                'wind_speed': wind
-            }
-        })
-        
-    except Exception as e:
-        print(f"Prediction error: {e}")
-        return jsonify({'error': str(e)}), 500
-
-def log_prediction(request_data, predictions, temp, track_temp):
-    """Log predictions for model improvement"""
-    try:
-        os.makedirs("logs", exist_ok=True)
-        
-        log_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'circuit': request_data['circuit'],
-            'weather': request_data['weather'],
-            'temperature': temp,
-            'track_temp': track_temp,
-            'num_entries': len(request_data['entries']),
-            'winner_prediction': predictions[0]['driver'] if predictions else 'N/A',
-            'winner_probability': predictions[0]['win_probability'] if predictions else 0
-        }
-        
-        log_df = pd.DataFrame([log_entry])
-        log_file = "logs/prediction_log.csv"
-        
-        if os.path.exists(log_file):
-            log_df.to_csv(log_file, mode='a', header=False, index=False)
-        else:
-            log_df.to_csv(log_file, index=False)
-            
-    except Exception as e:
-        print(f"Logging error: {e}")
-
-@app.route('/api/driver-stats', methods=['GET'])
-def get_driver_stats():
-    """Get comprehensive driver statistics"""
-    
-    driver_stats = {
+DRIVER_STATS = {
     'Max Verstappen': {
         'wins': 65, 'podiums': 109, 'poles': 43, 'championships': 4,
         'debut': 2015, 'age': 27, 'country': '🇳🇱', 'image': '/images/drivers/max-verstappen.jpg'
@@ -871,27 +358,474 @@ def get_driver_stats():
     }
 }
 
+CONSTRUCTOR_STANDINGS = [
+    {'position': 1, 'team': 'McLaren', 'points': 666, 'wins': 6},
+    {'position': 2, 'team': 'Ferrari', 'points': 652, 'wins': 5},
+    {'position': 3, 'team': 'Red Bull Racing', 'points': 589, 'wins': 9},
+    {'position': 4, 'team': 'Mercedes', 'points': 382, 'wins': 3},
+    {'position': 5, 'team': 'Aston Martin', 'points': 94, 'wins': 0},
+    {'position': 6, 'team': 'Alpine', 'points': 65, 'wins': 0},
+    {'position': 7, 'team': 'Haas', 'points': 58, 'wins': 0},
+    {'position': 8, 'team': 'RB', 'points': 46, 'wins': 0},
+    {'position': 9, 'team': 'Williams', 'points': 17, 'wins': 0},
+    {'position': 10, 'team': 'Kick Sauber', 'points': 0, 'wins': 0}
+]
+
+# Reference data served as pre-serialized bytes with ETags.
+# Invalidate an entry (or all of them) after changing the data it is built from.
+STATIC_PAYLOADS = {
+    'teams': StaticPayload(lambda: current_teams),
+    'circuits': StaticPayload(lambda: circuits_2025),
+    'driver-stats': StaticPayload(lambda: DRIVER_STATS),
+    'constructor-standings': StaticPayload(lambda: CONSTRUCTOR_STANDINGS)
+}
+
+def invalidate_static_payloads(*names):
+    """Rebuild the named payloads (all of them by default) on their next request"""
+    for name in names or STATIC_PAYLOADS:
+        STATIC_PAYLOADS[name].invalidate()
+
+@app.route('/api/teams', methods=['GET'])
+def get_teams():
+    return STATIC_PAYLOADS['teams'].response(request)
+
+@app.route('/api/circuits', methods=['GET'])
+def get_circuits():
+    return STATIC_PAYLOADS['circuits'].response(request)
+
+@app.route('/api/results', methods=['GET'])
+def get_results():
+    """Historical race results of the requested seasons and circuits (?season=2024&circuit=...)"""
+    store = ResultsStore()
+    if not store.exists():
+        return jsonify({'error': 'No results store found. Please run fetch_data.py first'}), 404
+    
+    try:
+        seasons = [int(season) for season in request.args.getlist('season')] or None
+    except ValueError:
+        return jsonify({'error': 'season must be an integer'}), 400
+    circuits = request.args.getlist('circuit') or None
+    
+    # Only the partitions that can match are opened
+    results = store.read(seasons, circuits)
+    return jsonify({
+        'seasons': sorted(set(results['season'].tolist())),
+        'count': len(results),
+        'results': results.astype(object).to_dict('records')
+    })
+
+def build_feature_row(driver, constructor, grid, race_conditions, circuit_features, rng):
+    """
+    Build the 20-column feature vector the enhanced models expect for one entry.
+    Categorical columns are left at 0 and filled in for the whole grid by encode_feature_matrix.
+    """
+    temp, humidity, wind, track_temp = race_conditions
+    
+    # Get enhanced features
+    driver_features = get_realistic_driver_performance(driver)
+    constructor_features = get_realistic_constructor_performance(constructor)
+    
+    return [
+        grid,  # grid position
+        0,  # constructor (encoded per grid)
+        0,  # circuit (encoded per grid)
+        0,  # driver (encoded per grid)
+        0,  # weather (encoded per grid)
+        0,  # tire strategy (encoded per grid)
+        temp,  # temperature
+        humidity,  # humidity
+        wind,  # wind speed
+        track_temp,  # track temperature
+        driver_features['experience'],  # driver experience
+        driver_features['form'],  # recent form
+        driver_features['quali_gap'],  # qualifying gap
+        constructor_features['standing'],  # constructor standing
+        constructor_features['efficiency'],  # budget efficiency
+        0,  # circuit type (encoded per grid)
+        circuit_features['drs_zones'],  # DRS zones
+        circuit_features['lap_length'],  # lap length
+        rng.integers(0, 9),  # safety car laps
+        rng.uniform(2.0, 4.5)  # pit time
+    ]
+
+def encode_feature_matrix(model_set, feature_matrix, drivers, constructors, tire_strategies,
+                          circuit, weather, circuit_features):
+    """Fill the categorical columns of the feature matrix with one index lookup per column"""
+    encoding_index = model_set.encoding_index
+    feature_matrix[:, 1] = encoding_index.encode('constructor', constructors)
+    feature_matrix[:, 2] = encoding_index.encode_one('circuit', circuit)
+    feature_matrix[:, 3] = encoding_index.encode('driver', drivers)
+    feature_matrix[:, 4] = encoding_index.encode_one('weather', weather)
+    feature_matrix[:, 5] = encoding_index.encode('tire_strategy', tire_strategies)
+    feature_matrix[:, 15] = encoding_index.encode_one('circuit_type', circuit_features['type'])
+    return feature_matrix
+
+def scale_feature_matrix(model_set, feature_matrix):
+    """Scale the numerical columns of a whole (n_entries, 20) feature matrix in one call"""
+    feature_matrix_scaled = feature_matrix.copy()
+    
+    if model_set.scaler is not None and len(feature_matrix) > 0:
+        # Same columns the trainer scaled, located by name in the set's feature layout
+        numerical_idx = numerical_feature_indices(model_set.feature_names)
+        try:
+            feature_matrix_scaled[:, numerical_idx] = model_set.scaler.transform(
+                feature_matrix[:, numerical_idx])
+        except Exception:
+            pass  # Use unscaled if scaling fails
+    
+    return feature_matrix_scaled
+
+def predict_grid_positions(model_set, feature_matrix, grids, fallback_mask, rng):
+    """
+    Run the position model once over every entry of the grid.
+    Entries flagged in fallback_mask (or the whole grid, if the model call fails)
+    get a grid-based fallback position instead.
+    """
+    grids = np.asarray(grids, dtype=float)
+    fallback_positions = np.clip(grids + rng.integers(-3, 6, len(grids)), 1, 20)
+    positions = fallback_positions.copy()
+    
+    model_mask = ~fallback_mask
+    if model_mask.any():
+        try:
+            scaled = scale_feature_matrix(model_set, feature_matrix[model_mask])
+            positions[model_mask] = model_set.models['position'].predict(scaled)
+        except Exception as e:
+            print(f"Position model error, using grid fallback: {e}")
+    
+    return np.clip(np.round(positions), 1, 20).astype(int)
+
+def normalize_entries(entries):
+    """Canonical, hashable form of the grid so equivalent requests share a cache entry"""
+    return tuple(sorted(
+        (entry['driver'], entry['constructor'], int(entry['grid'])) for entry in entries
+    ))
+
+def parse_seed(data):
+    """Optional integer seed from a request payload"""
+    seed = data.get('seed')
+    if seed is None:
+        return None
+    seed = int(seed)
+    if seed < 0:
+        raise ValueError("seed must be a non-negative integer")
+    return seed
+
+def prepare_race(model_set, circuit, weather, entries, rng):
+    """
+    Draw race conditions and tire strategies for a normalized grid and build its
+    encoded feature matrix. Returns everything finalize_race needs once positions are predicted.
+    """
+    predictions = []
+    
+    # Get race conditions
+    temp, humidity, wind, track_temp = get_weather_features(circuit, weather, rng)
+    circuit_features = get_circuit_features(circuit)
+    race_conditions = (temp, humidity, wind, track_temp)
+    
+    # One feature row per entry; entries whose features can't be built fall back to grid-based values
+    feature_matrix = np.zeros((len(entries), len(model_set.feature_names)))
+    fallback_mask = np.zeros(len(entries), dtype=bool)
+    grids = []
+    
+    # Store win probabilities for normalization
+    all_win_probs = []
+    
+    # Generate personalized tire strategies for the whole grid at once
+    tire_strategies = sample_tire_strategies([entry[0] for entry in entries],
+                                             [entry[1] for entry in entries],
+                                             [entry[2] for entry in entries],
+                                             weather, circuit, rng)
+    
+    for i, (driver, constructor, grid) in enumerate(entries):
+        grids.append(grid)
+        tire_strategy = tire_strategies[i]
+        
+        try:
+            feature_matrix[i] = build_feature_row(driver, constructor, grid,
+                                                  race_conditions, circuit_features, rng)
+        except Exception as e:
+            print(f"Error processing {driver}: {e}")
+            fallback_mask[i] = True
+        
+        # Calculate realistic win probability
+        win_prob = calculate_realistic_win_probability(driver, constructor, grid, weather)
+        all_win_probs.append(win_prob)
+        
+        predictions.append({
+            'driver': driver,
+            'constructor': constructor,
+            'grid': grid,
+            'predicted_position': 0,  # Set from the batched model run
+            'podium_chance': False,  # Will be set based on final position
+            'points_chance': False,  # Will be set based on final position
+            'points_earned': 0,  # Will be calculated based on final position
+            'win_probability': round(win_prob, 2),
+            'tire_strategy': tire_strategy
+        })
     
-    return jsonify(driver_stats)
+    encode_feature_matrix(model_set, feature_matrix,
+                          [pred['driver'] for pred in predictions],
+                          [pred['constructor'] for pred in predictions],
+                          [pred['tire_strategy'] for pred in predictions],
+                          circuit, weather, circuit_features)
+    
+    return {
+        'predictions': predictions,
+        'win_probs': all_win_probs,
+        'feature_matrix': feature_matrix,
+        'fallback_mask': fallback_mask,
+        'grids': grids,
+        'race_info': {
+            'circuit': circuit,
+            'weather': weather,
+            'temperature': temp,
+            'track_temp': track_temp,
+            'humidity': humidity,
+            'wind_speed': wind
+        }
+    }
+
+def finalize_race(race, predicted_positions):
+    """Turn a prepared race and its model-predicted positions into the response payload"""
+    predictions = race['predictions']
+    all_win_probs = race['win_probs']
+    
+    for pred, position_pred in zip(predictions, predicted_positions):
+        pred['predicted_position'] = int(position_pred)
+    
+    # Normalize win probabilities to sum to ~100%
+    total_win_prob = sum(all_win_probs)
+    if total_win_prob > 0:
+        normalization_factor = 100.0 / total_win_prob
+        for i, pred in enumerate(predictions):
+            pred['win_probability'] = round(all_win_probs[i] * normalization_factor, 2)
+    
+    # Sort by win probability (descending) and assign positions realistically
+    predictions.sort(key=lambda x: x['win_probability'], reverse=True)
+    
+    # Assign positions 1-20 based on win probability ranking
+    for i, pred in enumerate(predictions):
+        position = i + 1
+        pred['predicted_position'] = position
+        
+        # Update podium and points based on final position
+        pred['podium_chance'] = position <= 3
+        pred['points_chance'] = position <= 10
+        pred['points_earned'] = get_points_for_position(position)
+    
+    return {
+        'success': True,
+        'predictions': predictions,
+        'race_info': race['race_info']
+    }
+
+def run_race_prediction(model_set, circuit, weather, entries, rng):
+    """Predict a full race for a normalized grid and return the response payload"""
+    race = prepare_race(model_set, circuit, weather, entries, rng)
+    
+    # Make predictions for the whole grid with a single model call
+    predicted_positions = predict_grid_positions(model_set, race['feature_matrix'], race['grids'],
+                                                 race['fallback_mask'], rng)
+    return finalize_race(race, predicted_positions)
+
+def default_season_entries():
+    """Current lineup, gridded in constructor standings order"""
+    teams = sorted(current_teams.items(),
+                   key=lambda item: get_realistic_constructor_performance(item[0])['standing'])
+    entries = []
+    for team_name, team in teams:
+        for driver in team['drivers']:
+            entries.append({'driver': driver, 'constructor': team_name, 'grid': len(entries) + 1})
+    return entries
+
+def run_season_prediction(model_set, weather, entries, seed=None, runs=0, max_workers=None):
+    """
+    Predict every round of the 2025 calendar for one normalized grid. Feature rows for all
+    (round, driver) pairs go through each model in a single call, and optional
+    per-round Monte Carlo simulations are spread over a process pool.
+    """
+    seed_sequence = np.random.SeedSequence(seed)
+    race_seeds = seed_sequence.spawn(len(circuits_2025))
+    
+    races = [prepare_race(model_set, circuit['name'], weather, entries, np.random.default_rng(race_seed))
+             for circuit, race_seed in zip(circuits_2025, race_seeds)]
+    
+    # Every (round x driver) row in one matrix, one model call per season
+    season_positions = predict_grid_positions(
+        model_set,
+        np.vstack([race['feature_matrix'] for race in races]),
+        np.concatenate([race['grids'] for race in races]),
+        np.concatenate([race['fallback_mask'] for race in races]),
+        np.random.default_rng(seed_sequence)
+    )
+    
+    simulations = [None] * len(races)
+    if runs > 0:
+        simulations = simulate_many_races([race['win_probs'] for race in races], runs,
+                                          seed_sequence.spawn(len(races)), max_workers)
+    
+    rounds = []
+    offset = 0
+    for circuit, race, simulation in zip(circuits_2025, races, simulations):
+        n_entries = len(race['grids'])
+        result = finalize_race(race, season_positions[offset:offset + n_entries])
+        offset += n_entries
+        
+        round_result = {
+            'round': circuit['round'],
+            'country': circuit['country'],
+            'date': circuit['date'],
+            'predictions': result['predictions'],
+            'race_info': result['race_info']
+        }
+        if simulation is not None:
+            round_result['simulations'] = format_simulation(entries, simulation)
+        rounds.append(round_result)
+    
+    return {
+        'success': True,
+        'season': 2025,
+        'rounds': rounds
+    }
+
+@app.route('/api/predict', methods=['POST'])
+def predict_race():
+    # One model set for the whole request, even if a new version is swapped in meanwhile
+    model_set = model_registry.current
+    if not model_set:
+        return jsonify({"error": "Models not loaded. Please run train_enhanced_model.py first"}), 500
+    
+    try:
+        data = request.json
+        circuit = data['circuit']
+        weather = data['weather']
+        entries = normalize_entries(data['entries'])
+        
+        try:
+            seed = parse_seed(data)
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+        
+        def compute():
+            return run_race_prediction(model_set, circuit, weather, entries, make_request_rng(seed))
+        
+        # Unseeded requests share one fresh draw per race setup until it expires,
+        # so repeated default grids are computed once per TTL
+        cache_key = (circuit, weather, entries, seed, model_set.version)
+        result = prediction_cache.get_or_compute(cache_key, compute)
+        
+        # Log prediction for analysis (cache hits included)
+        log_prediction(data, result['predictions'],
+                       result['race_info']['temperature'], result['race_info']['track_temp'])
+        return jsonify(result)
+        
+    except Exception as e:
+        print(f"Prediction error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+def format_simulation(entries, outcome):
+    """Per-driver simulation summary for a normalized grid, sorted by expected points"""
+    results = []
+    for i, (driver, constructor, grid) in enumerate(entries):
+        results.append({
+            'driver': driver,
+            'constructor': constructor,
+            'grid': grid,
+            'win_probability': round(float(outcome['win'][i]) * 100, 2),
+            'podium_probability': round(float(outcome['podium'][i]) * 100, 2),
+            'points_probability': round(float(outcome['points'][i]) * 100, 2),
+            'expected_points': round(float(outcome['expected_points'][i]), 2),
+            'expected_position': round(float(outcome['expected_position'][i]), 2)
+        })
+    
+    results.sort(key=lambda x: x['expected_points'], reverse=True)
+    return results
+
+def parse_runs(data, default):
+    """Number of Monte Carlo runs requested in a payload"""
+    runs = int(data.get('runs', default))
+    if not 0 <= runs <= MAX_SIMULATION_RUNS:
+        raise ValueError(f"runs must be between 0 and {MAX_SIMULATION_RUNS}")
+    return runs
+
+@app.route('/api/simulate', methods=['POST'])
+def simulate_race():
+    """Monte Carlo distribution of race outcomes for the same payload as /api/predict"""
+    try:
+        data = request.json
+        circuit = data['circuit']
+        weather = data['weather']
+        entries = normalize_entries(data['entries'])
+        
+        try:
+            seed = parse_seed(data)
+            runs = parse_runs(data, DEFAULT_SIMULATION_RUNS)
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if not entries:
+            return jsonify({'error': 'At least one entry is required'}), 400
+        if runs < 1:
+            return jsonify({'error': 'runs must be at least 1'}), 400
+        
+        win_probs = [
+            calculate_realistic_win_probability(driver, constructor, grid, weather)
+            for driver, constructor, grid in entries
+        ]
+        outcome = simulate_race_outcomes(win_probs, runs, make_request_rng(seed))
+        
+        return jsonify({
+            'success': True,
+            'simulations': format_simulation(entries, outcome),
+            'race_info': {
+                'circuit': circuit,
+                'weather': weather,
+                'runs': runs
+            }
+        })
+        
+    except Exception as e:
+        print(f"Simulation error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/predict-season', methods=['POST'])
+def predict_season():
+    """Predictions for every round of the 2025 calendar in one call"""
+    model_set = model_registry.current
+    if not model_set:
+        return jsonify({"error": "Models not loaded. Please run train_enhanced_model.py first"}), 500
+    
+    try:
+        data = request.get_json(silent=True) or {}
+        weather = data.get('weather', 'Dry')
+        entries = normalize_entries(data.get('entries') or default_season_entries())
+        
+        try:
+            seed = parse_seed(data)
+            runs = parse_runs(data, 0)
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify(run_season_prediction(model_set, weather, entries, seed, runs))
+        
+    except Exception as e:
+        print(f"Season prediction error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+def log_prediction(request_data, predictions, temp, track_temp):
+    """Log predictions for model improvement (written in the background by prediction_logger)"""
+    prediction_logger.log(request_data, predictions, temp, track_temp)
+
+@app.route('/api/driver-stats', methods=['GET'])
+def get_driver_stats():
+    """Get comprehensive driver statistics"""
+    return STATIC_PAYLOADS['driver-stats'].response(request)
 
 @app.route('/api/constructor-standings', methods=['GET'])
 def get_constructor_standings():
     """Get current constructor championship standings"""
-    
-    standings = [
-        {'position': 1, 'team': 'McLaren', 'points': 666, 'wins': 6},
-        {'position': 2, 'team': 'Ferrari', 'points': 652, 'wins': 5},
-        {'position': 3, 'team': 'Red Bull Racing', 'points': 589, 'wins': 9},
-        {'position': 4, 'team': 'Mercedes', 'points': 382, 'wins': 3},
-        {'position': 5, 'team': 'Aston Martin', 'points': 94, 'wins': 0},
-        {'position': 6, 'team': 'Alpine', 'points': 65, 'wins': 0},
-        {'position': 7, 'team': 'Haas', 'points': 58, 'wins': 0},
-        {'position': 8, 'team': 'RB', 'points': 46, 'wins': 0},
-        {'position': 9, 'team': 'Williams', 'points': 17, 'wins': 0},
-        {'position': 10, 'team': 'Kick Sauber', 'points': 0, 'wins': 0}
-    ]
-    
-    return jsonify(standings)
+    return STATIC_PAYLOADS['constructor-standings'].response(request)
 
 @app.route('/api/fantasy-team', methods=['POST'])
 def create_fantasy_team():
@@ -902,18 +836,10 @@ def create_fantasy_team():
         budget = data.get('budget', 100)
         
         # Enhanced driver values based on current season performance
-        driver_values = {
-            'Max Verstappen': 30, 'Charles Leclerc': 25, 'Lando Norris': 22,
-            'Lewis Hamilton': 24, 'George Russell': 20, 'Fernando Alonso': 18,
-            'Oscar Piastri': 16, 'Carlos Sainz': 15, 'Pierre Gasly': 12,
-            'Alex Albon': 10, 'Lance Stroll': 8, 'Yuki Tsunoda': 6,
-            'Nico Hülkenberg': 7, 'Esteban Ocon': 9, 'Kimi Antonelli': 8,
-            'Oliver Bearman': 5, 'Franco Colapinto': 3, 'Gabriel Bortoleto': 3,
-            'Isack Hadjar': 2, 'Liam Lawson': 4
-        }
+        driver_values = {driver: DRIVERS.get(driver)['fantasy_value'] for driver in team['drivers']}
         
         # Calculate team cost
-        total_cost = sum(driver_values.get(driver, 5) for driver in team['drivers'])
+        total_cost = sum(driver_values[driver] for driver in team['drivers'])
         total_cost += current_teams.get(team['constructor'], {}).get('championships', 0) * 2
         
         # Generate fantasy points using realistic performance
@@ -936,7 +862,7 @@ def create_fantasy_team():
             'fantasy_points': fantasy_points,
             'valid': total_cost <= budget,
             'breakdown': {
-                'driver_costs': {driver: driver_values.get(driver, 5) for driver in team['drivers']},
+                'driver_costs': driver_values,
                 'constructor_cost': current_teams.get(team['constructor'], {}).get('championships', 0) * 2
             }
         })
@@ -947,14 +873,16 @@ def create_fantasy_team():
 @app.route('/api/model-info', methods=['GET'])
 def get_model_info():
     """Get information about loaded models"""
-    if not models:
+    model_set = model_registry.current
+    if not model_set:
         return jsonify({'error': 'Models not loaded'}), 500
     
     model_info = {
-        'models_loaded': list(models.keys()),
-        'enhanced_features': len(feature_names) if feature_names else 0,
-        'encoders_available': list(label_encoders.keys()) if label_encoders else [],
-        'scaler_loaded': scaler is not None,
+        'models_loaded': list(model_set.models.keys()),
+        'enhanced_features': len(model_set.feature_names) if model_set.feature_names else 0,
+        'encoders_available': list(model_set.label_encoders.keys()) if model_set.label_encoders else [],
+        'scaler_loaded': model_set.scaler is not None,
+        'model_version': model_registry.status(),
         'last_updated': datetime.now().isoformat()
     }
     
@@ -963,28 +891,72 @@ def get_model_info():
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Comprehensive health check endpoint"""
+    model_set = model_registry.current
     health_status = {
         'status': 'healthy',
-        'models_loaded': models is not None,
-        'enhanced_models': all(model is not None for model in models.values()) if models else False,
-        'encoders_loaded': label_encoders is not None,
-        'scaler_loaded': scaler is not None,
-        'feature_names_loaded': feature_names is not None,
+        'models_loaded': model_set is not None,
+        'enhanced_models': all(model is not None for model in model_set.models.values()) if model_set else False,
+        'encoders_loaded': model_set is not None and model_set.label_encoders is not None,
+        'scaler_loaded': model_set is not None and model_set.scaler is not None,
+        'feature_names_loaded': model_set is not None and model_set.feature_names is not None,
+        'model_version': model_registry.status(),
         'timestamp': datetime.now().isoformat(),
         'api_version': '2.0',
         'total_teams': len(current_teams),
         'total_circuits': len(circuits_2025),
-        'total_drivers': sum(len(team['drivers']) for team in current_teams.values())
+        'total_drivers': sum(len(team['drivers']) for team in current_teams.values()),
+        'model_loading': model_set.load_info if model_set else None,
+        'process': process_memory()
     }
     
     return jsonify(health_status)
 
+def warm_up_model_set(model_set):
+    """
+    Run a synthetic full grid through every model of a freshly loaded set before it
+    takes traffic: pages in memory-mapped trees and fails the swap on a broken set.
+    """
+    entries = normalize_entries(default_season_entries())
+    race = prepare_race(model_set, circuits_2025[0]['name'], 'Dry', entries, np.random.default_rng(0))
+    scaled = scale_feature_matrix(model_set, race['feature_matrix'])
+    for model in model_set.models.values():
+        if model is not None:
+            model.predict(scaled)
+
+def on_model_swap(model_set):
+    """A new model version is serving: drop responses built before it"""
+    prediction_cache.clear()
+    invalidate_static_payloads()
+
+# Active model set. A background thread watches models/ and swaps in newly
+# published versions once they are loaded and warmed up, without a restart.
+model_registry = ModelRegistry("models", MODEL_LOAD_MODE, warm_up=warm_up_model_set, on_swap=on_model_swap)
+
+def init_models(watch=True):
+    """
+    Load the published model set and, with watch, start polling for new versions.
+    Entry points call this instead of the import doing it: spawned simulation
+    workers re-import the main script, and must not load models or start threads.
+    Returns the active set, or None if no models are found.
+    """
+    if model_registry.current is None:
+        try:
+            model_registry.load()
+            print(f"✅ Enhanced models loaded successfully (version {model_registry.current.version})")
+        except FileNotFoundError as e:
+            print(f"⚠️ Enhanced models not found: {e}")
+            print("Please run train_enhanced_model.py first")
+    if watch and MODEL_RELOAD_INTERVAL > 0:
+        model_registry.start(MODEL_RELOAD_INTERVAL)
+    return model_registry.current
+
 if __name__ == '__main__':
+    init_models()
     print("🏎️  Starting Enhanced F1 Race Predictor API...")
     print(f"🌐 API will be available at http://localhost:5059")
-    print("📊 Enhanced Models status:", "✅ Loaded" if models else "❌ Not loaded")
+    print("📊 Enhanced Models status:", "✅ Loaded" if model_registry.current else "❌ Not loaded")
     
-    if models:
+    if model_registry.current:
         print("🔥 Enhanced Features:")
         print("   • Personalized tire strategy based on driver/team characteristics")
         print("   • Realistic win probability calculation")
@@ -0,0 +1,210 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, mean_squared_error
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+from feature_store import ENHANCED_FEATURES, numerical_feature_indices
+from train_enhanced_model import (CATEGORICAL_COLUMNS, FEATURE_VERSION, MODEL_ENGINES, MODEL_TARGETS,
+                                  add_targets, build_candidate_models, build_feature_matrix,
+                                  enhance_race_results, label_values, native_categorical_mask,
+                                  read_race_results)
+
+BACKTEST_CACHE_DIR = os.path.join("data", "cache", "backtest")
+BACKTEST_LOG = os.path.join("logs", "backtest_log.csv")
+
+# Models scored per fold and their metric
+BACKTEST_MODELS = {'position': 'rmse', 'podium': 'accuracy'}
+
+def fold_rows(raw, season):
+    """Raw results a fold uses: the seasons it trains on and the season it tests on"""
+    return raw[raw['season'].astype(int) <= season]
+
+def fold_key(rows, season, job, estimator, seed):
+    """
+    Changes whenever the fold's raw rows, the estimator parameters, the seed or the
+    feature code change, so unchanged folds are read back from disk. Seasons after
+    the fold don't affect it: its features are built from its own rows only.
+    """
+    digest = hashlib.sha256(f"features-v{FEATURE_VERSION}:{season}:{job}:{seed}:".encode())
+    digest.update(json.dumps(estimator.get_params(), sort_keys=True, default=repr).encode())
+    digest.update(pd.util.hash_pandas_object(rows, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:24]
+
+def build_fold_data(rows, seed):
+    """
+    Feature matrix (unscaled float32), targets, seasons and label encoders of one
+    fold, built from its rows alone. Random feature draws and encoder codes then
+    depend only on those rows, not on seasons added later.
+    Label encoders only assign codes to names, so they are fitted on the test season too.
+    """
+    df = add_targets(enhance_race_results(rows.copy(), np.random.default_rng(seed)))
+    label_encoders = {col: LabelEncoder().fit(label_values(df[col])) for col in CATEGORICAL_COLUMNS}
+    X = build_feature_matrix(df, ENHANCED_FEATURES, label_encoders)
+    targets = {MODEL_TARGETS[name]: df[MODEL_TARGETS[name]].to_numpy() for name in BACKTEST_MODELS}
+    return X, targets, df['season'].to_numpy().astype(int), label_encoders
+
+def run_fold(X, targets, seasons, season, job, name, estimator):
+    """Train on every season before `season` and score the predictions for `season`"""
+    train, test = seasons < season, seasons == season
+    y = targets[MODEL_TARGETS[name]]
+
+    # Scaler fitted on the training seasons only
+    numerical_idx = numerical_feature_indices(ENHANCED_FEATURES)
+    scaler = StandardScaler()
+    X_train, X_test = X[train], X[test]
+    X_train[:, numerical_idx] = scaler.fit_transform(X_train[:, numerical_idx])
+    X_test[:, numerical_idx] = scaler.transform(X_test[:, numerical_idx])
+
+    start = time.perf_counter()
+    estimator.fit(X_train, y[train])
+    y_pred = estimator.predict(X_test)
+    seconds = time.perf_counter() - start
+
+    if BACKTEST_MODELS[name] == 'rmse':
+        score = np.sqrt(mean_squared_error(y[test], y_pred))
+    else:
+        score = accuracy_score(y[test], y_pred)
+
+    return {
+        'season': int(season),
+        'job': job,
+        'model': name,
+        'metric': BACKTEST_MODELS[name],
+        'score': round(float(score), 4),
+        'train_rows': int(train.sum()),
+        'test_rows': int(test.sum()),
+        'seconds': round(seconds, 3)
+    }
+
+def load_fold(key, cache_dir=BACKTEST_CACHE_DIR):
+    path = os.path.join(cache_dir, f"{key}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def save_fold(key, result, cache_dir=BACKTEST_CACHE_DIR):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{key}.json")
+    with open(path + ".tmp", "w") as f:
+        json.dump(result, f)
+    os.replace(path + ".tmp", path)
+
+def prepare_backtest_data():
+    """Raw race results in season order, or None"""
+    _, raw = read_race_results()
+    return raw
+
+def run_backtest(raw, seasons_to_test, engine='forest', max_workers=None, fold_cache=True, seed=42):
+    """
+    Walk-forward backtest on raw results: for each season N in seasons_to_test,
+    fit every position and podium candidate of the engine on the seasons before N
+    and score it on N.
+    Folds run in parallel processes; scored folds are cached on disk and skipped on
+    reruns while their rows and parameters are unchanged. Features are only built
+    for seasons with a fold left to fit.
+    Returns one result dict per (season, candidate).
+    """
+    raw_seasons = raw['season'].astype(int)
+
+    # Candidate parameters for the keys; HistGradientBoosting's categorical mask is
+    # derived from the fold's own rows when the fold is fitted
+    candidates = [candidate for candidate in build_candidate_models(False, 1, engine)
+                  if candidate[1] in BACKTEST_MODELS]
+
+    folds = []
+    for season in seasons_to_test:
+        if not (raw_seasons == season).any() or not (raw_seasons < season).any():
+            print(f"   ⚠️ No data to train for or test on season {season}, skipping")
+            continue
+        rows = fold_rows(raw, season)
+        for job, name, _, estimator in candidates:
+            folds.append((season, job, name, fold_key(rows, season, job, estimator, seed)))
+
+    results = {}
+    pending = []
+    for season, job, name, key in folds:
+        cached = load_fold(key) if fold_cache else None
+        if cached is not None:
+            results[key] = dict(cached, cached=True)
+        else:
+            pending.append((season, job, name, key))
+
+    print(f"🔁 {len(folds)} folds: {len(folds) - len(pending)} cached, {len(pending)} to fit")
+    start = time.perf_counter()
+    if pending:
+        workers = max_workers or min(len(pending), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {}
+            for season in sorted({season for season, *_ in pending}):
+                X, targets, seasons, label_encoders = build_fold_data(fold_rows(raw, season), seed)
+                fold_candidates = {job: estimator for job, _, _, estimator in build_candidate_models(
+                    False, 1, engine, native_categorical_mask(ENHANCED_FEATURES, label_encoders))}
+                for fold_season, job, name, key in pending:
+                    if fold_season == season:
+                        futures[key] = pool.submit(run_fold, X, targets, seasons, season, job, name,
+                                                   fold_candidates[job])
+            for key, future in futures.items():
+                result = future.result()
+                if fold_cache:
+                    save_fold(key, result)
+                results[key] = dict(result, cached=False)
+    print(f"⏱️ Backtest finished in {time.perf_counter() - start:.2f}s")
+
+    return [results[key] for *_, key in folds]
+
+def print_backtest(results):
+    print(f"\n{'season':<8}{'job':<14}{'metric':<10}{'score':>8}{'train':>8}{'test':>6}{'fit s':>9}")
+    for row in results:
+        print(f"{row['season']:<8}{row['job']:<14}{row['metric']:<10}{row['score']:>8.3f}{row['train_rows']:>8}"
+              f"{row['test_rows']:>6}{row['seconds']:>9.2f}{'  (cached)' if row['cached'] else ''}")
+
+    print("\n📊 Mean over seasons:")
+    summary = pd.DataFrame(results).groupby(['job', 'metric']).agg(score=('score', 'mean'), seconds=('seconds', 'sum'))
+    for (job, metric), row in summary.iterrows():
+        print(f"   {job:<14} {metric:<10} {row['score']:.3f}   fit {row['seconds']:.1f}s")
+
+def log_backtest(results, engine, path=BACKTEST_LOG):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    rows = pd.DataFrame(results)
+    rows.insert(0, 'engine', engine)
+    rows.insert(0, 'timestamp', datetime.now().isoformat())
+    rows.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward backtest: train on seasons before N, predict season N")
+    parser.add_argument("--first-season", type=int, default=None, help="First season to predict (default: last 5)")
+    parser.add_argument("--last-season", type=int, default=None, help="Last season to predict (default: latest)")
+    parser.add_argument("--engine", default="forest", choices=MODEL_ENGINES, help="Model candidates to backtest")
+    parser.add_argument("--workers", type=int, default=None, help="Folds fitted at the same time")
+    parser.add_argument("--no-cache", action="store_true", help="Refit every fold instead of reading cached scores")
+    args = parser.parse_args()
+
+    raw = prepare_backtest_data()
+    if raw is None:
+        return
+    available = sorted(set(raw['season'].astype(int).tolist()))
+    if len(available) < 2:
+        print(f"❌ Backtesting needs at least two seasons of results, found {len(available)}. "
+              f"Please fetch more seasons with fetch_data.py")
+        return
+    last = args.last_season or available[-1]
+    first = args.first_season or max(available[1], last - 4)
+
+    print(f"🧪 Backtesting {args.engine} models on seasons {first}-{last}")
+    results = run_backtest(raw, range(first, last + 1), args.engine, args.workers, fold_cache=not args.no_cache)
+    if results:
+        print_backtest(results)
+        log_backtest(results, args.engine)
+        print(f"\n🗂️ Appended to {BACKTEST_LOG}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+import app
+import dataset_cache
+import train_enhanced_model
+from ergast import ERGAST_WORKERS, ErgastClient
+from ergast_stub import start_stub_server, stub_season, stub_timing
+from feature_store import ENHANCED_FEATURES, NUMERICAL_FEATURES
+from lap_store import LapStore, race_timing_rows
+from model_registry import ModelSet
+from model_store import SharedTreeEnsemble, export_shared_model
+from prediction_logger import PredictionLogger
+from process_stats import process_memory
+from results_store import ResultsStore, import_csv
+from tire_strategy import STRATEGY_OPTIONS, FERRARI_MASTER_PLAN
+
+def build_synthetic_models(n_estimators=200, max_depth=15, rows=4000, seed=42):
+    """
+    Models, encoders and scaler shaped like the ones train_enhanced_model.py saves,
+    fitted on random data so the benchmarks run without the trained .pkl files.
+    Same ensemble sizes as production, so prediction latency is comparable.
+    """
+    rng = np.random.default_rng(seed)
+
+    drivers = sorted({driver for team in app.current_teams.values() for driver in team['drivers']})
+    strategies = sorted({strategy for styles in STRATEGY_OPTIONS.values()
+                         for options in styles.values() for strategy in options} | {FERRARI_MASTER_PLAN})
+    vocabularies = {
+        'driver': drivers,
+        'constructor': sorted(app.current_teams),
+        'circuit': sorted(circuit['name'] for circuit in app.circuits_2025),
+        'weather': ['Dry', 'Mixed', 'Wet'],
+        'tire_strategy': strategies,
+        'circuit_type': ['Balanced', 'Power', 'Street', 'Twisty']
+    }
+    label_encoders = {col: LabelEncoder().fit(values) for col, values in vocabularies.items()}
+
+    X = rng.normal(size=(rows, len(ENHANCED_FEATURES)))
+    X[:, 0] = rng.integers(1, 21, rows)
+    for column, col in [(1, 'constructor'), (2, 'circuit'), (3, 'driver'), (4, 'weather'),
+                        (5, 'tire_strategy'), (15, 'circuit_type')]:
+        X[:, column] = rng.integers(0, len(vocabularies[col]), rows)
+
+    scaler = StandardScaler().fit(rng.normal(size=(rows, len(NUMERICAL_FEATURES))))
+
+    position = np.clip(np.round(X[:, 0] + rng.normal(0, 4, rows)), 1, 20)
+    models = {
+        'position': RandomForestRegressor(n_estimators=n_estimators, max_depth=max_depth,
+                                          random_state=seed, n_jobs=-1).fit(X, position)
+    }
+    for name, target in [('podium', position <= 3), ('points', position <= 10), ('winner', position == 1)]:
+        models[name] = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth,
+                                              random_state=seed, n_jobs=-1).fit(X, target.astype(int))
+
+    return {
+        'models': models,
+        'label_encoders': label_encoders,
+        'scaler': scaler,
+        'feature_names': list(ENHANCED_FEATURES)
+    }
+
+def compile_models(models):
+    """Export sklearn models to the compact array format and load them back, like app.py does"""
+    compiled = {}
+    with tempfile.TemporaryDirectory(prefix="f1-bench-models-") as export_dir:
+        for name, model in models.items():
+            target = os.path.join(export_dir, name)
+            # Read into memory rather than mapped, so the arrays outlive the export directory
+            compiled[name] = (SharedTreeEnsemble.load(target, mmap_mode=None)
+                              if export_shared_model(model, target) else model)
+    return compiled
+
+def install_models(fixture, model_format="compiled"):
+    """Make a synthetic model set the API's active set (and stop watching models/ for new versions)"""
+    app.model_registry.stop()
+    models = compile_models(fixture['models']) if model_format == "compiled" else fixture['models']
+    app.model_registry.install(ModelSet(models, fixture['label_encoders'], fixture['scaler'],
+                                        fixture['feature_names'], 'synthetic'))
+    app.prediction_cache.clear()
+
+def race_payload(circuit="Silverstone Circuit", weather="Dry"):
+    """Realistic /api/predict body: the full 20-driver 2025 grid"""
+    entries = []
+    for constructor, team in app.current_teams.items():
+        for driver in team['drivers']:
+            entries.append({'driver': driver, 'constructor': constructor, 'grid': len(entries) + 1})
+    return {'circuit': circuit, 'weather': weather, 'entries': entries}
+
+def percentile_summary(samples):
+    timings = np.asarray(samples) * 1000
+    return {
+        'iterations': len(timings),
+        'mean_ms': round(float(timings.mean()), 4),
+        'p50_ms': round(float(np.percentile(timings, 50)), 4),
+        'p95_ms': round(float(np.percentile(timings, 95)), 4),
+        'p99_ms': round(float(np.percentile(timings, 99)), 4),
+        'min_ms': round(float(timings.min()), 4),
+        'max_ms': round(float(timings.max()), 4)
+    }
+
+def measure(func, iterations, warmup=3, setup=None):
+    """
+    Time `iterations` calls of func and report the latency distribution plus the
+    peak Python allocation of one extra traced call. setup() runs untimed before
+    every call and its return value is passed to func.
+    """
+    for _ in range(warmup):
+        func(setup() if setup else None)
+
+    samples = []
+    for _ in range(iterations):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        func(arg)
+        samples.append(time.perf_counter() - start)
+
+    # Tracing slows everything down, so memory is measured on a separate call
+    arg = setup() if setup else None
+    tracemalloc.start()
+    func(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = percentile_summary(samples)
+    result['peak_alloc_kb'] = round(peak / 1024, 1)
+    result['rss_mb'] = process_memory()['rss_mb']
+    return result
+
+def api_benchmarks(iterations):
+    client = app.app.test_client()
+    payload = race_payload()
+    results = {}
+
+    def check(response):
+        if response.status_code != 200:
+            raise RuntimeError(f"{response.status_code}: {response.get_data(as_text=True)[:200]}")
+
+    # A new seed per call so every request misses the response cache
+    seeds = iter(range(10**9))
+    results['api.predict_race'] = measure(
+        lambda _: check(client.post('/api/predict', json={**payload, 'seed': next(seeds)})), iterations)
+
+    results['api.predict_race.cached'] = measure(
+        lambda _: check(client.post('/api/predict', json={**payload, 'seed': 0})), iterations)
+
+    fantasy = {'team': {'drivers': ['Max Verstappen', 'Lando Norris', 'Oscar Piastri',
+                                    'Charles Leclerc', 'George Russell'],
+                        'constructor': 'McLaren'},
+               'budget': 100}
+    results['api.create_fantasy_team'] = measure(
+        lambda _: check(client.post('/api/fantasy-team', json=fantasy)), iterations)
+    return results
+
+def function_benchmarks(iterations):
+    entries = race_payload()['entries']
+    results = {}
+
+    def all_tire_strategies(_):
+        for entry in entries:
+            app.get_personalized_tire_strategy(entry['driver'], entry['constructor'], entry['grid'],
+                                               'Dry', 'Silverstone Circuit')
+
+    def all_win_probabilities(_):
+        for entry in entries:
+            app.calculate_realistic_win_probability(entry['driver'], entry['constructor'],
+                                                    entry['grid'], 'Dry')
+
+    results['get_personalized_tire_strategy.grid'] = measure(all_tire_strategies, iterations)
+    results['calculate_realistic_win_probability.grid'] = measure(all_win_probabilities, iterations)
+    return results
+
+def model_benchmarks(fixture, iterations):
+    """sklearn predict against the compiled array engine, per model, on one 20-row grid"""
+    batch = np.random.default_rng(0).normal(size=(20, len(ENHANCED_FEATURES)))
+    results = {}
+    for name, model in fixture['models'].items():
+        results[f"model.{name}.sklearn"] = measure(lambda _: model.predict(batch), iterations)
+    for name, model in compile_models(fixture['models']).items():
+        if isinstance(model, SharedTreeEnsemble):
+            results[f"model.{name}.compiled"] = measure(lambda _: model.predict(batch), iterations)
+    return results
+
+def training_benchmarks(iterations):
+    """Each stage of train_enhanced_model.load_and_enhance_data, run on a fresh copy of its input, and a cached dataset load"""
+    path = next((f for f in train_enhanced_model.DATA_FILES if os.path.exists(f)), None)
+    if path is None:
+        print("⚠️ No race data found, skipping training benchmarks (run fetch_data.py first)")
+        return {}
+
+    results = {'train.read_csv': measure(lambda _: pd.read_csv(path), iterations, warmup=1)}
+
+    raw = pd.read_csv(path)
+    results['train.clean_race_results'] = measure(
+        train_enhanced_model.clean_race_results, iterations, warmup=1, setup=raw.copy)
+
+    df = train_enhanced_model.clean_race_results(raw.copy())
+    for stage in train_enhanced_model.ENHANCEMENT_STAGES:
+        results[f"train.{stage.__name__}"] = measure(stage, iterations, warmup=1, setup=df.copy)
+        df = stage(df.copy())
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        key = dataset_cache.cache_key(path, train_enhanced_model.FEATURE_VERSION, 42)
+        dataset_cache.save_frame(dataset_cache.downcast_frame(df), key, {}, cache_dir)
+        results['train.dataset_cache_load'] = measure(
+            lambda _: dataset_cache.load_frame(key, cache_dir), iterations, warmup=1)
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        store = ResultsStore(store_dir)
+        import_csv(path, store)
+        recent = store.seasons()[-5:]
+        results['train.store_read_all'] = measure(lambda _: store.read(), iterations, warmup=1)
+        results['train.store_read_last_5_seasons'] = measure(lambda _: store.read(recent), iterations, warmup=1)
+
+    return results
+
+def lap_store_benchmarks(iterations, seasons=10):
+    """Slicing one race out of a memory-mapped lap store and aggregating every race, on stub timing data"""
+    results = {}
+    with tempfile.TemporaryDirectory() as store_dir:
+        store = LapStore(store_dir)
+        for race in (race for year in range(2000, 2000 + seasons) for race in stub_season(year)):
+            laps, pitstops = stub_timing(race)
+            store.append_race(race['season'], race['round'], *race_timing_rows({
+                'laps': {'Laps': laps}, 'pitstops': {'PitStops': pitstops}}))
+        print(f"   🏁 {store.rows('laps'):,} laps in {store.rows('races')} races")
+
+        store = LapStore(store_dir)
+        results['laps.race_slice'] = measure(lambda _: store.race_laps(2005, 10), iterations)
+        results['laps.driver_race_summary'] = measure(lambda _: store.driver_race_summary(), iterations, warmup=1)
+    return results
+
+def fetch_benchmarks(iterations, seasons=30, latency=0.02):
+    """Fetching seasons from a local stand-in Ergast server, one request at a time vs concurrently"""
+    server, base_url = start_stub_server(latency)
+    results = {}
+    try:
+        for label, workers in [('sequential', 1), ('concurrent', ERGAST_WORKERS)]:
+            with ErgastClient(base_url, max_workers=workers, rate_limit=0) as client:
+                results[f"fetch.{label}"] = measure(
+                    lambda _: client.fetch_seasons(range(2000, 2000 + seasons)), iterations, warmup=1)
+    finally:
+        server.shutdown()
+        server.server_close()
+    return results
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_results(results, baseline=None):
+    print(f"\n{'benchmark':<46}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'peak KB':>11}")
+    for name, stats in results.items():
+        line = (f"{name:<46}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}"
+                f"{stats['p99_ms']:>10.3f}{stats['peak_alloc_kb']:>11.1f}")
+        previous = (baseline or {}).get(name)
+        if previous:
+            change = (stats['p50_ms'] - previous['p50_ms']) / previous['p50_ms'] * 100
+            line += f"   {'🔺' if change > 0 else '🔻'} {change:+.1f}% p50"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the prediction and training hot paths")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed calls per API/function benchmark")
+    parser.add_argument("--train-iterations", type=int, default=5, help="Timed runs per training stage and fetch benchmark")
+    parser.add_argument("--models", default="synthetic", choices=["synthetic", "trained"],
+                        help="Benchmark against a synthetic model set or the trained models on disk")
+    parser.add_argument("--trees", type=int, default=200, help="Trees per synthetic model")
+    parser.add_argument("--model-format", default="compiled", choices=["compiled", "sklearn"],
+                        help="Serve the synthetic models as compiled arrays (like production) or sklearn objects")
+    parser.add_argument("--only", choices=["api", "functions", "models", "train", "fetch"], action="append",
+                        help="Run only these groups (repeatable)")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--compare", help="Show p50 changes against an earlier JSON result")
+    args = parser.parse_args()
+
+    groups = args.only or ["api", "functions", "models", "train", "fetch"]
+
+    fixture = None
+    if args.models == "synthetic":
+        print(f"🧪 Building synthetic models ({args.trees} trees each)...")
+        fixture = build_synthetic_models(n_estimators=args.trees)
+        install_models(fixture, args.model_format)
+    elif not app.init_models(watch=False):
+        print("❌ Models not loaded. Please run train_enhanced_model.py first")
+        return
+
+    # Keep benchmark predictions out of the real prediction log
+    log_dir = tempfile.mkdtemp(prefix="f1-bench-logs-")
+    app.prediction_logger = PredictionLogger(log_dir=log_dir)
+    try:
+        results = {}
+        if "api" in groups:
+            print("⏱️ API endpoints...")
+            results.update(api_benchmarks(args.iterations))
+        if "functions" in groups:
+            print("⏱️ Prediction helpers...")
+            results.update(function_benchmarks(args.iterations))
+        if "models" in groups and fixture is not None:
+            print("⏱️ Model inference engines...")
+            results.update(model_benchmarks(fixture, args.iterations))
+        if "train" in groups:
+            print("⏱️ Training data pipeline...")
+            results.update(training_benchmarks(args.train_iterations))
+            results.update(lap_store_benchmarks(args.train_iterations))
+        if "fetch" in groups:
+            print("⏱️ Ergast fetcher (local stand-in server)...")
+            results.update(fetch_benchmarks(args.train_iterations))
+
+        baseline = None
+        if args.compare:
+            with open(args.compare) as f:
+                baseline = json.load(f)['benchmarks']
+        print_results(results, baseline)
+
+        report = {
+            'timestamp': datetime.now().isoformat(),
+            'commit': git_commit(),
+            'models': args.models,
+            'model_format': args.model_format,
+            'environment': {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'pandas': pd.__version__,
+                'sklearn': sklearn.__version__,
+                'cpus': os.cpu_count()
+            },
+            'process': process_memory(),
+            'benchmarks': results
+        }
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"\n🗂️ Saved to {args.output}")
+    finally:
+        app.prediction_logger.close()
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 50_000
+META_NAME = "meta.json"
+MMAP_MIN_ROWS = 4096  # smaller chunks are read outright; mapping them costs more than reading
+
+class ColumnarWriter:
+    """
+    Streams rows into typed column buffers and flushes every chunk_rows rows to
+    <path>/chunk-NNNNN/<column>.npy, so memory depends on the chunk size rather
+    than the number of rows written.
+    The schema maps each column to a numpy dtype, 'category' (int32 codes into one
+    dictionary per column, kept for the whole file) or 'text' (fixed-width unicode
+    per chunk, for values that rarely repeat).
+    The file appears at path only when close() succeeds. With append, rows are added
+    to an existing file: its full chunks are hard-linked into the new version and only
+    the last, partly filled chunk is rewritten.
+    """
+
+    def __init__(self, path, schema, chunk_rows=DEFAULT_CHUNK_ROWS, on_flush=None, append=False):
+        self.path = path
+        self.schema = dict(schema)
+        self.chunk_rows = chunk_rows
+        self.on_flush = on_flush
+        self.dictionaries = {col: {} for col, kind in self.schema.items() if kind == 'category'}
+        self.chunks = []
+        self.rows = 0
+
+        self._staging = path + ".building"
+        shutil.rmtree(self._staging, ignore_errors=True)
+        os.makedirs(self._staging)
+        self._buffers = {col: self._new_buffer(kind) for col, kind in self.schema.items()}
+        self._filled = 0
+        if append and os.path.exists(os.path.join(path, META_NAME)):
+            self._reopen()
+
+    def _reopen(self):
+        meta = read_meta(self.path)
+        if meta['schema'] != self.schema:
+            raise ValueError(f"Cannot append to {self.path}: its schema differs")
+        shutil.copytree(self.path, self._staging, copy_function=os.link, dirs_exist_ok=True)
+        self.dictionaries = {col: {value: code for code, value in enumerate(values)}
+                             for col, values in meta['dictionaries'].items()}
+        self.chunks = meta['chunks']
+        self.rows = meta['rows']
+
+        if self.chunks and self.chunks[-1]['rows'] < self.chunk_rows:
+            last = self.chunks.pop()
+            self.rows -= last['rows']
+            for col, kind in self.schema.items():
+                values = load_column(self._staging, last, col, mmap_mode=None)
+                if kind == 'text':
+                    self._buffers[col] = values.tolist()
+                else:
+                    self._buffers[col][:last['rows']] = values
+            self._filled = last['rows']
+            shutil.rmtree(os.path.join(self._staging, last['name']))
+
+    def _new_buffer(self, kind):
+        if kind == 'text':
+            return []
+        return np.empty(self.chunk_rows, dtype=np.int32 if kind == 'category' else kind)
+
+    def append(self, row):
+        """Add one row, given as a tuple in schema order"""
+        i = self._filled
+        for (col, kind), value in zip(self.schema.items(), row):
+            if kind == 'text':
+                self._buffers[col].append(value)
+            elif kind == 'category':
+                self._buffers[col][i] = self.dictionaries[col].setdefault(value, len(self.dictionaries[col]))
+            else:
+                self._buffers[col][i] = value
+        self._filled += 1
+        if self._filled == self.chunk_rows:
+            self.flush()
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+        return self
+
+    def flush(self):
+        if not self._filled:
+            return
+        name = f"chunk-{len(self.chunks):05d}"
+        os.makedirs(os.path.join(self._staging, name))
+        columns = {}
+        for col, kind in self.schema.items():
+            values = self._buffers[col]
+            values = np.array(values, dtype=str) if kind == 'text' else values[:self._filled]
+            np.save(os.path.join(self._staging, name, f"{col}.npy"), values)
+            columns[col] = values
+        if self.on_flush:
+            self.on_flush(self._frame(columns))
+
+        self.chunks.append({'name': name, 'rows': self._filled})
+        self.rows += self._filled
+        self._filled = 0
+        self._buffers = {col: self._new_buffer(kind) if kind == 'text' else self._buffers[col]
+                         for col, kind in self.schema.items()}
+
+    def _frame(self, columns):
+        frame = {}
+        for col, values in columns.items():
+            if self.schema[col] == 'category':
+                frame[col] = pd.Categorical.from_codes(values, categories=list(self.dictionaries[col]),
+                                                       validate=False)
+            else:
+                frame[col] = values
+        return pd.DataFrame(frame)
+
+    def close(self, meta=None):
+        """Flush the last chunk, write the metadata and move the file into place"""
+        self.flush()
+        with open(os.path.join(self._staging, META_NAME), "w") as f:
+            json.dump(dict(meta or {}, schema=self.schema, rows=self.rows, chunks=self.chunks,
+                           dictionaries={col: list(values) for col, values in self.dictionaries.items()}),
+                      f, ensure_ascii=False)
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.replace(self._staging, self.path)
+        return self.rows
+
+def read_meta(path):
+    with open(os.path.join(path, META_NAME)) as f:
+        return json.load(f)
+
+def load_column(path, chunk, column, mmap_mode='r'):
+    """One column of one chunk (category columns as their int32 codes), memory-mapped unless the chunk is small"""
+    if chunk['rows'] < MMAP_MIN_ROWS:
+        mmap_mode = None
+    return np.load(os.path.join(path, chunk['name'], f"{column}.npy"), mmap_mode=mmap_mode)
+
+def iter_chunks(path, columns=None, mmap_mode='r'):
+    """DataFrames of a columnar file one chunk at a time, with the columns memory-mapped"""
+    meta = read_meta(path)
+    columns = columns or list(meta['schema'])
+    categories = {col: pd.Index(values) for col, values in meta['dictionaries'].items()}
+    for chunk in meta['chunks']:
+        frame = {}
+        for col in columns:
+            values = load_column(path, chunk, col, mmap_mode)
+            if col in categories:
+                values = pd.Categorical.from_codes(values, dtype=pd.CategoricalDtype(categories[col]),
+                                                   validate=False)
+            frame[col] = values
+        yield pd.DataFrame(frame, copy=False)
+
+def read_columnar(path, columns=None):
+    """The whole columnar file as one DataFrame (categoricals share their dictionary)"""
+    chunks = list(iter_chunks(path, columns))
+    if not chunks:
+        meta = read_meta(path)
+        return pd.DataFrame(columns=columns or list(meta['schema']))
+    return pd.concat(chunks, ignore_index=True)
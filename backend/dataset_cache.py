@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from process_stats import process_memory
+
+DATASET_CACHE_DIR = os.path.join("data", "cache")
+CACHE_PREFIX = "enhanced-"
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def source_sha256(path):
+    """Content hash of a CSV, or of a partitioned store's manifest (rewritten on every store update)"""
+    if os.path.isdir(path):
+        return file_sha256(os.path.join(path, "manifest.json"))
+    return file_sha256(path)
+
+def cache_key(source_path, feature_version, seed, selection=None, lap_rows=None):
+    """
+    Changes whenever the source content, the feature code version, the feature
+    seed, the selection of rows read from the source (e.g. seasons) or the row
+    counts of the lap store merged onto it change
+    """
+    parts = [source_sha256(source_path), f"features-v{feature_version}", f"seed-{seed}"]
+    if selection:
+        parts.append(f"selection-{selection}")
+    if lap_rows:
+        parts.append("laps-" + "-".join(f"{table}{rows}" for table, rows in sorted(lap_rows.items())))
+    return hashlib.sha256(":".join(parts).encode()).hexdigest()[:16]
+
+def downcast_frame(df):
+    """
+    Typed copy of a DataFrame: text columns become categoricals and numeric
+    columns get the smallest integer/float32 dtype that holds them.
+    """
+    columns = {}
+    for name, column in df.reset_index(drop=True).items():
+        if pd.api.types.is_bool_dtype(column):
+            columns[name] = column.astype(bool)
+        elif pd.api.types.is_integer_dtype(column):
+            columns[name] = pd.to_numeric(column, downcast='integer')
+        elif pd.api.types.is_float_dtype(column):
+            columns[name] = column.astype(np.float32)
+        else:
+            columns[name] = column.astype(str).astype('category')
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(df)))
+
+def frame_memory_mb(df):
+    return round(df.memory_usage(deep=True).sum() / (1024 * 1024), 2)
+
+def save_frame(df, key, meta, cache_dir=DATASET_CACHE_DIR):
+    """
+    Write a typed DataFrame as one .npy file per column (categoricals as codes plus
+    their categories in meta.json) under cache_dir/enhanced-<key>/, replacing any
+    older cache entries.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    target = os.path.join(cache_dir, CACHE_PREFIX + key)
+    staging = target + ".building"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    columns = []
+    for i, (name, column) in enumerate(df.items()):
+        entry = {'name': name, 'file': f"{i}.npy"}
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            entry['categories'] = column.cat.categories.tolist()
+            values = column.cat.codes.to_numpy()
+        else:
+            values = column.to_numpy()
+        entry['dtype'] = str(values.dtype)
+        np.save(os.path.join(staging, entry['file']), np.ascontiguousarray(values))
+        columns.append(entry)
+
+    with open(os.path.join(staging, "meta.json"), "w") as f:
+        json.dump(dict(meta, key=key, rows=len(df), columns=columns), f, indent=2)
+
+    for entry in os.listdir(cache_dir):
+        if entry.startswith(CACHE_PREFIX) and entry != os.path.basename(staging):
+            shutil.rmtree(os.path.join(cache_dir, entry))
+    os.replace(staging, target)
+
+def load_frame(key, cache_dir=DATASET_CACHE_DIR, mmap_mode='r'):
+    """
+    Open a cached DataFrame with every column memory-mapped, or return None.
+    The columns are read-only views of the cache files; add new columns rather
+    than modifying these in place.
+    """
+    directory = os.path.join(cache_dir, CACHE_PREFIX + key)
+    meta_path = os.path.join(directory, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+
+    with open(meta_path) as f:
+        meta = json.load(f)
+
+    columns = {}
+    for entry in meta['columns']:
+        values = np.load(os.path.join(directory, entry['file']), mmap_mode=mmap_mode)
+        if 'categories' in entry:
+            dtype = pd.CategoricalDtype(entry['categories'])
+            columns[entry['name']] = pd.Categorical.from_codes(values, dtype=dtype, validate=False)
+        else:
+            columns[entry['name']] = values
+    return pd.DataFrame(columns, index=pd.RangeIndex(meta['rows']), copy=False), meta
+
+def cached_build(source_path, feature_version, seed, build, cache_dir=DATASET_CACHE_DIR, use_cache=True,
+                 selection=None, lap_rows=None):
+    """
+    The typed dataset for source_path: memory-mapped from the cache when the key
+    matches, otherwise built with build(), downcast and cached. lap_rows holds
+    the row count of each lap store table the build reads.
+    build() returns (DataFrame, meta dict). Returns (DataFrame, meta, report); only
+    a build reports csv_seconds/csv_memory_mb (a cache hit's meta has those of the
+    build it was cached from).
+    """
+    key = cache_key(source_path, feature_version, seed, selection, lap_rows)
+    rss_before = process_memory()['rss_mb']
+
+    if use_cache:
+        start = time.perf_counter()
+        cached = load_frame(key, cache_dir)
+        if cached is not None:
+            df, meta = cached
+            return df, meta, {
+                'source': 'cache',
+                'seconds': round(time.perf_counter() - start, 4),
+                'memory_mb': frame_memory_mb(df),
+                'rss_delta_mb': _rss_delta(rss_before)
+            }
+
+    start = time.perf_counter()
+    built, meta = build()
+    build_seconds = round(time.perf_counter() - start, 4)
+    df = downcast_frame(built)
+    meta = dict(meta, source=source_path, selection=selection, lap_rows=lap_rows, feature_version=feature_version, seed=seed,
+                build_seconds=build_seconds, csv_memory_mb=frame_memory_mb(built))
+    if use_cache:
+        save_frame(df, key, meta, cache_dir)
+
+    return df, meta, {
+        'source': 'csv',
+        'seconds': build_seconds,
+        'memory_mb': frame_memory_mb(df),
+        'rss_delta_mb': _rss_delta(rss_before),
+        'csv_seconds': build_seconds,
+        'csv_memory_mb': meta['csv_memory_mb']
+    }
+
+def _rss_delta(before):
+    after = process_memory()['rss_mb']
+    if before is None or after is None:
+        return None
+    return round(after - before, 1)
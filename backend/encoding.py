@@ -0,0 +1,92 @@
+import joblib
+import numpy as np
+import pandas as pd
+
+# Code used for categories the label encoders never saw during training. Real
+# classes are coded from 0, so -1 never stands for a known driver/team/circuit
+# (HistGradientBoosting treats negative categories as missing).
+UNKNOWN_CODE = -1
+
+class CategoryIndex:
+    """O(1) lookup from category value to its LabelEncoder code for a single column"""
+
+    def __init__(self, classes, unknown_code=UNKNOWN_CODE):
+        self.classes = np.asarray(classes)
+        self.unknown_code = unknown_code
+        self.codes = {value: code for code, value in enumerate(self.classes.tolist())}
+        self._index = pd.Index(self.classes.astype(object))
+
+    def __len__(self):
+        return len(self.classes)
+
+    def __contains__(self, value):
+        return value in self.codes
+
+    def encode_one(self, value):
+        """Encode a single value, returning the unknown code instead of raising"""
+        return self.codes.get(value, self.unknown_code)
+
+    def encode(self, values):
+        """Encode a whole sequence of values with one vectorized hash lookup"""
+        codes = self._index.get_indexer(np.asarray(values, dtype=object))
+        if self.unknown_code != -1:
+            codes[codes == -1] = self.unknown_code
+        return codes
+
+    def known_mask(self, values):
+        """Boolean mask of the values that were seen during training"""
+        return self._index.get_indexer(np.asarray(values, dtype=object)) != -1
+
+    def decode(self, codes):
+        """Map codes back to their category values"""
+        return self.classes[np.asarray(codes)]
+
+    def extended(self, values):
+        """
+        A new index with the unseen values appended after the known classes, so
+        every existing category keeps its code. Returns (index, added values).
+        """
+        added = sorted({value for value in values if value not in self.codes})
+        if not added:
+            return self, added
+        classes = np.concatenate([self.classes.astype(object), np.asarray(added, dtype=object)])
+        return CategoryIndex(classes, self.unknown_code), added
+
+def encoder_classes(encoder):
+    """Classes in code order of a fitted LabelEncoder or a CategoryIndex"""
+    return encoder.classes if isinstance(encoder, CategoryIndex) else encoder.classes_
+
+class EncodingIndex(dict):
+    """
+    Precomputed encoding index for every categorical column, keyed by column name.
+    Built from fitted LabelEncoders, or from the CategoryIndexes saved by an
+    incremental update (whose classes are no longer sorted).
+    """
+
+    @classmethod
+    def from_label_encoders(cls, label_encoders, unknown_code=UNKNOWN_CODE):
+        return cls({column: CategoryIndex(encoder_classes(encoder), unknown_code)
+                    for column, encoder in label_encoders.items()})
+
+    @classmethod
+    def load(cls, path="models/enhanced_label_encoders.pkl", unknown_code=UNKNOWN_CODE):
+        return cls.from_label_encoders(joblib.load(path), unknown_code)
+
+    def encode_one(self, column, value):
+        if column not in self:
+            return UNKNOWN_CODE
+        return self[column].encode_one(value)
+
+    def encode(self, column, values):
+        if column not in self:
+            return np.full(len(values), UNKNOWN_CODE, dtype=np.intp)
+        return self[column].encode(values)
+
+    def extend(self, column, values):
+        """
+        Give unseen values of a column codes after the existing ones without
+        renumbering them, so trained trees stay valid. LabelEncoder needs sorted
+        classes, so the extended encoding lives only in the index. Returns the added values.
+        """
+        self[column], added = self[column].extended(values)
+        return added
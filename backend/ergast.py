@@ -0,0 +1,156 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Point ERGAST_BASE_URL at a mirror or a local stand-in server for tests and benchmarks
+ERGAST_BASE_URL = os.environ.get('ERGAST_BASE_URL', 'http://ergast.com/api/f1')
+ERGAST_WORKERS = int(os.environ.get('ERGAST_WORKERS', 8))
+ERGAST_RATE_LIMIT = float(os.environ.get('ERGAST_RATE_LIMIT', 4))  # requests per second, 0 for no limit
+
+REQUEST_TIMEOUT = (5, 30)  # connect, read seconds
+PAGE_LIMIT = 1000
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class RateLimiter:
+    """Spaces requests at least 1/rate seconds apart across all threads"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+class ErgastClient:
+    """
+    Ergast API client with one pooled keep-alive session shared by all threads.
+    Requests are rate limited and time out; connection errors, 429s and 5xx responses
+    are retried with exponential backoff (honoring Retry-After).
+    """
+
+    def __init__(self, base_url=None, max_workers=ERGAST_WORKERS, rate_limit=ERGAST_RATE_LIMIT,
+                 timeout=REQUEST_TIMEOUT, retries=5, backoff=0.5):
+        self.base_url = (base_url or ERGAST_BASE_URL).rstrip('/')
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.rate_limiter = RateLimiter(rate_limit)
+
+        retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=RETRY_STATUSES,
+                      allowed_methods=frozenset(['GET']), respect_retry_after_header=True)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get_json(self, path, params=None):
+        return self.get_conditional(path, params)[0]
+
+    def get_conditional(self, path, params=None, etag=None, last_modified=None):
+        """
+        GET with If-None-Match / If-Modified-Since. Returns (data, validators), where
+        data is None when the server answered 304 Not Modified and validators holds
+        the response's ETag and Last-Modified for the next request.
+        """
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        self.rate_limiter.wait()
+        response = self.session.get(f"{self.base_url}/{path}", params=params, headers=headers,
+                                    timeout=self.timeout)
+        validators = {'etag': response.headers.get('ETag', etag),
+                      'last_modified': response.headers.get('Last-Modified', last_modified)}
+        if response.status_code == 304:
+            return None, validators
+        response.raise_for_status()
+        return response.json(), validators
+
+    def get_races(self, path, key='Results'):
+        """
+        Every race of a RaceTable endpoint, following pagination. A race whose `key`
+        list (Results, Laps, PitStops) is split across pages is merged back into one entry.
+        """
+        races = {}
+        offset = 0
+        while True:
+            data = self.get_json(path, {'limit': PAGE_LIMIT, 'offset': offset})['MRData']
+            for race in data['RaceTable']['Races']:
+                race_key = (race['season'], race['round'])
+                if race_key in races:
+                    races[race_key][key].extend(race.get(key, []))
+                else:
+                    races[race_key] = race
+            offset += int(data['limit'])
+            if offset >= int(data['total']):
+                return list(races.values())
+
+    def season_results(self, year):
+        return self.get_races(f"{year}/results.json")
+
+    def round_results(self, year, round_number, etag=None, last_modified=None):
+        """One round's race (None if it hasn't been run, or unchanged since the validators) and new validators"""
+        data, validators = self.get_conditional(f"{year}/{round_number}/results.json", {'limit': PAGE_LIMIT},
+                                                etag, last_modified)
+        races = data['MRData']['RaceTable']['Races'] if data is not None else []
+        return (races[0] if races else None), validators
+
+    def race_laps(self, year, round_number):
+        """One race with its lap-by-lap Timings, or None if Ergast has no laps for it"""
+        races = self.get_races(f"{year}/{round_number}/laps.json", 'Laps')
+        if not races:
+            return None
+        # A lap whose timings were split across pages appears twice
+        laps = {}
+        for lap in races[0]['Laps']:
+            laps.setdefault(lap['number'], dict(lap, Timings=[]))['Timings'].extend(lap['Timings'])
+        return dict(races[0], Laps=list(laps.values()))
+
+    def race_pitstops(self, year, round_number):
+        """One race with its PitStops, or None if Ergast has none for it"""
+        races = self.get_races(f"{year}/{round_number}/pitstops.json", 'PitStops')
+        return races[0] if races else None
+
+    def fetch_seasons(self, years, on_done=None, fetch=None):
+        """
+        Results of every season, fetched concurrently with fetch(year) (season_results
+        by default). years can be any keys fetch accepts, e.g. (season, round) pairs.
+        A key that still fails after its retries doesn't stop the others.
+        Returns ({key: result}, {key: error}).
+        """
+        fetch = fetch or self.season_results
+        results, failures = {}, {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(fetch, year): year for year in years}
+            for future in as_completed(futures):
+                year = futures[future]
+                try:
+                    results[year] = future.result()
+                except (requests.RequestException, ValueError, KeyError) as e:
+                    failures[year] = e
+                if on_done:
+                    on_done(year, results.get(year), failures.get(year))
+        return results, failures
@@ -0,0 +1,139 @@
+import gzip
+import json
+import os
+from datetime import datetime
+
+ERGAST_CACHE_DIR = os.path.join("data", "cache", "ergast")
+
+class SeasonCache:
+    """
+    Raw Ergast results on disk: one gzip-compressed JSON file per round under
+    <cache_dir>/<season>/, plus a season.json with each round's ETag/Last-Modified
+    and whether the season is closed.
+    Closed seasons (before current_season) are served from disk without a request.
+    An open season revalidates its last stored round and fetches newer rounds
+    until one hasn't been run yet. refresh refetches the results but keeps the
+    per-race timing files.
+    """
+
+    def __init__(self, client, cache_dir=ERGAST_CACHE_DIR, current_season=None, refresh=False):
+        self.client = client
+        self.cache_dir = cache_dir
+        self.current_season = current_season or datetime.now().year
+        self.refresh = refresh
+
+    def _path(self, year, name):
+        return os.path.join(self.cache_dir, str(year), name)
+
+    def load_meta(self, year):
+        path = self._path(year, "season.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def save_meta(self, year, meta):
+        path = self._path(year, "season.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(path + ".tmp", path)
+
+    def load_round(self, year, round_number):
+        with gzip.open(self._path(year, f"{int(round_number):02d}.json.gz"), "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_round(self, year, race):
+        os.makedirs(os.path.join(self.cache_dir, str(year)), exist_ok=True)
+        path = self._path(year, f"{int(race['round']):02d}.json.gz")
+        with gzip.open(path + ".tmp", "wt", encoding="utf-8") as f:
+            json.dump(race, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(path + ".tmp", path)
+
+    def race_timing(self, year, round_number):
+        """
+        A run race's Ergast laps and pitstops races ({'laps': ..., 'pitstops': ...},
+        None where Ergast has no data), fetched once and then read from
+        <season>/NN-timing.json.gz; a finished race's timing doesn't change.
+        """
+        path = self._path(year, f"{int(round_number):02d}-timing.json.gz")
+        if os.path.exists(path):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+
+        timing = {'laps': self.client.race_laps(year, round_number),
+                  'pitstops': self.client.race_pitstops(year, round_number)}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(path + ".tmp", "wt", encoding="utf-8") as f:
+            json.dump(timing, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(path + ".tmp", path)
+        return timing
+
+    def iter_races(self, years):
+        """Stored races of the given seasons, read from disk one round at a time"""
+        for year in years:
+            meta = self.load_meta(year)
+            for round_number in sorted(meta['rounds'] if meta else [], key=int):
+                yield self.load_round(year, round_number)
+
+    def iter_rounds(self, rounds):
+        """Stored races of the given (season, round) pairs, read from disk one at a time in order"""
+        for year, round_number in sorted(rounds):
+            yield self.load_round(year, round_number)
+
+    def season_results(self, year):
+        """The season's races and the round numbers that are new or changed since the last refresh"""
+        changed = self.refresh_season(year)
+        return list(self.iter_races([year])), changed
+
+    def refresh_season(self, year):
+        """Bring the stored season up to date; returns the round numbers that are new or changed"""
+        meta = None if self.refresh else self.load_meta(year)
+        if meta is None:
+            self._clear_results(year)
+            meta = {'season': year, 'rounds': {}}
+            races = self.client.season_results(year)
+            for race in races:
+                self.save_round(year, race)
+                meta['rounds'][race['round']] = {}
+            if races and year >= self.current_season:
+                # The season listing has no per-round validators: take the last round's,
+                # the one the next refresh revalidates, so that can answer 304
+                last = races[-1]['round']
+                race, meta['rounds'][last] = self.client.round_results(year, int(last))
+                if race is not None:
+                    self.save_round(year, race)
+            return self._finish(year, meta, [int(race['round']) for race in races])
+
+        if meta['closed']:
+            return []
+
+        changed = []
+        stored = sorted(int(round_number) for round_number in meta['rounds'])
+        round_number = stored[-1] if stored else 1
+        while True:
+            validators = meta['rounds'].get(str(round_number), {})
+            race, validators = self.client.round_results(year, round_number, **validators)
+            if race is not None and (str(round_number) not in meta['rounds']
+                                     or race != self.load_round(year, round_number)):
+                self.save_round(year, race)
+                changed.append(round_number)
+            if race is None and str(round_number) not in meta['rounds']:
+                break  # not run yet
+            meta['rounds'][str(round_number)] = validators
+            round_number += 1
+        return self._finish(year, meta, changed)
+
+    def _clear_results(self, year):
+        """Remove the season's stored results and meta; timing files are kept"""
+        season_dir = os.path.join(self.cache_dir, str(year))
+        if not os.path.isdir(season_dir):
+            return
+        for name in os.listdir(season_dir):
+            if not name.endswith("-timing.json.gz"):
+                os.remove(os.path.join(season_dir, name))
+
+    def _finish(self, year, meta, changed):
+        meta['closed'] = year < self.current_season
+        meta['fetched'] = datetime.now().isoformat()
+        self.save_meta(year, meta)
+        return changed
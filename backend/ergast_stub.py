@@ -0,0 +1,185 @@
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from feature_store import CIRCUIT_TEMPERATURE_RANGES, CONSTRUCTORS, DRIVERS
+
+STUB_ROUNDS = 20
+STUB_POINTS = [25, 18, 15, 12, 10, 8, 6, 4, 2, 1]
+STUB_LAPS = 50
+
+def stub_season(year):
+    """Deterministic, Ergast-shaped results of one season: every driver in every round"""
+    rng = np.random.default_rng(year)
+    circuits = list(CIRCUIT_TEMPERATURE_RANGES)
+    drivers = DRIVERS.names[:20]
+    teams = CONSTRUCTORS.names
+    races = []
+    for round_number in range(1, STUB_ROUNDS + 1):
+        circuit = circuits[(round_number - 1) % len(circuits)]
+        order = rng.permutation(len(drivers))
+        grid = rng.permutation(len(drivers)) + 1
+        races.append({
+            'season': str(year),
+            'round': str(round_number),
+            'raceName': f"{circuit} Grand Prix",
+            'Circuit': {'circuitId': circuit.lower().replace(' ', '_'), 'circuitName': circuit},
+            'date': f"{year}-{3 + (round_number - 1) // 3:02d}-{1 + 9 * ((round_number - 1) % 3):02d}",
+            'Results': [{
+                'position': str(position + 1),
+                'points': str(STUB_POINTS[position] if position < len(STUB_POINTS) else 0),
+                'grid': str(grid[driver]),
+                'status': 'Finished',
+                'Driver': dict(zip(['givenName', 'familyName'], drivers[driver].split(' ', 1)),
+                               driverId=stub_driver_id(drivers[driver])),
+                'Constructor': {'name': teams[driver // 2 % len(teams)]}
+            } for position, driver in enumerate(order)]
+        })
+    return races
+
+def stub_driver_id(name):
+    return name.lower().replace(' ', '_')
+
+def format_time(seconds):
+    return f"{int(seconds // 60)}:{seconds % 60:06.3f}"
+
+def stub_timing(race):
+    """
+    Ergast-shaped Laps and PitStops lists of a stub race: STUB_LAPS laps per driver,
+    slower the further back the driver finished, with one stop each.
+    """
+    rng = np.random.default_rng([int(race['season']), int(race['round'])])
+    drivers = [result['Driver']['driverId'] for result in race['Results']]
+    count = len(drivers)
+    lap_times = 80 + rng.uniform(0, 15) + 0.3 * np.arange(count)[:, None] + rng.normal(0, 0.4, (count, STUB_LAPS))
+    pit_laps = rng.integers(12, 38, count)
+    durations = rng.uniform(20.5, 26.0, count)
+    lap_times[np.arange(count), pit_laps - 1] += durations
+    running_order = np.argsort(lap_times.cumsum(axis=1), axis=0)
+
+    laps = [{
+        'number': str(lap + 1),
+        'Timings': [{'driverId': drivers[driver], 'position': str(position + 1),
+                     'time': format_time(lap_times[driver, lap])}
+                    for position, driver in enumerate(running_order[:, lap])]
+    } for lap in range(STUB_LAPS)]
+    pitstops = [{'driverId': drivers[driver], 'lap': str(pit_laps[driver]), 'stop': '1',
+                 'duration': f"{durations[driver]:.3f}"}
+                for driver in np.argsort(pit_laps, kind='stable')]
+    return laps, pitstops
+
+# Endpoint file -> key of the per-race list it returns
+STUB_ENDPOINTS = {'results.json': 'Results', 'laps.json': 'Laps', 'pitstops.json': 'PitStops'}
+
+class ErgastStubHandler(BaseHTTPRequestHandler):
+    """
+    Serves /<year>/results.json and /<year>/<round>/{results,laps,pitstops}.json
+    with Ergast's limit/offset paging over the per-race rows, strong ETags and
+    304 Not Modified.
+    """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = url.path.rstrip('/').split('/')
+        key = STUB_ENDPOINTS.get(parts[-1])
+        if key is None:
+            self.send_error(404)
+            return
+        if len(parts) >= 3 and parts[-3].isdigit() and parts[-2].isdigit():
+            year, round_number = int(parts[-3]), parts[-2]
+        elif len(parts) >= 2 and parts[-2].isdigit() and key == 'Results':
+            year, round_number = int(parts[-2]), None
+        else:
+            self.send_error(404)
+            return
+
+        time.sleep(self.server.latency)
+        self.server.requests += 1
+        query = parse_qs(url.query)
+        limit = int(query.get('limit', ['30'])[0])
+        offset = int(query.get('offset', ['0'])[0])
+
+        races = [race for race in self.server.season(year) if round_number in (None, race['round'])]
+        if key == 'Results':
+            rows = [(race, result) for race in races for result in race['Results']]
+        elif key == 'Laps':
+            # Ergast pages laps by timing, so one lap can be split across two pages
+            rows = [(race, dict(lap, Timings=[timing]))
+                    for race in races for lap in stub_timing(race)[0] for timing in lap['Timings']]
+        else:
+            rows = [(race, stop) for race in races for stop in stub_timing(race)[1]]
+        page = {}
+        for race, row in rows[offset:offset + limit]:
+            summary = {name: value for name, value in race.items() if name != 'Results'}
+            items = page.setdefault(race['round'], dict(summary, **{key: []}))[key]
+            if key == 'Laps' and items and items[-1]['number'] == row['number']:
+                items[-1]['Timings'].extend(row['Timings'])
+            else:
+                items.append(row)
+
+        body = json.dumps({'MRData': {
+            'limit': str(limit), 'offset': str(offset), 'total': str(len(rows)),
+            'RaceTable': {'season': str(year), 'Races': list(page.values())}
+        }}).encode()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class ErgastStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, open_season=None, open_rounds=STUB_ROUNDS):
+        super().__init__(address, ErgastStubHandler)
+        self.latency = latency
+        self.open_season = open_season
+        self.open_rounds = open_rounds  # rounds of open_season run so far
+        self.requests = 0
+        self._seasons = {}
+
+    def season(self, year):
+        if year not in self._seasons:
+            self._seasons[year] = stub_season(year)
+        if year == self.open_season:
+            return self._seasons[year][:self.open_rounds]
+        return self._seasons[year]
+
+def start_stub_server(latency=0.0, port=0, open_season=None, open_rounds=STUB_ROUNDS):
+    """
+    Run a stand-in server on a background thread; returns (server, base URL).
+    Only the first open_rounds rounds of open_season are served, to mimic a season in progress.
+    """
+    server = ErgastStubServer(('127.0.0.1', port), latency, open_season, open_rounds)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/api/f1"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the Ergast API with synthetic results")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every response")
+    parser.add_argument("--open-season", type=int, default=None, help="Season still in progress")
+    parser.add_argument("--open-rounds", type=int, default=STUB_ROUNDS, help="Rounds of the open season run so far")
+    args = parser.parse_args()
+
+    server = ErgastStubServer(('127.0.0.1', args.port), args.latency, args.open_season, args.open_rounds)
+    print(f"🧪 Serving synthetic Ergast data at http://127.0.0.1:{args.port}/api/f1")
+    print(f"   ERGAST_BASE_URL=http://127.0.0.1:{args.port}/api/f1 python fetch_data.py")
+    server.serve_forever()
@@ -0,0 +1,191 @@
+import numpy as np
+import pandas as pd
+
+# Model input layout, shared by training and the API
+ENHANCED_FEATURES = [
+    'grid', 'constructor_encoded', 'circuit_encoded', 'driver_encoded',
+    'weather_encoded', 'tire_strategy_encoded', 'temperature', 'humidity',
+    'wind_speed', 'track_temp', 'driver_experience', 'recent_form',
+    'quali_gap_to_teammate', 'constructor_standing', 'budget_efficiency',
+    'circuit_type_encoded', 'drs_zones', 'lap_length', 'safety_car_laps',
+    'avg_pit_time'
+]
+
+# Features that go through the scaler
+NUMERICAL_FEATURES = [
+    'temperature', 'humidity', 'wind_speed', 'track_temp',
+    'driver_experience', 'recent_form', 'quali_gap_to_teammate',
+    'budget_efficiency', 'lap_length', 'avg_pit_time'
+]
+
+def numerical_feature_indices(feature_names=ENHANCED_FEATURES):
+    """Positions of NUMERICAL_FEATURES in a feature vector laid out as feature_names"""
+    feature_names = list(feature_names)
+    return [feature_names.index(feature) for feature in NUMERICAL_FEATURES]
+
+# Attributes below describe the FEATURE_SEASON grid and the API uses them for every
+# prediction. Training applies form, qualifying gap and budget efficiency only to
+# FEATURE_SEASON results; experience, standing and circuit layout to every season.
+FEATURE_SEASON = 2025
+
+class EntityTable:
+    """
+    Attribute table for drivers, constructors or circuits, shared by training and the API.
+    Every entity gets an integer ID (its row); the last row holds the defaults used for
+    unknown names. Lookups match exact names; aliases (other names an entity has in
+    historical results) only resolve to its ID when a lookup passes aliases=True.
+    Other modules (e.g. tire strategy profiles) attach their own attributes with add_columns.
+    """
+
+    def __init__(self, records, default, aliases=None):
+        self.names = list(records)
+        self.default_id = len(self.names)
+        self.ids = {name: entity_id for entity_id, name in enumerate(self.names)}
+        self.alias_ids = dict(self.ids, **{alias: self.ids[name] for alias, name in (aliases or {}).items()})
+
+        # Row dicts for point lookups, column arrays for batch lookups
+        self.rows = [dict(default, **records[name]) for name in self.names] + [dict(default)]
+        self.columns = {column: np.array([row[column] for row in self.rows]) for column in default}
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def __getitem__(self, column):
+        """One attribute for every ID, default row last"""
+        return self.columns[column]
+
+    def add_column(self, column, values, default):
+        """Attach an attribute from a {name: value} mapping; every other entity gets default"""
+        unknown = set(values) - set(self.ids)
+        if unknown:
+            raise ValueError(f"Not in the table: {', '.join(sorted(unknown))}")
+        by_id = {self.ids[name]: value for name, value in values.items()}
+        for entity_id, row in enumerate(self.rows):
+            row[column] = by_id.get(entity_id, default)
+        self.columns[column] = np.array([row[column] for row in self.rows])
+
+    def add_columns(self, records, default):
+        """Attach every attribute of {name: {column: value}} records, with defaults per column"""
+        for column, value in default.items():
+            self.add_column(column, {name: record[column] for name, record in records.items()}, value)
+
+    def id_of(self, name, aliases=False):
+        return (self.alias_ids if aliases else self.ids).get(name, self.default_id)
+
+    def get(self, name):
+        """Attributes of one entity as a dict (shared, treat as read-only)"""
+        return self.rows[self.id_of(name)]
+
+    def ids_of(self, names, aliases=False):
+        """IDs for a whole column of names, resolving each distinct name once"""
+        codes, uniques = pd.factorize(np.asarray(names, dtype=object))
+        return np.array([self.id_of(name, aliases) for name in uniques], dtype=np.intp)[codes]
+
+    def lookup(self, column, names, aliases=False):
+        """Vectorized lookup of one attribute for a whole column of names"""
+        return self.columns[column][self.ids_of(names, aliases)]
+
+    def known_mask(self, names, aliases=False):
+        return self.ids_of(names, aliases) != self.default_id
+
+DRIVERS = EntityTable({
+    # Top Tier - Championship contenders
+    'Max Verstappen': {'experience': 11, 'form': 1.5, 'quali_gap': -0.4, 'win_factor': 1.4, 'fantasy_value': 30},
+    'Lewis Hamilton': {'experience': 19, 'form': 3.2, 'quali_gap': -0.1, 'win_factor': 1.3, 'fantasy_value': 24},
+    'Charles Leclerc': {'experience': 7, 'form': 2.8, 'quali_gap': -0.2, 'win_factor': 1.25, 'fantasy_value': 25},
+    'Lando Norris': {'experience': 7, 'form': 2.1, 'quali_gap': -0.25, 'win_factor': 1.2, 'fantasy_value': 22},
+
+    # Second Tier - Regular podium contenders
+    'George Russell': {'experience': 6, 'form': 4.1, 'quali_gap': 0.0, 'win_factor': 1.15, 'fantasy_value': 20},
+    'Fernando Alonso': {'experience': 21, 'form': 5.3, 'quali_gap': 0.1, 'win_factor': 1.2, 'fantasy_value': 18},
+    'Oscar Piastri': {'experience': 2, 'form': 3.4, 'quali_gap': -0.1, 'win_factor': 1.1, 'fantasy_value': 16},
+    'Carlos Sainz': {'experience': 11, 'form': 4.8, 'quali_gap': 0.2, 'win_factor': 1.1, 'fantasy_value': 15},
+
+    # Midfield - Occasional points
+    'Pierre Gasly': {'experience': 8, 'form': 7.2, 'quali_gap': 0.3, 'win_factor': 1.0, 'fantasy_value': 12},
+    'Alex Albon': {'experience': 5, 'form': 8.5, 'quali_gap': 0.25, 'win_factor': 0.95, 'fantasy_value': 10},
+    'Nico Hülkenberg': {'experience': 13, 'form': 9.2, 'quali_gap': 0.15, 'win_factor': 0.95, 'fantasy_value': 7},
+    'Esteban Ocon': {'experience': 8, 'form': 8.7, 'quali_gap': 0.3, 'win_factor': 0.9, 'fantasy_value': 9},
+
+    # Lower midfield
+    'Lance Stroll': {'experience': 8, 'form': 11.8, 'quali_gap': 0.4, 'win_factor': 0.85, 'fantasy_value': 8},
+    'Yuki Tsunoda': {'experience': 5, 'form': 10.1, 'quali_gap': 0.35, 'win_factor': 0.9, 'fantasy_value': 6},
+
+    # Rookies and backmarkers
+    'Kimi Antonelli': {'experience': 1, 'form': 12.5, 'quali_gap': 0.6, 'win_factor': 0.8, 'fantasy_value': 8},
+    'Oliver Bearman': {'experience': 1, 'form': 14.2, 'quali_gap': 0.7, 'win_factor': 0.8, 'fantasy_value': 5},
+    'Franco Colapinto': {'experience': 1, 'form': 15.1, 'quali_gap': 0.8, 'win_factor': 0.75, 'fantasy_value': 3},
+    'Gabriel Bortoleto': {'experience': 1, 'form': 16.3, 'quali_gap': 0.9, 'win_factor': 0.7, 'fantasy_value': 3},
+    'Isack Hadjar': {'experience': 1, 'form': 15.8, 'quali_gap': 0.85, 'win_factor': 0.75, 'fantasy_value': 2},
+    'Liam Lawson': {'experience': 2, 'form': 13.9, 'quali_gap': 0.55, 'win_factor': 0.85, 'fantasy_value': 4},
+    'Jack Doohan': {'experience': 1}
+}, default={'experience': 3, 'form': 15.0, 'quali_gap': 0.8, 'win_factor': 0.7, 'fantasy_value': 5})
+
+CONSTRUCTORS = EntityTable({
+    'McLaren': {'standing': 1, 'efficiency': 0.98, 'pace_factor': 1.0, 'base_win_probability': 25},
+    'Ferrari': {'standing': 2, 'efficiency': 0.95, 'pace_factor': 0.98, 'base_win_probability': 22},
+    'Red Bull Racing': {'standing': 3, 'efficiency': 0.93, 'pace_factor': 0.96, 'base_win_probability': 20},
+    'Mercedes': {'standing': 4, 'efficiency': 0.90, 'pace_factor': 0.94, 'base_win_probability': 18},
+    'Aston Martin': {'standing': 5, 'efficiency': 0.85, 'pace_factor': 0.88, 'base_win_probability': 8},
+    'Alpine': {'standing': 6, 'efficiency': 0.82, 'pace_factor': 0.85, 'base_win_probability': 4},
+    'Haas': {'standing': 7, 'efficiency': 0.80, 'pace_factor': 0.83, 'base_win_probability': 1},
+    'RB': {'standing': 8, 'efficiency': 0.79, 'pace_factor': 0.84, 'base_win_probability': 1.5},
+    'Williams': {'standing': 9, 'efficiency': 0.78, 'pace_factor': 0.82, 'base_win_probability': 2},
+    'Kick Sauber': {'standing': 10, 'efficiency': 0.75, 'pace_factor': 0.80, 'base_win_probability': 0.5}
+}, default={'standing': 10, 'efficiency': 0.75, 'pace_factor': 0.80, 'base_win_probability': 1.0},
+   aliases={'Red Bull': 'Red Bull Racing', 'Haas F1 Team': 'Haas', 'Sauber': 'Kick Sauber'})
+
+# Race-day air temperature range (°C, inclusive) by circuit
+CIRCUIT_TEMPERATURE_RANGES = {
+    'Bahrain International Circuit': (25, 35),
+    'Jeddah Corniche Circuit': (28, 38),
+    'Albert Park Circuit': (18, 28),
+    'Suzuka Circuit': (15, 25),
+    'Shanghai International Circuit': (12, 22),
+    'Miami International Autodrome': (26, 35),
+    'Imola': (16, 26),
+    'Monaco Circuit': (18, 28),
+    'Circuit de Barcelona-Catalunya': (16, 26),
+    'Circuit Gilles Villeneuve': (12, 22),
+    'Red Bull Ring': (14, 24),
+    'Silverstone Circuit': (12, 22),
+    'Hungaroring': (18, 30),
+    'Circuit de Spa-Francorchamps': (10, 20),
+    'Circuit Zandvoort': (12, 22),
+    'Monza Circuit': (16, 26),
+    'Marina Bay Street Circuit': (26, 32),
+    'Baku City Circuit': (20, 30),
+    'Circuit of the Americas': (18, 28),
+    'Autódromo Hermanos Rodríguez': (16, 24),
+    'Interlagos': (18, 28),
+    'Las Vegas Strip Circuit': (10, 25),
+    'Losail International Circuit': (22, 32),
+    'Yas Marina Circuit': (24, 32)
+}
+
+# Layout type, DRS zones and lap length (km) where known
+CIRCUIT_LAYOUTS = {
+    'Monaco Circuit': {'type': 'Street', 'drs_zones': 1, 'lap_length': 3.337},
+    'Marina Bay Street Circuit': {'type': 'Street', 'drs_zones': 3, 'lap_length': 5.063},
+    'Baku City Circuit': {'type': 'Street', 'drs_zones': 2, 'lap_length': 6.003},
+    'Jeddah Corniche Circuit': {'type': 'Street', 'drs_zones': 3, 'lap_length': 6.174},
+    'Las Vegas Strip Circuit': {'type': 'Street', 'drs_zones': 2, 'lap_length': 6.201},
+    'Monza Circuit': {'type': 'Power', 'drs_zones': 2, 'lap_length': 5.793},
+    'Silverstone Circuit': {'type': 'Balanced', 'drs_zones': 2, 'lap_length': 5.891},
+    'Hungaroring': {'type': 'Twisty', 'drs_zones': 1, 'lap_length': 4.381},
+    'Circuit de Spa-Francorchamps': {'type': 'Power', 'drs_zones': 2, 'lap_length': 7.004}
+}
+
+DEFAULT_TEMPERATURE_RANGE = (15, 25)
+
+def circuit_record(name):
+    record = {'temperature_range': CIRCUIT_TEMPERATURE_RANGES.get(name, DEFAULT_TEMPERATURE_RANGE)}
+    if name in CIRCUIT_LAYOUTS:
+        record.update(CIRCUIT_LAYOUTS[name], layout_known=True)
+    return record
+
+# Circuits without layout data get the expected values of the ranges training draws them from
+CIRCUITS = EntityTable(
+    {name: circuit_record(name) for name in {**CIRCUIT_TEMPERATURE_RANGES, **CIRCUIT_LAYOUTS}},
+    default={'temperature_range': DEFAULT_TEMPERATURE_RANGE, 'layout_known': False, 'type': 'Balanced',
+             'drs_zones': 2, 'lap_length': 5.0})
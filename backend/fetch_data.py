@@ -1,7 +1,15 @@
+import numpy as np
 import pandas as pd
-import requests
-import os
+import argparse
+import itertools
 import random
+import time
+
+from columnar import DEFAULT_CHUNK_ROWS
+from ergast import ERGAST_WORKERS, ErgastClient
+from ergast_cache import SeasonCache
+from lap_store import LAP_DATA_FIRST_SEASON, LapStore, format_lap_time, race_timing_rows
+from results_store import RESULT_SCHEMA, ResultsStore
 
 def simulate_weather(circuit_name):
     if any(word in circuit_name.lower() for word in ["spa", "suzuka", "interlagos", "silverstone"]):
@@ -33,48 +41,149 @@ def simulate_gap(position):
     else:
         return "DNF" if random.random() < 0.1 else f"+{round(position * random.uniform(2.5, 6.5), 3)}s"
 
-def get_multiple_seasons_results(start=1950, end=2024):
-    all_races = []
-    for year in range(start, end + 1):
-        print(f"📥 Fetching {year}...")
-        url = f"http://ergast.com/api/f1/{year}/results.json?limit=1000"
-        response = requests.get(url)
-        races = response.json()['MRData']['RaceTable']['Races']
-        all_races.extend(races)
-    return all_races
+class FetchError(Exception):
+    """Raised when some seasons could not be fetched, after every season was tried"""
 
-def races_to_dataframe(races):
-    data = []
+def refresh_season_results(start, end, client, use_cache=True, refresh=False):
+    """
+    Race results of every season in [start, end] as a generator in season order,
+    and the (season, round) pairs that are new or changed. With the cache, closed
+    seasons come from disk and the open season only asks for rounds it doesn't have
+    yet; the races are then read back one round at a time as the generator is consumed.
+    """
+    cache = SeasonCache(client, refresh=refresh) if use_cache else None
+
+    def fetch(year):
+        if cache is None:
+            races = client.season_results(year)
+            return races, [int(race['round']) for race in races]
+        return None, cache.refresh_season(year)
+
+    def report(year, result, error):
+        if error is not None:
+            print(f"⚠️ Failed to fetch {year}: {error}")
+        elif result[1]:
+            print(f"📥 {year}: {len(result[1])} new or changed rounds")
+
+    start_time = time.perf_counter()
+    results, failures = client.fetch_seasons(range(start, end + 1), on_done=report, fetch=fetch)
+    print(f"⏱️ Refreshed {len(results)} seasons in {time.perf_counter() - start_time:.1f}s")
+
+    if failures:
+        raise FetchError(f"Could not fetch seasons {', '.join(str(year) for year in sorted(failures))}")
+    changed = {(year, round_number) for year in results for round_number in results[year][1]}
+    if cache is not None:
+        return cache.iter_races(sorted(results)), changed
+    return (race for year in sorted(results) for race in results.pop(year)[0]), changed
+
+def get_multiple_seasons_results(start=1950, end=2024, client=None):
+    """Race results of every season in [start, end], fetched concurrently, in season order"""
+    own_client = client is None
+    client = client or ErgastClient()
+    try:
+        return list(refresh_season_results(start, end, client, use_cache=False)[0])
+    finally:
+        if own_client:
+            client.close()
+
+def ingest_race_timing(client, cache, store, years):
+    """
+    Add the laps and pit stops of every cached race from LAP_DATA_FIRST_SEASON on
+    that the lap store doesn't have yet. Races are fetched concurrently into the
+    response cache, then appended to the store one at a time.
+    Returns the (season, round) pairs that were stored and those that could not be fetched.
+    """
+    pending = [(year, int(round_number)) for year in years if year >= LAP_DATA_FIRST_SEASON
+               for round_number in sorted((cache.load_meta(year) or {'rounds': {}})['rounds'], key=int)
+               if not store.has_race(year, round_number)]
+    if not pending:
+        return set(), {}
+
+    start_time = time.perf_counter()
+    fetched, failures = client.fetch_seasons(pending, fetch=lambda key: cache.race_timing(*key) is not None)
+    for season, round_number in failures:
+        print(f"⚠️ Failed to fetch laps of {season} round {round_number}: {failures[(season, round_number)]}")
+    print(f"⏱️ Fetched timing of {len(fetched)} races in {time.perf_counter() - start_time:.1f}s")
+
+    laps_before, pits_before = store.rows('laps'), store.rows('pitstops')
+    for season, round_number in sorted(fetched):
+        race = cache.load_round(season, round_number)
+        names = {result['Driver']['driverId']: f"{result['Driver']['givenName']} {result['Driver']['familyName']}"
+                 for result in race['Results'] if 'driverId' in result['Driver']}
+        laps, pitstops = race_timing_rows(cache.race_timing(season, round_number))
+        store.append_race(season, round_number, laps, pitstops, names)
+    print(f"🏁 Stored {len(fetched)} races: {store.rows('laps') - laps_before} laps, "
+          f"{store.rows('pitstops') - pits_before} pit stops")
+    return set(fetched), failures
+
+def race_timing_values(store, race):
+    """
+    The race's fastest lap and each driver's gap to the winner (by Ergast driverId),
+    from the lap store; None when the store has no laps for the race. Without any
+    timed lap the fastest lap is NaN and lead-lap drivers get no time gap.
+    """
+    laps = store.race_laps(race['season'], race['round'])
+    if laps is None or not len(laps['lap']):
+        return None
 
+    timed = ~np.isnan(laps['seconds'])
+    drivers, inverse = np.unique(laps['driver'], return_inverse=True)
+    completed = np.bincount(inverse)
+    total = np.bincount(inverse[timed], weights=laps['seconds'][timed], minlength=len(drivers))
+    leaders = completed == completed.max()
+    winner_total = total[leaders].min()
+
+    refs = store.index['drivers']
+    statuses = {result['Driver'].get('driverId'): result['status'] for result in race['Results']}
+    gaps = {}
+    for driver, laps_done, seconds in zip(drivers, completed, total):
+        ref = refs[driver]
+        behind = completed.max() - laps_done
+        if not behind:
+            if timed.any():
+                gaps[ref] = f"+{seconds - winner_total:.3f}s"
+        elif statuses.get(ref) == 'Finished' or statuses.get(ref, '').startswith('+'):
+            gaps[ref] = f"+{behind} Lap{'s' if behind > 1 else ''}"
+        else:
+            gaps[ref] = "DNF"
+    fastest_lap = format_lap_time(laps['seconds'][timed].min()) if timed.any() else np.nan
+    return fastest_lap, gaps
+
+def iter_result_rows(races, timing=None):
+    """
+    One tuple per driver result, in RESULT_SCHEMA order, consuming races lazily.
+    With a lap store, races it holds get their real fastest lap and gaps.
+    """
     for race in races:
         weather = simulate_weather(race['Circuit']['circuitName'])
         tire_strategy = simulate_tire_strategy(weather)
-        fastest_lap_time = simulate_fastest_lap()
+        timing_values = race_timing_values(timing, race) if timing is not None else None
+        fastest_lap_time, gaps = timing_values or (simulate_fastest_lap(), {})
 
         for result in race['Results']:
             position = int(result['position'])
-            row = {
-                'season': race['season'],
-                'round': race['round'],
-                'race_name': race['raceName'],
-                'circuit': race['Circuit']['circuitName'],
-                'date': race['date'],
-                'driver': f"{result['Driver']['givenName']} {result['Driver']['familyName']}",
-                'constructor': result['Constructor']['name'],
-                'grid': int(result['grid']),
-                'position': position,
-                'points': float(result['points']),
-                'status': result['status'],
-                'weather': weather,
-                'tire_strategy': tire_strategy,
-                'gap_to_leader': simulate_gap(position),
-                'fastest_lap_time': fastest_lap_time
-            }
-            data.append(row)
-
-    return pd.DataFrame(data)
+            yield (
+                int(race['season']),
+                int(race['round']),
+                race['raceName'],
+                race['Circuit']['circuitName'],
+                race['date'],
+                f"{result['Driver']['givenName']} {result['Driver']['familyName']}",
+                result['Constructor']['name'],
+                int(result['grid']),
+                position,
+                float(result['points']),
+                result['status'],
+                weather,
+                tire_strategy,
+                gaps.get(result['Driver'].get('driverId')) or simulate_gap(position),
+                fastest_lap_time
+            )
 
-def add_rookie_driver(df):
+def races_to_dataframe(races):
+    return pd.DataFrame.from_records(iter_result_rows(races), columns=list(RESULT_SCHEMA))
+
+def iter_rookie_rows():
     rookies = [
         # Kimi Antonelli - consistent midfield/top-10 finishes
         ("Kimi Antonelli", "Mercedes", 5, 6, 8.0, "Dry", "2025-03-02", 1),   # Bahrain
@@ -119,34 +228,59 @@ def add_rookie_driver(df):
         ("Liam Lawson", "RB", 7, 9, 2.0, "Wet", "2025-04-21", 5),
     ]
 
-    rookie_rows = []
     for name, team, grid, pos, pts, weather, date, rnd in rookies:
-        rookie_rows.append({
-            'season': 2025,
-            'round': rnd,
-            'race_name': 'Simulated ' + team + ' GP',
-            'circuit': 'Bahrain International Circuit',
-            'date': date,
-            'driver': name,
-            'constructor': team,
-            'grid': grid,
-            'position': pos,
-            'points': pts,
-            'status': 'Finished',
-            'weather': weather,
-            'tire_strategy': simulate_tire_strategy(weather),
-            'gap_to_leader': simulate_gap(pos),
-            'fastest_lap_time': simulate_fastest_lap()
-        })
-
-    return pd.concat([df, pd.DataFrame(rookie_rows)], ignore_index=True)
+        yield (2025, rnd, 'Simulated ' + team + ' GP', 'Bahrain International Circuit', date, name, team,
+               grid, pos, pts, 'Finished', weather, simulate_tire_strategy(weather), simulate_gap(pos),
+               simulate_fastest_lap())
+
+def add_rookie_driver(df):
+    rookies = pd.DataFrame.from_records(iter_rookie_rows(), columns=list(RESULT_SCHEMA))
+    return pd.concat([df, rookies], ignore_index=True)
 
 if __name__ == "__main__":
-    races = get_multiple_seasons_results(1950, 2024)
-    df = races_to_dataframe(races)
-    df = add_rookie_driver(df)
-
-    print(df[df['season'] == 2025])
-    os.makedirs("data", exist_ok=True)
-    df.to_csv("data/f1_multi_year_results.csv", index=False)
-    print("\n✅ Data saved to data/f1_multi_year_results.csv")
+    parser = argparse.ArgumentParser(description="Fetch race results from the Ergast API")
+    parser.add_argument("--start", type=int, default=1950, help="First season")
+    parser.add_argument("--end", type=int, default=2024, help="Last season")
+    parser.add_argument("--base-url", default=None, help="API base URL (default: $ERGAST_BASE_URL or ergast.com)")
+    parser.add_argument("--workers", type=int, default=ERGAST_WORKERS, help="Concurrent requests")
+    parser.add_argument("--refresh", action="store_true", help="Refetch every season and rebuild the dataset")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write the local response cache")
+    parser.add_argument("--laps", action="store_true",
+                        help=f"Also fetch lap timings and pit stops (from {LAP_DATA_FIRST_SEASON}) into the lap store")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Rows buffered before each write")
+    args = parser.parse_args()
+    if args.laps and args.no_cache:
+        parser.error("--laps needs the response cache")
+
+    store = ResultsStore()
+    timing = LapStore() if args.laps else None
+    try:
+        with ErgastClient(args.base_url, max_workers=args.workers) as client:
+            cache = SeasonCache(client)
+            races, changed = refresh_season_results(args.start, args.end, client,
+                                                    use_cache=not args.no_cache, refresh=args.refresh)
+            if timing is not None:
+                # Rounds with new timing are rewritten too, replacing their simulated fastest lap and gaps
+                stored, _ = ingest_race_timing(client, cache, timing, range(args.start, args.end + 1))
+                changed |= stored
+    except FetchError as e:
+        print(f"❌ {e}. Existing data was left unchanged; rerun to retry.")
+        raise SystemExit(1)
+
+    start_time = time.perf_counter()
+    if store.exists() and not args.refresh and not args.no_cache:
+        if not changed:
+            print("\n✅ No new results; data is up to date")
+            raise SystemExit(0)
+        # Only the changed rounds are read back from the response cache
+        new_rows = iter_result_rows(cache.iter_rounds(changed), timing)
+        dropped, added = store.replace_rounds(new_rows, changed, args.chunk_rows)
+        seasons = sorted({season for season, _ in changed})
+        print(f"🔁 Updated {len(changed)} rounds in seasons {', '.join(map(str, seasons))}: "
+              f"replaced {dropped} rows, added {added}")
+    else:
+        rows = itertools.chain(iter_result_rows(races, timing), iter_rookie_rows())
+        total = store.write(rows, args.chunk_rows, replace_all=True)
+        print(f"📦 Wrote {total} rows in {len(store.seasons())} season partitions")
+
+    print(f"\n✅ Data saved to {store.path}/ in {time.perf_counter() - start_time:.1f}s")
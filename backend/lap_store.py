@@ -0,0 +1,248 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+LAP_STORE_DIR = os.path.join("data", "laps")
+INDEX_NAME = "index.json"
+
+# Ergast has lap timings from 1996 and pit stops from 2012
+LAP_DATA_FIRST_SEASON = 1996
+
+# Fixed-width columns of each table, stored as raw little-endian arrays in <table>/<column>.bin
+TABLES = {
+    'laps': {'race': '<i4', 'driver': '<i4', 'lap': '<i2', 'position': '<i2', 'seconds': '<f4'},
+    'pitstops': {'race': '<i4', 'driver': '<i4', 'stop': '<i2', 'lap': '<i2', 'duration': '<f4'},
+    # One row per race; laps[lap_start:lap_end] and pitstops[pit_start:pit_end] are its rows
+    'races': {'season': '<i2', 'round': '<i2', 'lap_start': '<i8', 'lap_end': '<i8',
+              'pit_start': '<i8', 'pit_end': '<i8'}
+}
+
+def parse_lap_time(value):
+    """Seconds from Ergast lap times and durations ('1:38.109', '26.898'); NaN when missing"""
+    if not value:
+        return np.nan
+    minutes, _, seconds = value.rpartition(':')
+    return int(minutes or 0) * 60 + float(seconds)
+
+def format_lap_time(seconds):
+    return f"{int(seconds // 60)}:{seconds % 60:06.3f}"
+
+class LapStore:
+    """
+    Lap timings and pit stops as fixed-width column files, memory-mapped on read.
+    Rows are appended one race at a time and each race's rows are contiguous, so
+    race_laps/race_pitstops return zero-copy slices of the mapped columns.
+    index.json holds the row count of every table (rows past it are ignored and
+    overwritten by the next append) and the driver dictionary: int32 driver IDs
+    index into drivers (Ergast driverId) and driver_names.
+    """
+
+    def __init__(self, path=LAP_STORE_DIR):
+        self.path = path
+        self.index = self._load_index()
+        self._columns = {}
+        self._races = None
+
+    def _load_index(self):
+        path = os.path.join(self.path, INDEX_NAME)
+        if not os.path.exists(path):
+            return {'rows': {table: 0 for table in TABLES}, 'drivers': [], 'driver_names': []}
+        with open(path) as f:
+            return json.load(f)
+
+    def _save_index(self):
+        path = os.path.join(self.path, INDEX_NAME)
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.index, f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    def _file(self, table, column):
+        return os.path.join(self.path, table, f"{column}.bin")
+
+    def rows(self, table):
+        return self.index['rows'][table]
+
+    def column(self, table, name):
+        """A whole column, memory-mapped read-only"""
+        if (table, name) not in self._columns:
+            rows = self.rows(table)
+            dtype = np.dtype(TABLES[table][name])
+            if rows:
+                values = np.memmap(self._file(table, name), dtype=dtype, mode='r', shape=(rows,))
+            else:
+                values = np.empty(0, dtype=dtype)
+            self._columns[(table, name)] = values
+        return self._columns[(table, name)]
+
+    def table(self, table, columns=None):
+        return {name: self.column(table, name) for name in columns or TABLES[table]}
+
+    def race_ids(self):
+        """{(season, round): race ID}"""
+        if self._races is None:
+            seasons, rounds = self.column('races', 'season'), self.column('races', 'round')
+            self._races = {(int(season), int(round_number)): race
+                           for race, (season, round_number) in enumerate(zip(seasons, rounds))}
+        return self._races
+
+    def has_race(self, season, round_number):
+        return (int(season), int(round_number)) in self.race_ids()
+
+    def _race_slice(self, table, prefix, season, round_number):
+        race = self.race_ids().get((int(season), int(round_number)))
+        if race is None:
+            return None
+        start, end = self.column('races', f"{prefix}_start")[race], self.column('races', f"{prefix}_end")[race]
+        return {name: values[start:end] for name, values in self.table(table).items()}
+
+    def race_laps(self, season, round_number):
+        """Views of one race's lap rows (no copy), or None if the race isn't stored"""
+        return self._race_slice('laps', 'lap', season, round_number)
+
+    def race_pitstops(self, season, round_number):
+        return self._race_slice('pitstops', 'pit', season, round_number)
+
+    def driver_ids(self, drivers, names=None):
+        """int32 IDs of Ergast driverIds, adding unseen drivers to the dictionary"""
+        known = {driver: i for i, driver in enumerate(self.index['drivers'])}
+        names = names or {}
+        ids = np.empty(len(drivers), dtype=np.int32)
+        for i, driver in enumerate(drivers):
+            if driver not in known:
+                known[driver] = len(self.index['drivers'])
+                self.index['drivers'].append(driver)
+                self.index['driver_names'].append(names.get(driver, driver))
+            ids[i] = known[driver]
+        return ids
+
+    def append_race(self, season, round_number, laps, pitstops, names=None):
+        """
+        Store one race. laps holds (driverId, lap, position, 'm:ss.sss') rows and
+        pitstops (driverId, stop, lap, duration) rows; names maps driverId to the
+        driver names used in the results table.
+        """
+        if self.has_race(season, round_number):
+            raise ValueError(f"Race {season} round {round_number} is already stored")
+
+        drivers, lap_numbers, positions, times = zip(*laps) if laps else ([], [], [], [])
+        pit_drivers, stops, pit_laps, durations = zip(*pitstops) if pitstops else ([], [], [], [])
+        lap_start, pit_start = self.rows('laps'), self.rows('pitstops')
+        race = self.rows('races')
+
+        self._append('laps', {
+            'race': np.full(len(drivers), race),
+            'driver': self.driver_ids(drivers, names),
+            'lap': lap_numbers,
+            'position': positions,
+            'seconds': [parse_lap_time(time) for time in times]
+        })
+        self._append('pitstops', {
+            'race': np.full(len(pit_drivers), race),
+            'driver': self.driver_ids(pit_drivers, names),
+            'stop': stops,
+            'lap': pit_laps,
+            'duration': [parse_lap_time(duration) for duration in durations]
+        })
+        self._append('races', {
+            'season': [season], 'round': [round_number],
+            'lap_start': [lap_start], 'lap_end': [lap_start + len(drivers)],
+            'pit_start': [pit_start], 'pit_end': [pit_start + len(pit_drivers)]
+        })
+        self._save_index()
+        self._columns, self._races = {}, None
+
+    def _append(self, table, columns):
+        os.makedirs(os.path.join(self.path, table), exist_ok=True)
+        rows = None
+        for name, dtype in TABLES[table].items():
+            values = np.asarray(columns[name], dtype=dtype)
+            with open(self._file(table, name), "ab") as f:
+                f.truncate(self.rows(table) * values.itemsize)  # drop rows of an interrupted append
+                f.write(values.tobytes())
+            rows = len(values)
+        self.index['rows'][table] += rows
+
+    def driver_race_summary(self, block_rows=1_000_000, races=None):
+        """
+        Per (race, driver) lap count, mean and best lap and pit stop count/time,
+        aggregated over the mapped columns block_rows at a time. races limits the
+        summary to those (season, round) pairs; only the row span holding them is read.
+        Returns a DataFrame with season, round and driver (as named in the results
+        table), ready to merge onto race results.
+        """
+        race_count, drivers = self.rows('races'), len(self.index['drivers'])
+        size = race_count * drivers
+        selected = np.ones(race_count, dtype=bool)
+        if races is not None:
+            ids = self.race_ids()
+            selected[:] = False
+            selected[[ids[key] for key in {(int(s), int(r)) for s, r in races} if key in ids]] = True
+
+        laps = np.zeros(size, dtype=np.int64)
+        lap_seconds = np.zeros(size)
+        best = np.full(size, np.inf)
+        for block in self._selected_blocks('laps', 'lap', selected, block_rows):
+            timed = ~np.isnan(block['seconds']) & selected[block['race']]
+            key = block['race'][timed].astype(np.int64) * drivers + block['driver'][timed]
+            seconds = block['seconds'][timed].astype(np.float64)
+            laps += np.bincount(key, minlength=size)
+            lap_seconds += np.bincount(key, weights=seconds, minlength=size)
+            np.minimum.at(best, key, seconds)
+
+        pits = np.zeros(size, dtype=np.int64)
+        pit_seconds = np.zeros(size)
+        for block in self._selected_blocks('pitstops', 'pit', selected, block_rows):
+            stored = selected[block['race']]
+            key = block['race'][stored].astype(np.int64) * drivers + block['driver'][stored]
+            pits += np.bincount(key, minlength=size)
+            pit_seconds += np.bincount(key, weights=np.nan_to_num(block['duration'][stored].astype(np.float64)),
+                                       minlength=size)
+
+        key = np.flatnonzero(laps | pits)
+        race, driver = np.divmod(key, drivers) if drivers else (key, key)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return pd.DataFrame({
+                'season': self.column('races', 'season')[race],
+                'round': self.column('races', 'round')[race],
+                'driver': np.asarray(self.index['driver_names'], dtype=object)[driver],
+                'laps_completed': laps[key],
+                'mean_lap_seconds': (lap_seconds[key] / laps[key]).astype(np.float32),
+                'best_lap_seconds': np.where(np.isinf(best[key]), np.nan, best[key]).astype(np.float32),
+                'pit_stops': pits[key],
+                'pit_seconds': pit_seconds[key].astype(np.float32)
+            })
+
+    def _selected_blocks(self, table, prefix, selected, block_rows):
+        """Blocks of block_rows rows covering the rows of the selected races"""
+        if not selected.any():
+            return
+        start = int(self.column('races', f"{prefix}_start")[selected].min())
+        end = int(self.column('races', f"{prefix}_end")[selected].max())
+        columns = self.table(table)
+        for block_start in range(start, end, block_rows):
+            block_end = min(block_start + block_rows, end)
+            yield {name: values[block_start:block_end] for name, values in columns.items()}
+
+def merge_timing_features(df, store=None):
+    """
+    Race results with each driver's lap and pit stop summary columns added (NaN
+    where the lap store has no timing for the race). Only the races in df are summarized.
+    """
+    store = store or LapStore()
+    keys = ['season', 'round', 'driver']
+    races = df[keys[:2]].drop_duplicates().itertuples(index=False)
+    summary = store.driver_race_summary(races=races)
+    summary[keys[:2]] = summary[keys[:2]].astype(np.int64)
+    merged = df.assign(**{key: df[key].astype(summary[key].dtype) for key in keys})
+    return merged.merge(summary, on=keys, how='left')
+
+def race_timing_rows(timing):
+    """Lap and pit stop rows for LapStore.append_race from cached Ergast laps/pitstops races"""
+    laps = [(timing_row['driverId'], int(lap['number']), int(timing_row.get('position') or 0),
+             timing_row.get('time'))
+            for lap in (timing.get('laps') or {}).get('Laps', []) for timing_row in lap['Timings']]
+    pitstops = [(stop['driverId'], int(stop['stop']), int(stop['lap']), stop.get('duration'))
+                for stop in (timing.get('pitstops') or {}).get('PitStops', [])]
+    return laps, pitstops
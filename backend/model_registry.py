@@ -0,0 +1,197 @@
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime
+
+import joblib
+
+from encoding import EncodingIndex
+from model_store import (MODEL_NAMES, SHARED_DIR_NAME, SUPPORT_FILES, VERSIONS_DIR_NAME,
+                         load_manifest, load_models, model_path)
+
+def model_files(models_dir="models"):
+    """Files that make up the model set in models_dir"""
+    return ([model_path(models_dir, name) for name in MODEL_NAMES]
+            + [os.path.join(models_dir, filename) for filename in SUPPORT_FILES.values()]
+            + [os.path.join(models_dir, SHARED_DIR_NAME, name, "meta.json") for name in MODEL_NAMES])
+
+def compute_model_version(paths):
+    """Short fingerprint of the model files on disk, for sets trained before manifests existed"""
+    digest = hashlib.sha1()
+    for path in paths:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:12]
+
+def published_version(models_dir="models"):
+    """Version of the set currently published in models_dir (its manifest version, or a file fingerprint)"""
+    manifest = load_manifest(models_dir)
+    if manifest is not None:
+        return manifest['version']
+    return compute_model_version(model_files(models_dir))
+
+class ModelSet:
+    """
+    Everything a prediction needs from one trained version: the models, label
+    encoders and their encoding index, scaler and feature names. A set is never
+    modified after loading; requests hold on to the set they started with.
+    """
+
+    def __init__(self, models, label_encoders, scaler, feature_names, version,
+                 manifest=None, load_info=None):
+        self.models = models
+        self.label_encoders = label_encoders
+        self.scaler = scaler
+        self.feature_names = feature_names
+        self.encoding_index = EncodingIndex.from_label_encoders(label_encoders)
+        self.version = version
+        self.manifest = manifest
+        self.load_info = load_info
+        self.loaded_at = datetime.now().isoformat()
+
+    @classmethod
+    def load(cls, models_dir="models", mode="auto"):
+        """
+        Load the set published in models_dir. Versioned sets are read from
+        models/versions/<version>/, which is never rewritten, so a set published
+        while this one is loading can't mix files from both.
+        """
+        manifest = load_manifest(models_dir)
+        source_dir = models_dir
+        if manifest is None:
+            version = compute_model_version(model_files(models_dir))
+        else:
+            version = manifest['version']
+            if os.path.isdir(os.path.join(models_dir, VERSIONS_DIR_NAME, version)):
+                source_dir = os.path.join(models_dir, VERSIONS_DIR_NAME, version)
+
+        models, load_info = load_models(source_dir, mode)
+        support = {key: joblib.load(os.path.join(source_dir, filename)) for key, filename in SUPPORT_FILES.items()}
+        load_info['source'] = source_dir
+        return cls(models, support['label_encoders'], support['scaler'], support['feature_names'],
+                   version, manifest, load_info)
+
+    def describe(self):
+        return {
+            'version': self.version,
+            'loaded_at': self.loaded_at,
+            'trained_at': self.manifest.get('created') if self.manifest else None,
+            'parent_version': self.manifest.get('parent') if self.manifest else None,
+            'training_mode': self.manifest.get('mode') if self.manifest else None
+        }
+
+class ModelRegistry:
+    """
+    Holds the active ModelSet and replaces it when a new version is published.
+    A background thread polls the version in models/ (the manifest is published
+    last, so a new version there means its files are complete), loads the new set,
+    runs warm_up on it and only then swaps it in with a single reference assignment.
+    Requests that already took the old set keep using it until they finish.
+    on_swap is called with the new set after every swap (not the first load).
+    """
+
+    def __init__(self, models_dir="models", mode="auto", warm_up=None, on_swap=None):
+        self.models_dir = models_dir
+        self.mode = mode
+        self.warm_up = warm_up
+        self.on_swap = on_swap
+        self._current = None
+        self._seen_version = None  # Last published version a load was attempted for
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.poll_seconds = None
+        self.previous_version = None
+        self.swaps = 0
+        self.last_check = None
+        self.last_error = None
+
+    @property
+    def current(self):
+        """The active ModelSet, or None if no set has been loaded"""
+        return self._current
+
+    def load(self):
+        """Load, warm up and activate the published set. Raises if it can't be loaded."""
+        with self._load_lock:
+            self._seen_version = published_version(self.models_dir)
+            model_set = ModelSet.load(self.models_dir, self.mode)
+            self._activate(model_set)
+            return model_set
+
+    def install(self, model_set):
+        """Activate a set that was built in memory (warm_up still runs)"""
+        with self._load_lock:
+            self._activate(model_set)
+
+    def _activate(self, model_set):
+        start = time.perf_counter()
+        if self.warm_up is not None:
+            self.warm_up(model_set)
+        model_set.load_info = dict(model_set.load_info or {}, warm_up_seconds=round(time.perf_counter() - start, 4))
+
+        previous = self._current
+        self._current = model_set
+        if previous is not None:
+            self.previous_version = previous.version
+            self.swaps += 1
+        self.last_error = None
+        if previous is not None and self.on_swap is not None:
+            self.on_swap(model_set)
+
+    def check(self):
+        """
+        Load the published set if its version changed since the last check.
+        Returns True if a new set was swapped in. A set that fails to load or warm
+        up is not retried until another version is published.
+        """
+        self.last_check = datetime.now().isoformat()
+        version = published_version(self.models_dir)
+        if version == self._seen_version:
+            return False
+
+        try:
+            model_set = self.load()
+        except Exception as e:
+            self._seen_version = version
+            self.last_error = f"{version}: {e}"
+            print(f"⚠️ Could not load model version {version}, keeping "
+                  f"{self._current.version if self._current else 'no models'}: {e}")
+            return False
+        print(f"🔄 Swapped in model version {model_set.version} "
+              f"(loaded in {model_set.load_info['load_seconds']}s, warmed up in {model_set.load_info['warm_up_seconds']}s)")
+        return True
+
+    def start(self, poll_seconds):
+        """Poll for new versions every poll_seconds on a daemon thread"""
+        if self._thread is not None:
+            return
+        self.poll_seconds = poll_seconds
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="model-registry", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.check()
+            except Exception as e:
+                self.last_error = str(e)
+
+    def status(self):
+        model_set = self._current
+        return dict(model_set.describe() if model_set else {'version': None},
+                    published_version=self._seen_version,
+                    previous_version=self.previous_version,
+                    swaps=self.swaps,
+                    reload_interval=self.poll_seconds,
+                    last_check=self.last_check,
+                    last_error=self.last_error)
@@ -0,0 +1,323 @@
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+
+import joblib
+import numpy as np
+
+MODEL_NAMES = ['position', 'podium', 'winner', 'points']
+OPTIONAL_MODELS = {'winner'}
+
+SHARED_DIR_NAME = "shared"
+SHARED_ARRAYS = ['roots', 'feature', 'threshold', 'children_left', 'children_right', 'value']
+
+# Every training run writes a complete set to models/versions/<version>/ and then
+# publishes it as the current set in models/, described by models/manifest.json
+MANIFEST_NAME = "manifest.json"
+VERSIONS_DIR_NAME = "versions"
+MODEL_VERSIONS_TO_KEEP = 5
+SUPPORT_FILES = {
+    'label_encoders': "enhanced_label_encoders.pkl",
+    'scaler': "feature_scaler.pkl",
+    'feature_names': "feature_names.pkl"
+}
+
+def model_path(models_dir, name):
+    return os.path.join(models_dir, f"{name}_enhanced_model.pkl")
+
+# Version of the exported array layout. Format 1 stored int64/float64 arrays with
+# -1 marking leaves; format 2 is the compact float32/int32 layout below.
+SHARED_FORMAT = 2
+
+class SharedTreeEnsemble:
+    """
+    Read-only tree ensemble compiled into flat, contiguous NumPy arrays:
+    int32 feature/children and float32 thresholds/values for every node of every
+    tree. Leaves point to themselves, so a small batch is evaluated across all
+    trees at once with max_depth vectorized steps and no per-tree Python loop.
+    The arrays are opened with mmap_mode='r', so every worker process that loads
+    the same files shares one copy of the trees through the OS page cache.
+    """
+
+    def __init__(self, arrays, meta):
+        for name in SHARED_ARRAYS:
+            setattr(self, name, arrays[name])
+        self.meta = meta
+        self.kind = meta['kind']
+        self.bias = np.asarray(meta['bias'])
+        self.scale = meta['scale']
+        self.max_depth = meta['max_depth']
+        self.n_features_in_ = meta['n_features']
+        if 'classes' in meta:
+            self.classes_ = np.asarray(meta['classes'])
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+                  for name in SHARED_ARRAYS}
+        if meta.get('format', 1) < SHARED_FORMAT:
+            # Older export: compile it in memory (re-export to get the mmap benefits back)
+            arrays, meta = _compact_arrays(arrays), dict(meta, format=SHARED_FORMAT)
+            meta['max_depth'] = _max_depth(arrays)
+        return cls(arrays, meta)
+
+    def _accumulate(self, X):
+        # Trees compare float32 features against their thresholds, like sklearn does
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        values = X.ravel()
+
+        # One cursor per (tree, row) pair, all advanced one level per step.
+        # Leaves loop back to themselves, so cursors that finish early just stay put.
+        node = np.repeat(self.roots, n_rows)
+        row_offset = np.tile(np.arange(n_rows, dtype=np.int32) * n_features, len(self.roots))
+        for _ in range(self.max_depth):
+            go_left = values[row_offset + self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.children_left[node], self.children_right[node])
+
+        leaf_values = self.value[node].reshape((len(self.roots), n_rows) + self.value.shape[1:])
+        return self.bias + self.scale * leaf_values.sum(axis=0, dtype=np.float64)
+
+    def predict(self, X):
+        output = self._accumulate(X)
+        if self.kind == 'classifier':
+            return self.classes_[np.argmax(output, axis=1)]
+        return output
+
+    def predict_proba(self, X):
+        if self.kind != 'classifier':
+            raise AttributeError("predict_proba is only available for classifiers")
+        return self._accumulate(X)
+
+def _flatten_trees(trees, classifier):
+    """Concatenate the node arrays of fitted sklearn trees, with children as absolute node indices"""
+    roots, feature, threshold, left, right, value = [], [], [], [], [], []
+    offset = 0
+    for tree in trees:
+        t = tree.tree_
+        roots.append(offset)
+        feature.append(t.feature)
+        threshold.append(t.threshold)
+        left.append(np.where(t.children_left == -1, -1, t.children_left + offset))
+        right.append(np.where(t.children_right == -1, -1, t.children_right + offset))
+        if classifier:
+            node_value = t.value[:, 0, :]
+            value.append(node_value / node_value.sum(axis=1, keepdims=True))
+        else:
+            value.append(t.value[:, 0, 0])
+        offset += t.node_count
+
+    return {
+        'roots': np.asarray(roots),
+        'feature': np.concatenate(feature),
+        'threshold': np.concatenate(threshold),
+        'children_left': np.concatenate(left),
+        'children_right': np.concatenate(right),
+        'value': np.concatenate(value)
+    }
+
+def _compact_arrays(arrays):
+    """
+    Convert flattened trees to the compact layout: int32 indices, float32 values,
+    and leaves whose children (and feature 0) point back to themselves.
+    Thresholds are rounded down to the nearest float32, which keeps
+    `x <= threshold` exactly equivalent for float32 inputs.
+    """
+    leaf = np.asarray(arrays['children_left']) == -1
+    nodes = np.arange(len(leaf))
+
+    threshold = np.asarray(arrays['threshold'], dtype=np.float64)
+    threshold32 = threshold.astype(np.float32)
+    rounded_up = threshold32.astype(np.float64) > threshold
+    threshold32[rounded_up] = np.nextafter(threshold32[rounded_up], np.float32(-np.inf))
+
+    return {
+        'roots': np.asarray(arrays['roots'], dtype=np.int32),
+        'feature': np.where(leaf, 0, arrays['feature']).astype(np.int32),
+        'threshold': np.where(leaf, np.float32(0), threshold32).astype(np.float32),
+        'children_left': np.where(leaf, nodes, arrays['children_left']).astype(np.int32),
+        'children_right': np.where(leaf, nodes, arrays['children_right']).astype(np.int32),
+        'value': np.asarray(arrays['value'], dtype=np.float32)
+    }
+
+def _max_depth(arrays):
+    """Levels below the deepest root-to-leaf path, i.e. steps needed to reach every leaf"""
+    left, right = arrays['children_left'], arrays['children_right']
+    frontier = np.asarray(arrays['roots'])
+    depth = 0
+    while True:
+        frontier = frontier[left[frontier] != frontier]
+        if len(frontier) == 0:
+            return depth
+        frontier = np.concatenate([left[frontier], right[frontier]])
+        depth += 1
+
+def export_shared_model(model, directory):
+    """
+    Compile a fitted forest or gradient boosting regressor into compact .npy arrays.
+    Returns False for model types that can't be exported, including every
+    HistGradientBoosting model: those stay pickle-only and load_models reads their
+    pickle even in 'shared' mode.
+    """
+    from sklearn.ensemble import (GradientBoostingRegressor, RandomForestClassifier,
+                                  RandomForestRegressor)
+
+    if isinstance(model, RandomForestRegressor) and model.n_outputs_ == 1:
+        trees = model.estimators_
+        arrays = _flatten_trees(trees, classifier=False)
+        meta = {'kind': 'regressor', 'bias': 0.0, 'scale': 1.0 / len(model.estimators_)}
+    elif isinstance(model, RandomForestClassifier) and model.n_outputs_ == 1:
+        trees = model.estimators_
+        arrays = _flatten_trees(trees, classifier=True)
+        meta = {'kind': 'classifier', 'bias': 0.0, 'scale': 1.0 / len(model.estimators_),
+                'classes': model.classes_.tolist()}
+    elif isinstance(model, GradientBoostingRegressor) and hasattr(model.init_, 'constant_'):
+        trees = model.estimators_[:, 0]
+        arrays = _flatten_trees(trees, classifier=False)
+        meta = {'kind': 'regressor', 'bias': float(np.ravel(model.init_.constant_)[0]),
+                'scale': model.learning_rate}
+    else:
+        return False
+
+    arrays = _compact_arrays(arrays)
+    meta['format'] = SHARED_FORMAT
+    meta['n_features'] = int(model.n_features_in_)
+    meta['n_trees'] = len(arrays['roots'])
+    meta['max_depth'] = max(int(tree.tree_.max_depth) for tree in trees)
+
+    os.makedirs(directory, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(array))
+    with open(os.path.join(directory, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+    return True
+
+def export_shared_models(models, models_dir="models"):
+    """Export every exportable model to models/shared/<name>/ for memory-mapped loading"""
+    shared_dir = os.path.join(models_dir, SHARED_DIR_NAME)
+    exported = []
+    for name, model in models.items():
+        target = os.path.join(shared_dir, name)
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        if model is not None and export_shared_model(model, target):
+            exported.append(name)
+    return exported
+
+def load_models(models_dir="models", mode="auto"):
+    """
+    Load the enhanced models.
+    mode='pickle' uses joblib, mode='shared' opens the exported arrays with mmap
+    (falling back to the pickle for models that were not exported) and mode='auto'
+    picks 'shared' whenever an export exists.
+    Returns the models dict and a dict describing how they were loaded.
+    """
+    shared_dir = os.path.join(models_dir, SHARED_DIR_NAME)
+    if mode == 'auto':
+        mode = 'shared' if os.path.isdir(shared_dir) else 'pickle'
+
+    start = time.perf_counter()
+    models = {}
+    sources = {}
+    for name in MODEL_NAMES:
+        shared_path = os.path.join(shared_dir, name)
+        pickle_path = model_path(models_dir, name)
+
+        if mode == 'shared' and os.path.exists(os.path.join(shared_path, "meta.json")):
+            models[name] = SharedTreeEnsemble.load(shared_path)
+            sources[name] = 'mmap'
+        elif name in OPTIONAL_MODELS and not os.path.exists(pickle_path):
+            models[name] = None
+            sources[name] = None
+        else:
+            models[name] = joblib.load(pickle_path)
+            sources[name] = 'pickle'
+
+    return models, {
+        'mode': mode,
+        'sources': sources,
+        'load_seconds': round(time.perf_counter() - start, 4)
+    }
+
+def load_manifest(models_dir="models"):
+    """The manifest of the current model set, or None for sets trained before manifests existed"""
+    path = os.path.join(models_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def new_version_id(models_dir="models"):
+    version = datetime.now().strftime("%Y%m%d-%H%M%S")
+    versions_dir = os.path.join(models_dir, VERSIONS_DIR_NAME)
+    candidate, suffix = version, 1
+    while os.path.exists(os.path.join(versions_dir, candidate)):
+        suffix += 1
+        candidate = f"{version}-{suffix}"
+    return candidate
+
+def save_model_set(models, label_encoders, scaler, feature_names, manifest, models_dir="models"):
+    """
+    Write a complete model set (pickles, encoders, scaler, feature names, shared
+    export and manifest) to models/versions/<manifest['version']>/, publish it as
+    the current set and prune old versions. Returns the version directory.
+    """
+    version_dir = os.path.join(models_dir, VERSIONS_DIR_NAME, manifest['version'])
+    os.makedirs(version_dir)
+
+    for name, model in models.items():
+        if model is not None:
+            joblib.dump(model, model_path(version_dir, name))
+    support = {'label_encoders': label_encoders, 'scaler': scaler, 'feature_names': feature_names}
+    for key, filename in SUPPORT_FILES.items():
+        joblib.dump(support[key], os.path.join(version_dir, filename))
+
+    manifest['exported'] = export_shared_models(models, version_dir)
+    with open(os.path.join(version_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    publish_model_set(version_dir, models_dir)
+    prune_model_versions(models_dir)
+    return version_dir
+
+def publish_model_set(version_dir, models_dir="models"):
+    """
+    Make a saved set the one the API loads from models/. Each file is copied to a
+    temporary name and swapped in with os.replace; the manifest goes last.
+    """
+    for name in MODEL_NAMES:
+        if not os.path.exists(model_path(version_dir, name)) and os.path.exists(model_path(models_dir, name)):
+            os.remove(model_path(models_dir, name))
+
+    for entry in sorted(os.listdir(version_dir), key=lambda entry: entry == MANIFEST_NAME):
+        source = os.path.join(version_dir, entry)
+        target = os.path.join(models_dir, entry)
+        staging = target + ".publishing"
+        if os.path.isdir(source):
+            shutil.rmtree(staging, ignore_errors=True)
+            shutil.copytree(source, staging)
+            if os.path.exists(target):
+                shutil.rmtree(target)
+            os.replace(staging, target)
+        else:
+            shutil.copy2(source, staging)
+            os.replace(staging, target)
+
+def prune_model_versions(models_dir="models", keep=MODEL_VERSIONS_TO_KEEP):
+    versions_dir = os.path.join(models_dir, VERSIONS_DIR_NAME)
+    for version in sorted(os.listdir(versions_dir))[:-keep]:
+        shutil.rmtree(os.path.join(versions_dir, version))
+
+if __name__ == "__main__":
+    # Compile the current pickled models for shared, memory-mapped loading
+    pickled = {name: joblib.load(model_path("models", name))
+               for name in MODEL_NAMES if os.path.exists(model_path("models", name))}
+    exported = export_shared_models(pickled)
+    print(f"✅ Exported {len(exported)} models to models/{SHARED_DIR_NAME}/: {', '.join(exported)}")
+    skipped = sorted(set(pickled) - set(exported))
+    if skipped:
+        print(f"⚠️ Not exportable (will load from pickle): {', '.join(skipped)}")
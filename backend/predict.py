@@ -1,26 +1,28 @@
 import joblib
 import numpy as np
 
+from encoding import EncodingIndex
+
 # Load models and encoders
 reg = joblib.load("models/position_model.pkl")
 clf_win = joblib.load("models/winner_model.pkl")
 clf_pod = joblib.load("models/podium_model.pkl")
-label_encoders = joblib.load("models/label_encoders.pkl")
+encoding_index = EncodingIndex.load("models/label_encoders.pkl")
 
 # --- Input section (you can later replace this with user input or a UI) ---
 grid = int(input("Enter grid position (e.g. 1): "))
 constructor_name = input("Enter constructor name (e.g. Red Bull): ")
 circuit_name = input("Enter circuit name (e.g. Bahrain International Circuit): ")
 
-# Encode inputs using label encoders
-try:
-    constructor_encoded = label_encoders['constructor'].transform([constructor_name])[0]
-    circuit_encoded = label_encoders['circuit'].transform([circuit_name])[0]
-except ValueError as e:
+# Encode inputs using the encoding index
+if constructor_name not in encoding_index['constructor'] or circuit_name not in encoding_index['circuit']:
     print("\n❌ Error: Constructor or circuit name not recognized.")
     print("Make sure it matches exactly one from the training data.")
     exit()
 
+constructor_encoded = encoding_index.encode_one('constructor', constructor_name)
+circuit_encoded = encoding_index.encode_one('circuit', circuit_name)
+
 # Prepare input for prediction
 X_input = np.array([[grid, constructor_encoded, circuit_encoded]])
 
@@ -35,7 +37,7 @@ print(f"🥉 Podium Prediction: {'YES' if podium_pred == 1 else 'NO'}")
 
 # Display top 3 predicted winners with confidence
 print("\n🏆 Most Likely Winners:")
-classes = label_encoders['driver'].inverse_transform(np.argsort(win_prob[0])[::-1][:3])
+classes = encoding_index['driver'].decode(np.argsort(win_prob[0])[::-1][:3])
 probs = np.sort(win_prob[0])[::-1][:3]
 top_n = min(3, len(classes))
 for i in range(top_n):
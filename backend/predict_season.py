@@ -0,0 +1,42 @@
+import argparse
+import json
+import time
+
+from app import init_models, normalize_entries, default_season_entries, run_season_prediction
+
+def main():
+    parser = argparse.ArgumentParser(description="Predict every round of the 2025 season in one batch")
+    parser.add_argument("--weather", default="Dry", choices=["Dry", "Wet", "Mixed"])
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible predictions")
+    parser.add_argument("--runs", type=int, default=0, help="Monte Carlo runs per round (0 to skip)")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for per-round simulation")
+    parser.add_argument("--output", help="Write the full JSON result to this file")
+    args = parser.parse_args()
+
+    model_set = init_models(watch=False)
+    if not model_set:
+        print("❌ Models not loaded. Please run train_enhanced_model.py first")
+        return
+
+    start = time.perf_counter()
+    result = run_season_prediction(model_set, args.weather, normalize_entries(default_season_entries()),
+                                   args.seed, args.runs, args.workers)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n🏁 2025 Season Prediction ({args.weather})")
+    for race in result['rounds']:
+        winner = race['predictions'][0]
+        line = f"   R{race['round']:>2} {race['race_info']['circuit']:<32} 🏆 {winner['driver']} ({winner['win_probability']}%)"
+        if 'simulations' in race:
+            favourite = race['simulations'][0]
+            line += f" | sim: {favourite['driver']} {favourite['expected_points']} pts"
+        print(line)
+    print(f"\n⏱️ {len(result['rounds'])} rounds predicted in {elapsed:.2f}s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"🗂️ Saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import atexit
+import csv
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime
+
+# One row per driver per prediction
+LOG_COLUMNS = [
+    'timestamp', 'prediction_id', 'circuit', 'weather', 'temperature', 'track_temp',
+    'num_entries', 'driver', 'constructor', 'grid', 'predicted_position',
+    'win_probability', 'points_earned', 'tire_strategy'
+]
+
+_STOP = object()
+
+class PredictionLogger:
+    """
+    Background prediction logger. Request threads only enqueue a record; a writer
+    thread drains the bounded queue and appends rows to a rotating CSV file in
+    batches, flushing when the batch is full or the flush interval has passed.
+    """
+
+    def __init__(self, log_dir="logs", filename="prediction_log.csv", max_queue=10_000,
+                 batch_size=200, flush_interval=2.0, max_bytes=10 * 1024 * 1024, backup_count=5):
+        self.log_dir = log_dir
+        self.path = os.path.join(log_dir, filename)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.dropped = 0
+        self._header_checked = False
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def log(self, request_data, predictions, temp, track_temp):
+        """Enqueue a prediction; never blocks the caller and drops the record if the queue is full"""
+        record = {
+            'timestamp': datetime.now().isoformat(),
+            'prediction_id': uuid.uuid4().hex,
+            'circuit': request_data['circuit'],
+            'weather': request_data['weather'],
+            'temperature': temp,
+            'track_temp': track_temp,
+            'num_entries': len(request_data['entries']),
+            'predictions': predictions
+        }
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="prediction-logger", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def close(self, timeout=5.0):
+        """Flush everything still queued and stop the writer thread, waiting at most about timeout seconds"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            print(f"Logging error: queue still full after {timeout}s, {self._queue.qsize()} records not written")
+            return
+        self._thread.join(max(0.0, deadline - time.monotonic()))
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                record = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                record = None
+
+            if record is _STOP:
+                self._write_batch(batch)
+                return
+            if record is not None:
+                batch.append(record)
+
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._write_batch(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _write_batch(self, batch):
+        if not batch:
+            return
+        try:
+            os.makedirs(self.log_dir, exist_ok=True)
+            self._rotate_if_needed()
+            write_header = not os.path.exists(self.path)
+
+            with open(self.path, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                if write_header:
+                    writer.writerow(LOG_COLUMNS)
+                for record in batch:
+                    for pred in record['predictions']:
+                        writer.writerow([
+                            record['timestamp'], record['prediction_id'], record['circuit'],
+                            record['weather'], record['temperature'], record['track_temp'],
+                            record['num_entries'], pred['driver'], pred['constructor'],
+                            pred['grid'], pred['predicted_position'], pred['win_probability'],
+                            pred['points_earned'], pred['tire_strategy']
+                        ])
+        except Exception as e:
+            print(f"Logging error: {e}")
+
+    def _rotate_if_needed(self):
+        """Roll the log over when it is too large or was written with an older column layout"""
+        if not os.path.exists(self.path):
+            return
+        if os.path.getsize(self.path) < self.max_bytes and (self._header_checked or self._has_current_header()):
+            self._header_checked = True
+            return
+
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def _has_current_header(self):
+        with open(self.path, newline='', encoding='utf-8') as f:
+            return next(csv.reader(f), None) == LOG_COLUMNS
@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# ru_maxrss is reported in bytes on macOS and in KB on Linux
+MAXRSS_UNITS_PER_MB = 1024 * 1024 if sys.platform == 'darwin' else 1024
+
+def process_memory():
+    """
+    Memory of the current process in MB: resident set size, the part of it backed
+    by shared file pages (e.g. memory-mapped models) and the peak RSS so far.
+    """
+    stats = {'pid': os.getpid(), 'rss_mb': None, 'shared_mb': None, 'peak_rss_mb': None}
+
+    try:
+        with open("/proc/self/statm") as f:
+            _, resident, shared = (int(value) for value in f.read().split()[:3])
+        page_mb = os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+        stats['rss_mb'] = round(resident * page_mb, 1)
+        stats['shared_mb'] = round(shared * page_mb, 1)
+    except (OSError, ValueError):
+        pass
+
+    if resource is not None:
+        stats['peak_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / MAXRSS_UNITS_PER_MB, 1)
+
+    return stats
+
+class StageProfiler:
+    """
+    Wall time and memory of consecutive named stages. Each stage records the RSS
+    when it ends, the process peak RSS so far and, with trace=True, the tracemalloc
+    peak of Python and numpy allocations made during the stage.
+    Call start(name) to begin a stage (ending the previous one) and finish() at the end.
+    """
+
+    def __init__(self, trace=False):
+        self.trace = trace
+        self.stages = []
+        self._current = None
+
+    def start(self, name):
+        self._end_stage()
+        if self.trace:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        self._current = (name, time.perf_counter())
+
+    def finish(self):
+        self._end_stage()
+        if self.trace and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return self.stages
+
+    def _end_stage(self):
+        if self._current is None:
+            return
+        name, start = self._current
+        memory = process_memory()
+        traced_peak = tracemalloc.get_traced_memory()[1] if self.trace else None
+        self.stages.append({
+            'stage': name,
+            'seconds': round(time.perf_counter() - start, 3),
+            'rss_mb': memory['rss_mb'],
+            'peak_rss_mb': memory['peak_rss_mb'],
+            'traced_peak_mb': round(traced_peak / (1024 * 1024), 1) if traced_peak is not None else None
+        })
+        self._current = None
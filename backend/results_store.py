@@ -0,0 +1,239 @@
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from columnar import DEFAULT_CHUNK_ROWS, ColumnarWriter, load_column, read_meta
+
+RESULTS_STORE_DIR = os.path.join("data", "results")
+MANIFEST_NAME = "manifest.json"
+
+# Column order and storage type of the results table ('category' and 'text' as in columnar.py)
+RESULT_SCHEMA = {
+    'season': 'int16',
+    'round': 'int8',
+    'race_name': 'category',
+    'circuit': 'category',
+    'date': 'category',
+    'driver': 'category',
+    'constructor': 'category',
+    'grid': 'int8',
+    'position': 'int8',
+    'points': 'float32',
+    'status': 'category',
+    'weather': 'category',
+    'tire_strategy': 'category',
+    'gap_to_leader': 'text',
+    'fastest_lap_time': 'text'
+}
+
+SEASON, ROUND = list(RESULT_SCHEMA).index('season'), list(RESULT_SCHEMA).index('round')
+
+def is_simulated(race_names):
+    return race_names.astype(str).str.startswith('Simulated ')
+
+class ResultsStore:
+    """
+    Race results partitioned by season: one columnar file (see columnar.py) per
+    season under <path>/season=<year>/ and a manifest.json with every partition's
+    row count, rounds and circuits.
+    Writes replace only the partitions they touch. Reads pick partitions from the
+    manifest by season and circuit before opening any of them.
+    """
+
+    def __init__(self, path=RESULTS_STORE_DIR):
+        self.path = path
+
+    def exists(self):
+        return os.path.exists(os.path.join(self.path, MANIFEST_NAME))
+
+    def load_manifest(self):
+        path = os.path.join(self.path, MANIFEST_NAME)
+        if not os.path.exists(path):
+            return {'schema': RESULT_SCHEMA, 'partitions': {}}
+        with open(path) as f:
+            return json.load(f)
+
+    def save_manifest(self, manifest):
+        os.makedirs(self.path, exist_ok=True)
+        path = os.path.join(self.path, MANIFEST_NAME)
+        manifest['updated'] = datetime.now().isoformat()
+        with open(path + ".tmp", "w") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    def partition_path(self, season):
+        return os.path.join(self.path, f"season={season}")
+
+    def seasons(self):
+        return sorted(int(season) for season in self.load_manifest()['partitions'])
+
+    def fingerprint(self):
+        """Changes whenever any partition is rewritten"""
+        manifest = self.load_manifest()
+        return json.dumps(manifest['partitions'], sort_keys=True)
+
+    def write(self, rows, chunk_rows=DEFAULT_CHUNK_ROWS, replace_all=False, append=False):
+        """
+        Stream rows (tuples in RESULT_SCHEMA order) into their season partitions.
+        The partitions written are replaced, or extended with append. With
+        replace_all, partitions of seasons not in rows are dropped. One partition is
+        open at a time, so rows should come grouped by season; a season that comes
+        back later is appended to. Returns the number of rows written.
+        """
+        manifest = self.load_manifest()
+        written = set()
+        writer = season = None
+        total = 0
+
+        def close():
+            partition = manifest['partitions'].get(str(season), {}) if appending else {}
+            rows_written = writer.close({'season': season})
+            manifest['partitions'][str(season)] = {
+                'rows': rows_written,
+                'rounds': sorted(set(partition.get('rounds', [])) | rounds),
+                'circuits': sorted(writer.dictionaries['circuit']),
+                'written': datetime.now().isoformat()
+            }
+            self.save_manifest(manifest)
+            return rows_written - partition.get('rows', 0)
+
+        for row in rows:
+            if int(row[SEASON]) != season:
+                if writer is not None:
+                    total += close()
+                season = int(row[SEASON])
+                appending = append or season in written
+                writer = ColumnarWriter(self.partition_path(season), RESULT_SCHEMA, chunk_rows, append=appending)
+                written.add(season)
+                rounds = set()
+            writer.append(row)
+            rounds.add(int(row[ROUND]))
+        if writer is not None:
+            total += close()
+
+        if replace_all:
+            for stale in set(manifest['partitions']) - {str(season) for season in written}:
+                shutil.rmtree(self.partition_path(stale), ignore_errors=True)
+                del manifest['partitions'][stale]
+        manifest['partitions'] = dict(sorted(manifest['partitions'].items(), key=lambda item: int(item[0])))
+        self.save_manifest(manifest)
+        return total
+
+    def replace_rounds(self, rows, changed, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """
+        Update only the seasons with changed (season, round) pairs. Rounds the
+        partition doesn't have yet are appended to it; a partition holding an older
+        copy of a changed round is rewritten with the new rows of that round where
+        its old rows were (simulated rows are kept), so rows keep their order.
+        Every other partition is left untouched. Returns (rows dropped, rows added).
+        """
+        new_rows = {}
+        for row in rows:
+            new_rows.setdefault(int(row[SEASON]), []).append(row)
+
+        partitions = self.load_manifest()['partitions']
+        dropped = added = 0
+        for season in sorted({season for season, _ in changed}):
+            rounds = {round_number for changed_season, round_number in changed if changed_season == season}
+            season_rows = new_rows.get(season, [])
+            added += len(season_rows)
+            if not rounds & set(partitions.get(str(season), {}).get('rounds', [])):
+                self.write(season_rows, chunk_rows, append=True)
+                continue
+            existing = self.read(seasons=[season])
+            stale = existing['round'].astype(int).isin(rounds) & ~is_simulated(existing['race_name'])
+            dropped += int(stale.sum())
+            self.write(_splice_rounds(existing, stale.to_numpy(), season_rows), chunk_rows)
+        return dropped, added
+
+    def select_partitions(self, seasons=None, circuits=None):
+        """Seasons whose partitions can hold rows matching the predicates, from the manifest alone"""
+        partitions = self.load_manifest()['partitions']
+        wanted = None if seasons is None else {int(season) for season in seasons}
+        circuits = None if circuits is None else set(circuits)
+        return [int(season) for season, partition in partitions.items()
+                if (wanted is None or int(season) in wanted)
+                and (circuits is None or circuits & set(partition['circuits']))]
+
+    def read(self, seasons=None, circuits=None, columns=None):
+        """
+        Rows of the given seasons and circuits (None for all) as one DataFrame in
+        season order. Partitions are skipped on the manifest, columns not asked for
+        are never opened, and the circuit filter runs on the memory-mapped circuit
+        codes before any other column is read.
+        """
+        columns = list(columns or RESULT_SCHEMA)
+        paths = [self.partition_path(season) for season in self.select_partitions(seasons, circuits)]
+        metas = [read_meta(path) for path in paths]
+
+        # Partitions have their own category dictionaries; codes are remapped onto their union
+        categories = {col: {} for col in columns if RESULT_SCHEMA[col] == 'category'}
+        for meta in metas:
+            for col, index in categories.items():
+                for value in meta['dictionaries'][col]:
+                    index.setdefault(value, len(index))
+
+        parts = {col: [] for col in columns}
+        for path, meta in zip(paths, metas):
+            remap = {col: np.array([index[value] for value in meta['dictionaries'][col]], dtype=np.int32)
+                     for col, index in categories.items()}
+            if circuits is not None:
+                keep = np.isin(np.asarray(meta['dictionaries']['circuit'], dtype=object), list(circuits))
+            for chunk in meta['chunks']:
+                mask = keep[load_column(path, chunk, 'circuit')] if circuits is not None else None
+                for col in columns:
+                    values = load_column(path, chunk, col)
+                    if mask is not None:
+                        values = values[mask]
+                    parts[col].append(remap[col][values] if col in remap else values)
+
+        frame = {}
+        for col in columns:
+            kind = RESULT_SCHEMA[col]
+            values = np.concatenate(parts[col]) if parts[col] else np.empty(0, dtype=np.int32 if kind == 'category'
+                                                                            else object if kind == 'text' else kind)
+            if col in categories:
+                values = pd.Categorical.from_codes(values, categories=list(categories[col]), validate=False)
+            frame[col] = values
+        return pd.DataFrame(frame)
+
+def _splice_rounds(existing, stale, new_rows):
+    """
+    Rows of existing with each stale round's rows replaced by its new rows at the
+    position of the first stale row; rounds that weren't there come last
+    """
+    replacements = {}
+    for row in new_rows:
+        replacements.setdefault(int(row[ROUND]), []).append(row)
+    for row, is_stale in zip(existing.itertuples(index=False, name=None), stale):
+        if not is_stale:
+            yield row
+        elif int(row[ROUND]) in replacements:
+            yield from replacements.pop(int(row[ROUND]))
+    for rows in replacements.values():
+        yield from rows
+
+def import_csv(csv_path, store=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Load a results CSV (as written by older versions of fetch_data.py) into the store, chunk by chunk"""
+    store = store or ResultsStore()
+    chunks = pd.read_csv(csv_path, chunksize=chunk_rows)
+    rows = (row for chunk in chunks for row in chunk[list(RESULT_SCHEMA)].itertuples(index=False, name=None))
+    return store.write(rows, chunk_rows, replace_all=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Season-partitioned race results store")
+    parser.add_argument("--import-csv", default=None, help="Replace the store with the rows of a results CSV")
+    args = parser.parse_args()
+
+    store = ResultsStore()
+    if args.import_csv:
+        rows = import_csv(args.import_csv, store)
+        print(f"📦 Imported {rows} rows from {args.import_csv} into {store.path}/")
+    for season, partition in store.load_manifest()['partitions'].items():
+        print(f"   {season}: {partition['rows']} rows, rounds {partition['rounds'][0]}-{partition['rounds'][-1]}, "
+              f"{len(partition['circuits'])} circuits")
@@ -0,0 +1,103 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# F1 points for finishing positions 1-10
+POINTS_BY_POSITION = np.array([25, 18, 15, 12, 10, 8, 6, 4, 2, 1], dtype=float)
+
+DEFAULT_SIMULATION_RUNS = 100_000
+MAX_SIMULATION_RUNS = 1_000_000
+
+# Runs sampled per batch; keeps the (runs, drivers) working set around a few MB
+SIMULATION_CHUNK_SIZE = 50_000
+
+def sample_finishing_orders(strengths, runs, rng):
+    """
+    Sample `runs` finishing orders at once from a Plackett-Luce model.
+    Adding Gumbel noise to log-strengths and sorting each row gives an order in
+    which every driver wins with probability proportional to their strength.
+    Returns a (runs, drivers) array of 0-based finishing positions.
+    """
+    log_strengths = np.log(strengths).astype(np.float32)
+    keys = log_strengths + rng.gumbel(size=(runs, len(strengths))).astype(np.float32)
+
+    order = np.argsort(-keys, axis=1)
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order, np.arange(len(strengths)), axis=1)
+    return positions
+
+def simulate_race_outcomes(win_probabilities, runs=DEFAULT_SIMULATION_RUNS, rng=None,
+                           chunk_size=SIMULATION_CHUNK_SIZE):
+    """
+    Monte Carlo race simulation from per-driver win probabilities.
+    Returns per-driver P(win), P(podium), P(points), expected points, expected
+    position and the full finishing position distribution.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    strengths = np.asarray(win_probabilities, dtype=float)
+    n_drivers = len(strengths)
+    strengths = np.clip(strengths, 1e-9, None)
+
+    # Count how often each driver finishes in each position
+    position_counts = np.zeros(n_drivers * n_drivers, dtype=np.int64)
+    driver_offsets = np.arange(n_drivers) * n_drivers
+
+    remaining = runs
+    while remaining > 0:
+        batch = min(chunk_size, remaining)
+        positions = sample_finishing_orders(strengths, batch, rng)
+        position_counts += np.bincount((positions + driver_offsets).ravel(),
+                                       minlength=n_drivers * n_drivers)
+        remaining -= batch
+
+    position_distribution = position_counts.reshape(n_drivers, n_drivers) / runs
+
+    points_table = np.zeros(n_drivers)
+    scoring = min(n_drivers, len(POINTS_BY_POSITION))
+    points_table[:scoring] = POINTS_BY_POSITION[:scoring]
+
+    return {
+        'win': position_distribution[:, 0],
+        'podium': position_distribution[:, :3].sum(axis=1),
+        'points': position_distribution[:, :10].sum(axis=1),
+        'expected_points': position_distribution @ points_table,
+        'expected_position': position_distribution @ np.arange(1, n_drivers + 1),
+        'position_distribution': position_distribution
+    }
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_simulation_pool(max_workers=None):
+    """
+    Process pool shared by every multi-race simulation in this process. Workers are
+    spawned, not forked: the API server is multithreaded, and a forked child can
+    inherit locks held by other threads and deadlock.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                                        mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+def _simulate_with_seed(win_probabilities, runs, seed_sequence):
+    return simulate_race_outcomes(win_probabilities, runs, np.random.default_rng(seed_sequence))
+
+def simulate_many_races(win_probability_sets, runs, seed_sequences, max_workers=None):
+    """
+    Simulate several independent races, one per process pool task.
+    Each race gets its own seed sequence so results don't depend on scheduling.
+    """
+    if (max_workers or os.cpu_count() or 1) == 1 or len(win_probability_sets) == 1:
+        return [_simulate_with_seed(probs, runs, seeds)
+                for probs, seeds in zip(win_probability_sets, seed_sequences)]
+
+    pool = get_simulation_pool(max_workers)
+    return list(pool.map(_simulate_with_seed, win_probability_sets,
+                         [runs] * len(win_probability_sets), seed_sequences))
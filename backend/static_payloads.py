@@ -0,0 +1,58 @@
+import gzip
+import hashlib
+import json
+import threading
+
+from flask import Response
+
+class StaticPayload:
+    """
+    JSON payload that is serialized (and gzip-compressed) once and then served as
+    bytes with a strong ETag. Clients that send a matching If-None-Match get a
+    304 Not Modified. Call invalidate() when the underlying data changes.
+    """
+
+    def __init__(self, loader, min_gzip_size=512):
+        self.loader = loader
+        self.min_gzip_size = min_gzip_size
+        self._built = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._built = None
+
+    def _build(self):
+        with self._lock:
+            if self._built is None:
+                body = json.dumps(self.loader(), sort_keys=True, ensure_ascii=False,
+                                  separators=(',', ':')).encode('utf-8')
+                gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+                etag = hashlib.sha256(body).hexdigest()[:32]
+                use_gzip = len(body) >= self.min_gzip_size and len(gzipped) < len(body)
+                self._built = {
+                    'identity': (body, etag),
+                    'gzip': (gzipped, f"{etag}-gzip") if use_gzip else None
+                }
+            return self._built
+
+    @property
+    def etag(self):
+        return self._build()['identity'][1]
+
+    def response(self, request):
+        built = self._build()
+        encoding = 'gzip' if built['gzip'] and 'gzip' in request.accept_encodings else 'identity'
+        body, etag = built[encoding]
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype='application/json')
+            if encoding == 'gzip':
+                response.headers['Content-Encoding'] = 'gzip'
+
+        response.set_etag(etag)
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = 'public, no-cache'
+        return response
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Modules in backend/ import each other by flat name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Importing app must not start watching models/ for new versions
+os.environ.setdefault('MODEL_RELOAD_INTERVAL', '0')
@@ -0,0 +1,23 @@
+import pandas as pd
+
+import dataset_cache
+
+def test_cache_hit_reports_no_source_timing(tmp_path):
+    source = str(tmp_path / "results.csv")
+    pd.DataFrame({'season': [2024, 2024], 'driver': ['Max Verstappen', 'Lando Norris'],
+                  'position': [1, 2]}).to_csv(source, index=False)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return pd.read_csv(source), {'raw_rows': 2}
+
+    cache_dir = str(tmp_path / "cache")
+    _, _, built = dataset_cache.cached_build(source, 1, 0, build, cache_dir=cache_dir)
+    df, meta, hit = dataset_cache.cached_build(source, 1, 0, build, cache_dir=cache_dir)
+
+    assert built['source'] == 'csv' and built['csv_seconds'] == built['seconds']
+    assert hit['source'] == 'cache' and 'csv_seconds' not in hit and 'csv_memory_mb' not in hit
+    assert len(builds) == 1
+    assert meta['build_seconds'] == built['seconds']
+    assert df['driver'].tolist() == ['Max Verstappen', 'Lando Norris']
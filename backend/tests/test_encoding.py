@@ -0,0 +1,32 @@
+import numpy as np
+from sklearn.preprocessing import LabelEncoder
+
+from encoding import UNKNOWN_CODE, EncodingIndex
+
+def encoders():
+    return {'driver': LabelEncoder().fit(['Alex Albon', 'Lando Norris', 'Max Verstappen'])}
+
+def test_unknown_values_get_a_code_no_class_uses():
+    index = EncodingIndex.from_label_encoders(encoders())
+    assert UNKNOWN_CODE not in range(len(index['driver']))
+
+    names = ['Alex Albon', 'Arvid Lindblad', 'Max Verstappen']
+    np.testing.assert_array_equal(index.encode('driver', names), [0, UNKNOWN_CODE, 2])
+    assert [index.encode_one('driver', name) for name in names] == [0, UNKNOWN_CODE, 2]
+    np.testing.assert_array_equal(index['driver'].known_mask(names), [True, False, True])
+    # Columns the models weren't trained with encode as unknown too
+    assert index.encode_one('team_principal', 'Someone') == UNKNOWN_CODE
+    np.testing.assert_array_equal(index.encode('team_principal', names), [UNKNOWN_CODE] * 3)
+
+def test_encoding_matches_label_encoder_for_known_values():
+    label_encoders = encoders()
+    index = EncodingIndex.from_label_encoders(label_encoders)
+    names = ['Max Verstappen', 'Alex Albon', 'Lando Norris', 'Max Verstappen']
+    np.testing.assert_array_equal(index.encode('driver', names), label_encoders['driver'].transform(names))
+
+def test_extending_keeps_existing_codes():
+    index = EncodingIndex.from_label_encoders(encoders())
+    assert index.extend('driver', ['Lando Norris', 'Oliver Bearman', 'Arvid Lindblad']) == ['Arvid Lindblad',
+                                                                                           'Oliver Bearman']
+    np.testing.assert_array_equal(index.encode('driver', ['Alex Albon', 'Max Verstappen', 'Oliver Bearman',
+                                                          'Nobody']), [0, 2, 4, UNKNOWN_CODE])
@@ -0,0 +1,61 @@
+import pytest
+import requests
+
+import ergast
+from ergast import ErgastClient
+from ergast_stub import ErgastStubHandler, STUB_LAPS, start_stub_server, stub_season
+
+class FlakyHandler(ErgastStubHandler):
+    """Answers 503 (with Retry-After: 0) until the server's failures budget is spent"""
+
+    def do_GET(self):
+        if self.server.failures > 0:
+            self.server.failures -= 1
+            self.server.requests += 1
+            self.send_response(503)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        super().do_GET()
+
+@pytest.fixture
+def stub():
+    server, url = start_stub_server()
+    server.failures = 0
+    yield server, url
+    server.shutdown()
+    server.server_close()
+
+def test_pages_are_merged_back_into_whole_races(stub, monkeypatch):
+    server, url = stub
+    monkeypatch.setattr(ergast, 'PAGE_LIMIT', 7)  # Splits every race's 20 results across pages
+    with ErgastClient(url, rate_limit=0) as client:
+        races = client.season_results(2021)
+        laps = client.race_laps(2021, 3)
+
+    expected = stub_season(2021)
+    assert [race['round'] for race in races] == [race['round'] for race in expected]
+    assert all(race['Results'] == reference['Results'] for race, reference in zip(races, expected))
+    assert server.requests > len(expected) * 20 // 7
+    # Laps are paged by timing row, so a lap split across two pages is merged too
+    assert [int(lap['number']) for lap in laps['Laps']] == list(range(1, STUB_LAPS + 1))
+    assert {len(lap['Timings']) for lap in laps['Laps']} == {20}
+
+def test_server_errors_are_retried(stub):
+    server, url = stub
+    server.RequestHandlerClass = FlakyHandler
+    server.failures = 2
+    with ErgastClient(url, rate_limit=0, backoff=0) as client:
+        races = client.season_results(2022)
+    assert len(races) == len(stub_season(2022))
+    assert server.failures == 0
+
+def test_retries_give_up_after_the_limit(stub):
+    server, url = stub
+    server.RequestHandlerClass = FlakyHandler
+    server.failures = 10
+    with ErgastClient(url, rate_limit=0, retries=2, backoff=0) as client:
+        with pytest.raises(requests.RequestException):
+            client.season_results(2022)
+    assert server.requests == 3
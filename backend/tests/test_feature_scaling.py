@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+import app
+from feature_store import ENHANCED_FEATURES, NUMERICAL_FEATURES, numerical_feature_indices
+from model_registry import ModelSet
+
+def trainer_scaled(X, scaler):
+    """Scale a feature matrix the way train_enhanced_models does"""
+    df = pd.DataFrame(X, columns=ENHANCED_FEATURES)
+    df[NUMERICAL_FEATURES] = scaler.transform(df[NUMERICAL_FEATURES])
+    return df.to_numpy()
+
+def test_serving_scales_the_same_columns_as_training():
+    rng = np.random.default_rng(0)
+    scaler = StandardScaler().fit(pd.DataFrame(rng.normal(5, 3, size=(200, len(NUMERICAL_FEATURES))),
+                                               columns=NUMERICAL_FEATURES))
+    model_set = ModelSet({}, {}, scaler, ENHANCED_FEATURES, 'test')
+    X = rng.normal(5, 3, size=(20, len(ENHANCED_FEATURES)))
+
+    served = app.scale_feature_matrix(model_set, X)
+
+    np.testing.assert_allclose(served, trainer_scaled(X, scaler))
+    for feature in ['budget_efficiency', 'circuit_type_encoded']:
+        column = ENHANCED_FEATURES.index(feature)
+        assert (served[:, column] != X[:, column]).any() == (feature in NUMERICAL_FEATURES)
+
+def test_numerical_indices_follow_the_feature_layout():
+    reordered = ENHANCED_FEATURES[::-1]
+    indices = numerical_feature_indices(reordered)
+    assert [reordered[i] for i in indices] == NUMERICAL_FEATURES
+
+def test_api_does_not_import_the_training_script(tmp_path):
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    check = ("import sys; sys.path.insert(0, sys.argv[1]); import app; "
+             "assert 'train_enhanced_model' not in sys.modules and 'sklearn.ensemble' not in sys.modules")
+    subprocess.run([sys.executable, "-c", check, backend], cwd=tmp_path, check=True,
+                   env=dict(os.environ, MODEL_RELOAD_INTERVAL='0'))
+    assert not (tmp_path / "models").exists() and not (tmp_path / "logs").exists()
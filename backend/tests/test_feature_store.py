@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+
+from feature_store import CONSTRUCTORS, DRIVERS, FEATURE_SEASON
+from train_enhanced_model import add_constructor_features, add_driver_performance_features
+
+def results(seasons, rows_per_season=50):
+    return pd.DataFrame({'season': np.repeat(seasons, rows_per_season),
+                         'driver': 'Lando Norris', 'constructor': 'McLaren'})
+
+def test_season_specific_attributes_only_apply_to_the_feature_season():
+    df = results([FEATURE_SEASON - 10, FEATURE_SEASON])
+    df = add_constructor_features(add_driver_performance_features(df, np.random.default_rng(0)),
+                                  np.random.default_rng(0))
+    current = (df['season'] == FEATURE_SEASON).to_numpy()
+    driver, constructor = DRIVERS.get('Lando Norris'), CONSTRUCTORS.get('McLaren')
+
+    for column, value in [('recent_form', driver['form']), ('quali_gap_to_teammate', driver['quali_gap']),
+                          ('budget_efficiency', constructor['efficiency'])]:
+        np.testing.assert_allclose(df.loc[current, column], value)
+        assert df.loc[~current, column].nunique() > 1, column
+    # Experience and standing don't depend on the season
+    assert set(df['driver_experience']) == {driver['experience']}
+    assert set(df['constructor_standing']) == {constructor['standing']}
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+import train_enhanced_model as trainer
+from ergast_stub import stub_season
+from fetch_data import races_to_dataframe
+from model_store import load_manifest
+
+def results_csv(seasons, renamed=None):
+    df = races_to_dataframe([race for season in seasons for race in stub_season(season)])
+    if renamed:
+        df['driver'] = df['driver'].replace(renamed)
+    return df
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "logs").mkdir()
+    (tmp_path / "models").mkdir()
+    return tmp_path
+
+def test_update_adds_trees_for_new_results_only(workdir):
+    data_file = workdir / trainer.DATA_FILES[0]
+    first = results_csv([2023])
+    first.to_csv(data_file, index=False)
+    models, _, _, _ = trainer.train_enhanced_models(seed=0, use_cache=False)
+    parent = load_manifest()
+    sizes = {name: trainer.ensemble_size(model) for name, model in models.items() if model is not None}
+    first_tree = models['position'].estimators_[0]
+
+    assert trainer.update_enhanced_models(add_trees=3, seed=0) is False
+
+    # A new season with a driver the encoders haven't seen
+    second = results_csv([2024], renamed={'Max Verstappen': 'Arvid Lindblad'})
+    second.to_csv(data_file, mode='a', header=False, index=False)
+    updated, encoders, _, _ = trainer.update_enhanced_models(add_trees=3, seed=0)
+
+    manifest = load_manifest()
+    assert manifest['parent'] == parent['version'] and manifest['mode'] == 'incremental'
+    assert manifest['raw_rows'] == len(first) + len(second)
+    for name, size in sizes.items():
+        assert trainer.ensemble_size(updated[name]) == size + 3
+    # The existing trees are kept as they were
+    X = np.random.default_rng(0).normal(size=(5, len(trainer.ENHANCED_FEATURES)))
+    np.testing.assert_array_equal(updated['position'].estimators_[0].predict(X), first_tree.predict(X))
+
+    classes = trainer.encoder_classes(encoders['driver'])
+    assert classes[-1] == 'Arvid Lindblad'
+    assert list(classes[:-1]) == sorted(first['driver'].unique())
+
+def test_update_refuses_when_trained_results_changed(workdir):
+    data_file = workdir / trainer.DATA_FILES[0]
+    results_csv([2023]).to_csv(data_file, index=False)
+    trainer.train_enhanced_models(seed=0, use_cache=False)
+
+    changed = results_csv([2023, 2024])
+    changed.loc[0, 'driver'] = 'Someone Else'
+    changed.to_csv(data_file, index=False)
+    assert trainer.update_enhanced_models(add_trees=3, seed=0) is None
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import dataset_cache
+from lap_store import LapStore, merge_timing_features
+
+def race_rows(drivers=('max_verstappen', 'norris'), laps=3):
+    laps_rows = [(driver, lap, position, f"1:{30 + lap + position:06.3f}")
+                 for lap in range(1, laps + 1) for position, driver in enumerate(drivers, 1)]
+    pitstops = [(driver, 1, 2, "22.500") for driver in drivers]
+    return laps_rows, pitstops
+
+NAMES = {'max_verstappen': 'Max Verstappen', 'norris': 'Lando Norris'}
+
+def test_append_race_adds_contiguous_rows(tmp_path):
+    store = LapStore(tmp_path)
+    store.append_race(2024, 1, *race_rows(), NAMES)
+    store.append_race(2024, 2, *race_rows(laps=2), NAMES)
+
+    reopened = LapStore(tmp_path)
+    assert reopened.rows('laps') == 10 and reopened.rows('pitstops') == 4 and reopened.rows('races') == 2
+    assert reopened.index['driver_names'] == ['Max Verstappen', 'Lando Norris']
+    second = reopened.race_laps(2024, 2)
+    np.testing.assert_array_equal(second['race'], [1, 1, 1, 1])
+    np.testing.assert_array_equal(second['lap'], [1, 1, 2, 2])
+    np.testing.assert_allclose(second['seconds'][:2], [92.0, 93.0])
+    assert reopened.race_laps(2024, 3) is None
+
+    with pytest.raises(ValueError):
+        reopened.append_race(2024, 1, *race_rows(), NAMES)
+
+def test_race_laps_are_views_of_the_mapped_columns(tmp_path):
+    store = LapStore(tmp_path)
+    for round_number in (1, 2, 3):
+        store.append_race(2024, round_number, *race_rows(), NAMES)
+
+    laps = store.race_laps(2024, 2)
+    for name, values in laps.items():
+        column = store.column('laps', name)
+        assert isinstance(column, np.memmap)
+        assert np.shares_memory(values, column)
+    assert np.shares_memory(store.race_pitstops(2024, 2)['duration'], store.column('pitstops', 'duration'))
+
+def test_interrupted_append_is_truncated_by_the_next_one(tmp_path, monkeypatch):
+    LapStore(tmp_path).append_race(2024, 1, *race_rows(), NAMES)
+
+    # The column files are written but the process dies before index.json is saved
+    def killed():
+        raise OSError("killed")
+
+    crashed = LapStore(tmp_path)
+    monkeypatch.setattr(crashed, '_save_index', killed)
+    with pytest.raises(OSError):
+        crashed.append_race(2024, 2, *race_rows(laps=5), NAMES)
+    assert (tmp_path / "laps" / "seconds.bin").stat().st_size == 16 * 4
+
+    store = LapStore(tmp_path)
+    assert store.rows('laps') == 6 and not store.has_race(2024, 2)
+    store.append_race(2024, 2, *race_rows(laps=2), NAMES)
+    assert (tmp_path / "laps" / "seconds.bin").stat().st_size == 10 * 4
+    np.testing.assert_array_equal(LapStore(tmp_path).race_laps(2024, 2)['lap'], [1, 1, 2, 2])
+
+def test_timing_merge_covers_only_the_given_races(tmp_path):
+    store = LapStore(tmp_path)
+    store.append_race(2023, 1, *race_rows(), NAMES)
+    store.append_race(2024, 1, *race_rows(laps=4), NAMES)
+    results = pd.DataFrame({'season': [2024, 2024, 2025], 'round': [1, 1, 1],
+                            'driver': ['Max Verstappen', 'Lando Norris', 'Max Verstappen']})
+
+    assert len(store.driver_race_summary(races=[(2024, 1)])) == 2
+    merged = merge_timing_features(results, store)
+    np.testing.assert_array_equal(merged['laps_completed'], [4, 4, np.nan])
+    np.testing.assert_allclose(merged['mean_lap_seconds'][:2], [93.5, 94.5])
+    np.testing.assert_array_equal(merged['pit_stops'], [1, 1, np.nan])
+
+def test_dataset_cache_key_follows_the_lap_store_rows(tmp_path):
+    source = tmp_path / "results.csv"
+    source.write_text("season,round,driver\n2024,1,Max Verstappen\n")
+    keys = {dataset_cache.cache_key(source, 3, 0, lap_rows={'laps': rows, 'pitstops': 0}) for rows in (0, 6, 12)}
+    assert len(keys) == 3
+
+@pytest.mark.filterwarnings('error::RuntimeWarning')
+def test_race_without_timed_laps_has_no_fastest_lap(tmp_path):
+    from fetch_data import race_timing_values
+
+    store = LapStore(tmp_path)
+    laps = [('max_verstappen', 1, 1, None), ('norris', 1, 2, None), ('max_verstappen', 2, 1, None)]
+    store.append_race(2024, 1, laps, [], NAMES)
+    race = {'season': 2024, 'round': 1,
+            'Results': [{'Driver': {'driverId': 'max_verstappen'}, 'status': 'Finished'},
+                        {'Driver': {'driverId': 'norris'}, 'status': '+1 Lap'}]}
+
+    fastest_lap, gaps = race_timing_values(store, race)
+    assert np.isnan(fastest_lap)
+    assert gaps == {'norris': '+1 Lap'}
@@ -0,0 +1,59 @@
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+from model_registry import ModelRegistry
+from model_store import save_model_set
+
+def publish(models_dir, version, seed):
+    """Save and publish a small model set whose position model predicts around seed"""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(60, 3))
+    models = {
+        'position': RandomForestRegressor(n_estimators=3, random_state=0).fit(X, np.full(60, float(seed))),
+        'podium': RandomForestClassifier(n_estimators=3, random_state=0).fit(X, rng.integers(0, 2, 60)),
+        'points': RandomForestClassifier(n_estimators=3, random_state=0).fit(X, rng.integers(0, 2, 60)),
+        'winner': None
+    }
+    encoders = {'driver': LabelEncoder().fit(['Lando Norris', 'Max Verstappen'])}
+    save_model_set(models, encoders, StandardScaler().fit(X), ['a', 'b', 'c'], {'version': version},
+                   str(models_dir))
+
+def test_published_version_is_swapped_in_while_old_requests_finish(tmp_path):
+    publish(tmp_path, 'v1', seed=1)
+    swapped = []
+    registry = ModelRegistry(str(tmp_path), on_swap=lambda model_set: swapped.append(model_set.version))
+    registry.load()
+    assert registry.check() is False
+
+    in_flight = registry.current
+    publish(tmp_path, 'v2', seed=2)
+    assert registry.check() is True
+
+    assert registry.current.version == 'v2' and swapped == ['v2']
+    assert registry.status()['previous_version'] == 'v1' and registry.status()['swaps'] == 1
+    # A request that took the old set before the swap still predicts with it
+    rows = np.zeros((2, 3))
+    assert in_flight.version == 'v1'
+    np.testing.assert_allclose(in_flight.models['position'].predict(rows), 1.0)
+    np.testing.assert_allclose(registry.current.models['position'].predict(rows), 2.0)
+
+def test_set_that_fails_to_warm_up_is_not_swapped_in(tmp_path):
+    publish(tmp_path, 'v1', seed=1)
+
+    def warm_up(model_set):
+        if model_set.version == 'broken':
+            raise ValueError("feature names changed")
+
+    registry = ModelRegistry(str(tmp_path), warm_up=warm_up)
+    registry.load()
+    publish(tmp_path, 'broken', seed=3)
+
+    assert registry.check() is False
+    assert registry.current.version == 'v1'
+    assert 'broken' in registry.status()['last_error']
+    assert registry.check() is False  # Not retried until another version is published
+
+    publish(tmp_path, 'v3', seed=3)
+    assert registry.check() is True
+    assert registry.current.version == 'v3' and registry.status()['last_error'] is None
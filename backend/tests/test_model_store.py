@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import (GradientBoostingRegressor, HistGradientBoostingRegressor,
+                              RandomForestClassifier, RandomForestRegressor)
+
+from model_store import SharedTreeEnsemble, export_shared_model
+
+def training_data(rows=400, features=6, seed=0):
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([rng.integers(0, 20, rows),     # Encoded categories and grid slots
+                         rng.normal(25, 5, (rows, features - 1))])
+    y = X[:, 0] * 0.5 + X[:, 1] * 0.1 + rng.normal(0, 1, rows)
+    return X, y
+
+def rows_on_thresholds(model, X, limit=300, seed=1):
+    """
+    Copies of training rows with one feature set exactly to a split threshold of
+    the model, and to the float32 values just below and above it
+    """
+    rng = np.random.default_rng(seed)
+    trees = np.ravel(model.estimators_)
+    splits = [(t.tree_.feature[node], t.tree_.threshold[node])
+              for t in trees for node in np.flatnonzero(t.tree_.children_left != -1)]
+    rows = []
+    for i in rng.choice(len(splits), min(limit, len(splits)), replace=False):
+        feature, threshold = splits[i]
+        threshold32 = np.float32(threshold)
+        for value in (threshold, threshold32, np.nextafter(threshold32, np.float32(-np.inf)),
+                      np.nextafter(threshold32, np.float32(np.inf))):
+            row = X[rng.integers(len(X))].copy()
+            row[feature] = value
+            rows.append(row)
+    return np.array(rows)
+
+def compiled(model, tmp_path):
+    assert export_shared_model(model, tmp_path)
+    return SharedTreeEnsemble.load(tmp_path)
+
+@pytest.mark.parametrize('model', [
+    RandomForestRegressor(n_estimators=15, max_depth=8, random_state=0),
+    GradientBoostingRegressor(n_estimators=30, max_depth=4, random_state=0)
+], ids=['forest', 'gradient_boosting'])
+def test_regressors_match_sklearn(model, tmp_path):
+    X, y = training_data()
+    model.fit(X, y)
+    engine = compiled(model, tmp_path)
+
+    for inputs in (training_data(seed=2)[0], rows_on_thresholds(model, X)):
+        np.testing.assert_allclose(engine.predict(inputs), model.predict(inputs), rtol=1e-5, atol=1e-5)
+
+def test_classifier_matches_sklearn(tmp_path):
+    X, y = training_data()
+    labels = (y > np.median(y)).astype(int) + (y > np.quantile(y, 0.9)).astype(int)
+    model = RandomForestClassifier(n_estimators=15, max_depth=8, random_state=0).fit(X, labels)
+    engine = compiled(model, tmp_path)
+
+    for inputs in (training_data(seed=2)[0], rows_on_thresholds(model, X)):
+        expected = model.predict_proba(inputs)
+        np.testing.assert_allclose(engine.predict_proba(inputs), expected, atol=1e-6)
+        # Classes only need to agree where sklearn's top two probabilities aren't tied
+        top_two = np.sort(expected, axis=1)[:, -2:]
+        clear = top_two[:, 1] - top_two[:, 0] > 1e-6
+        np.testing.assert_array_equal(engine.predict(inputs)[clear], model.predict(inputs)[clear])
+
+def test_rows_on_a_threshold_take_the_left_branch(tmp_path):
+    # A threshold that isn't representable in float32 gets rounded down when compiled
+    X = np.array([[0.0], [0.1], [0.2], [0.3]])
+    model = RandomForestRegressor(n_estimators=1, bootstrap=False, max_depth=1, random_state=0)
+    model.fit(X, [0.0, 0.0, 1.0, 1.0])
+    engine = compiled(model, tmp_path)
+    threshold = model.estimators_[0].tree_.threshold[0]
+
+    inputs = np.array([[threshold], [np.float32(threshold)],
+                       [np.nextafter(np.float32(threshold), np.float32(np.inf))]])
+    np.testing.assert_array_equal(engine.predict(inputs), model.predict(inputs))
+
+def test_hist_gradient_boosting_is_not_exported(tmp_path):
+    X, y = training_data()
+    model = HistGradientBoostingRegressor(max_iter=10).fit(X, y)
+    assert export_shared_model(model, tmp_path / "hist") is False
+    assert not (tmp_path / "hist").exists()
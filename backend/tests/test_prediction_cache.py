@@ -0,0 +1,87 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import app
+import response_cache
+from response_cache import ResponseCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2, ttl_seconds=60)
+    cache.get_or_compute('a', lambda: 1)
+    cache.get_or_compute('b', lambda: 2)
+    cache.get_or_compute('a', lambda: 'recomputed')  # 'a' is now the most recent
+    cache.get_or_compute('c', lambda: 3)
+
+    assert cache.get_or_compute('a', lambda: 'recomputed') == 1
+    assert cache.get_or_compute('b', lambda: 'recomputed') == 'recomputed'
+    assert cache.stats()['entries'] == 2
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(response_cache, 'time', clock)
+    cache = ResponseCache(max_entries=4, ttl_seconds=10)
+
+    cache.get_or_compute('key', lambda: 'first')
+    clock.now = 9.9
+    assert cache.get_or_compute('key', lambda: 'second') == 'first'
+    clock.now = 10.1
+    assert cache.get_or_compute('key', lambda: 'second') == 'second'
+    assert cache.stats()['misses'] == 2
+
+def test_failed_computation_is_not_cached():
+    cache = ResponseCache()
+
+    def fail():
+        raise RuntimeError("model error")
+
+    for _ in range(2):
+        try:
+            cache.get_or_compute('key', fail)
+        except RuntimeError:
+            pass
+    assert cache.get_or_compute('key', lambda: 'ok') == 'ok'
+    assert cache.stats()['misses'] == 3
+
+def test_concurrent_unseeded_predictions_share_one_computation(monkeypatch):
+    cache = ResponseCache()
+    calls = []
+
+    def fake_prediction(model_set, circuit, weather, entries, rng):
+        calls.append(circuit)
+        # Hold the computation until the second request is waiting on it
+        deadline = time.monotonic() + 5
+        while cache.stats()['coalesced'] < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return {'success': True, 'predictions': [], 'race_info': {'temperature': 20, 'track_temp': 30}}
+
+    monkeypatch.setattr(app, 'prediction_cache', cache)
+    monkeypatch.setattr(app, 'model_registry', SimpleNamespace(current=SimpleNamespace(version='test')))
+    monkeypatch.setattr(app, 'run_race_prediction', fake_prediction)
+    monkeypatch.setattr(app, 'log_prediction', lambda *args: None)
+
+    payload = {'circuit': 'Monaco Circuit', 'weather': 'Dry',
+               'entries': [{'driver': 'Max Verstappen', 'constructor': 'Red Bull Racing', 'grid': 1},
+                           {'driver': 'Lando Norris', 'constructor': 'McLaren', 'grid': 2}]}
+    statuses = []
+
+    def post():
+        with app.app.test_client() as client:
+            statuses.append(client.post('/api/predict', json=payload).status_code)
+
+    threads = [threading.Thread(target=post) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses == [200, 200]
+    assert calls == ['Monaco Circuit']
+    assert cache.stats()['coalesced'] == 1
@@ -0,0 +1,14 @@
+import numpy as np
+
+import app
+
+def test_unknown_circuit_keeps_the_fixed_temperature():
+    for seed in range(5):
+        temperature, *_ = app.get_weather_features('Nürburgring', 'Dry', np.random.default_rng(seed))
+        assert temperature == app.UNKNOWN_CIRCUIT_TEMPERATURE
+
+def test_known_circuit_temperature_stays_in_its_range():
+    temperatures = {app.get_weather_features('Bahrain International Circuit', 'Dry', np.random.default_rng(seed))[0]
+                    for seed in range(50)}
+    assert min(temperatures) >= 25 and max(temperatures) <= 35
+    assert len(temperatures) > 1
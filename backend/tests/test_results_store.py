@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from results_store import ResultsStore
+
+DRIVERS = [('Max Verstappen', 'Red Bull Racing'), ('Lando Norris', 'McLaren'), ('Charles Leclerc', 'Ferrari')]
+
+def race_rows(season, round_number, status='Finished', race_name=None, drivers=DRIVERS):
+    return [(season, round_number, race_name or f"Race {round_number}", f"Circuit {round_number}",
+             f"{season}-03-{round_number:02d}", driver, constructor, grid, grid, 25.0 / grid, status,
+             'Dry', 'Medium → Hard', f"+{grid}.000s", '1:30.000')
+            for grid, (driver, constructor) in enumerate(drivers, 1)]
+
+def season_rows(season, rounds):
+    return [row for round_number in rounds for row in race_rows(season, round_number)]
+
+def keys(frame):
+    return list(zip(frame['season'].astype(int), frame['round'].astype(int), frame['driver'].astype(str)))
+
+def test_append_extends_only_its_season(tmp_path):
+    store = ResultsStore(tmp_path)
+    store.write(season_rows(2023, [1, 2]) + season_rows(2024, [1]), chunk_rows=4)
+    untouched = store.load_manifest()['partitions']['2023']
+
+    assert store.write(race_rows(2024, 2), chunk_rows=4, append=True) == 3
+    manifest = store.load_manifest()
+    assert manifest['partitions']['2023'] == untouched
+    assert manifest['partitions']['2024']['rounds'] == [1, 2]
+    assert manifest['partitions']['2024']['rows'] == 6
+    assert keys(store.read(seasons=[2024])) == [(2024, round_number, driver)
+                                                for round_number in (1, 2) for driver, _ in DRIVERS]
+    assert store.seasons() == [2023, 2024]
+
+def test_replace_rounds_keeps_row_order(tmp_path):
+    store = ResultsStore(tmp_path)
+    simulated = race_rows(2024, 2, race_name='Simulated Race 2', drivers=DRIVERS[:1])
+    store.write(season_rows(2024, [1, 2, 3]) + simulated, chunk_rows=4)
+    before = store.read()
+
+    changed = race_rows(2024, 2, status='Disqualified')
+    dropped, added = store.replace_rounds(changed + race_rows(2024, 4), {(2024, 2), (2024, 4)}, chunk_rows=4)
+
+    after = store.read()
+    assert (dropped, added) == (3, 6)
+    assert keys(after) == keys(before) + [(2024, 4, driver) for driver, _ in DRIVERS]
+    round_two = after[(after['round'] == 2) & ~after['race_name'].astype(str).str.startswith('Simulated')]
+    assert set(round_two['status'].astype(str)) == {'Disqualified'}
+    assert store.load_manifest()['partitions']['2024']['rounds'] == [1, 2, 3, 4]
+
+def test_interrupted_write_leaves_the_store_unchanged(tmp_path):
+    store = ResultsStore(tmp_path)
+    store.write(season_rows(2024, [1, 2]), chunk_rows=4)
+    manifest = (tmp_path / "manifest.json").read_text()
+    before = store.read()
+
+    def failing_rows():
+        yield from race_rows(2024, 3)
+        yield from race_rows(2024, 4)[:1]
+        raise ConnectionError("fetch failed")
+
+    with pytest.raises(ConnectionError):
+        store.write(failing_rows(), chunk_rows=4, append=True)
+    assert (tmp_path / "manifest.json").read_text() == manifest
+    assert keys(store.read()) == keys(before)
+
+    # The next write clears the abandoned staging copy
+    store.write(race_rows(2024, 3), chunk_rows=4, append=True)
+    assert not list(tmp_path.glob("*.building"))
+    assert json.loads((tmp_path / "manifest.json").read_text())['partitions']['2024']['rounds'] == [1, 2, 3]
+    assert len(store.read()) == 9
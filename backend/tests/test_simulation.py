@@ -0,0 +1,71 @@
+import threading
+
+import numpy as np
+
+import simulation
+from simulation import simulate_many_races, simulate_race_outcomes
+
+def win_probability_sets(races=4, drivers=6):
+    rng = np.random.default_rng(3)
+    return [rng.uniform(0.5, 25, drivers) for _ in range(races)]
+
+def test_outcomes_follow_the_plackett_luce_model():
+    strengths = np.array([0.5, 0.3, 0.2])
+    outcome = simulate_race_outcomes(strengths, runs=200_000, rng=np.random.default_rng(0), chunk_size=30_000)
+
+    distribution = outcome['position_distribution']
+    np.testing.assert_allclose(distribution.sum(axis=0), 1)
+    np.testing.assert_allclose(distribution.sum(axis=1), 1)
+    np.testing.assert_allclose(outcome['win'], strengths, atol=0.005)
+    # P(i second) = sum over winners j of s_j * s_i / (1 - s_j)
+    second = [sum(strengths[j] * strengths[i] / (1 - strengths[j]) for j in range(3) if j != i) for i in range(3)]
+    np.testing.assert_allclose(distribution[:, 1], second, atol=0.005)
+    np.testing.assert_allclose(outcome['podium'], 1)
+    np.testing.assert_allclose(outcome['expected_points'], distribution[:, :3] @ [25, 18, 15])
+
+def test_seeded_simulations_repeat_exactly():
+    probs = win_probability_sets(races=1)[0]
+    first, second, other = (simulate_race_outcomes(probs, runs=5_000, rng=np.random.default_rng(seed))
+                            for seed in (11, 11, 12))
+    np.testing.assert_array_equal(first['position_distribution'], second['position_distribution'])
+    assert not np.array_equal(first['position_distribution'], other['position_distribution'])
+
+def test_importing_app_loads_no_models():
+    # Spawned pool workers import the parent's main script (app.py) the same way
+    import app
+    assert app.model_registry.current is None
+    assert app.model_registry.status()['published_version'] is None
+    assert app.model_registry.status()['reload_interval'] is None
+
+def test_pool_started_from_a_threaded_parent_matches_in_process_runs():
+    probs = win_probability_sets()
+    seeds = np.random.SeedSequence(7).spawn(len(probs))
+    expected = simulate_many_races(probs, 2_000, seeds, max_workers=1)
+
+    # Threads that are alive while the pool starts, like the API's logger and model watcher
+    stop = threading.Event()
+    background = [threading.Thread(target=stop.wait, daemon=True) for _ in range(2)]
+    for thread in background:
+        thread.start()
+
+    results = [None, None]
+
+    def run(slot):
+        results[slot] = simulate_many_races(probs, 2_000, seeds, max_workers=2)
+
+    try:
+        callers = [threading.Thread(target=run, args=(slot,)) for slot in range(2)]
+        for thread in callers:
+            thread.start()
+        for thread in callers:
+            thread.join(timeout=120)
+        assert not any(thread.is_alive() for thread in callers)
+    finally:
+        stop.set()
+        if simulation._pool is not None:
+            simulation._pool.shutdown()
+            simulation._pool = None
+
+    for result in results:
+        for pooled, local in zip(result, expected):
+            np.testing.assert_array_equal(pooled['position_distribution'], local['position_distribution'])
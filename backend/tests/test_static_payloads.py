@@ -0,0 +1,62 @@
+import gzip
+import json
+
+from flask import Flask, request
+
+from static_payloads import StaticPayload
+
+def payload_app(payload):
+    app = Flask(__name__)
+    app.add_url_rule('/data', 'data', lambda: payload.response(request))
+    return app.test_client()
+
+def test_gzip_is_negotiated_and_decodes_to_the_same_json():
+    data = {'drivers': [f"Driver {i}" for i in range(200)]}
+    client = payload_app(StaticPayload(lambda: data))
+
+    plain = client.get('/data')
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.get_json() == data
+
+    compressed = client.get('/data', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert compressed.headers['Vary'] == 'Accept-Encoding'
+    assert len(compressed.data) < len(plain.data)
+    assert json.loads(gzip.decompress(compressed.data)) == data
+    assert compressed.headers['ETag'] != plain.headers['ETag']
+
+def test_small_payloads_are_sent_uncompressed():
+    client = payload_app(StaticPayload(lambda: {'ok': True}))
+    response = client.get('/data', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_json() == {'ok': True}
+
+def test_matching_etag_gets_not_modified_for_its_encoding():
+    client = payload_app(StaticPayload(lambda: {'circuits': list(range(500))}))
+    for headers in ({}, {'Accept-Encoding': 'gzip'}):
+        etag = client.get('/data', headers=headers).headers['ETag']
+        cached = client.get('/data', headers=dict(headers, **{'If-None-Match': etag}))
+        assert cached.status_code == 304
+        assert cached.data == b''
+        assert cached.headers['ETag'] == etag
+
+    stale = client.get('/data', headers={'If-None-Match': '"0123456789abcdef"'})
+    assert stale.status_code == 200
+
+def test_payload_is_built_once_until_invalidated():
+    calls = []
+
+    def loader():
+        calls.append(len(calls))
+        return {'version': len(calls)}
+
+    payload = StaticPayload(loader)
+    client = payload_app(payload)
+    first = client.get('/data')
+    assert client.get('/data').headers['ETag'] == first.headers['ETag']
+    assert len(calls) == 1
+
+    payload.invalidate()
+    updated = client.get('/data', headers={'If-None-Match': first.headers['ETag']})
+    assert updated.status_code == 200
+    assert updated.get_json() == {'version': 2}
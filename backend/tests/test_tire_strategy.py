@@ -0,0 +1,91 @@
+import itertools
+
+import numpy as np
+
+from tire_strategy import (CIRCUIT_STRATEGY_FACTORS, DEFAULT_CIRCUIT_FACTORS, DEFAULT_DRIVER_PROFILE,
+                           DEFAULT_TEAM_STRATEGY, DRIVER_PROFILES, STRATEGY_OPTIONS, TEAM_STRATEGIES,
+                           WET, MIXED, DRY_HIGH_DEGRADATION, DRY_NORMAL, sample_tire_strategies)
+
+class ScriptedRng:
+    """Hands the sampler fixed draws: the Ferrari gamble, the alternative-strategy roll, the option"""
+
+    def __init__(self, gamble, alternative, choice):
+        self.uniform_draws = [gamble, alternative]
+        self.choice = choice
+
+    def random(self, n):
+        return self.uniform_draws.pop(0)
+
+    def integers(self, low, high, n):
+        return self.choice
+
+def baseline_strategy(driver, constructor, grid_position, weather, circuit_name, gamble, alternative, choice):
+    """The scalar rules the API used before the sampler was vectorized, with its random draws passed in"""
+    driver_profile = DRIVER_PROFILES.get(driver, DEFAULT_DRIVER_PROFILE)
+    team_strategy = TEAM_STRATEGIES.get(constructor, DEFAULT_TEAM_STRATEGY)
+    circuit_factors = CIRCUIT_STRATEGY_FACTORS.get(circuit_name, DEFAULT_CIRCUIT_FACTORS)
+
+    combined_aggression = (driver_profile['aggression'] + team_strategy['aggression']) / 2
+    if grid_position <= 3:
+        strategy_aggression, alternative_strategy_chance = combined_aggression * 0.7, 0.1
+    elif grid_position <= 6:
+        strategy_aggression, alternative_strategy_chance = combined_aggression * 0.85, 0.2
+    elif grid_position <= 10:
+        strategy_aggression, alternative_strategy_chance = combined_aggression * 1.0, 0.35
+    else:
+        strategy_aggression, alternative_strategy_chance = combined_aggression * 1.3, 0.5
+
+    if circuit_factors['overtaking_difficulty'] > 0.8:
+        strategy_aggression *= 1.2
+        alternative_strategy_chance += 0.15
+
+    def pick(strategies, threshold):
+        if alternative < alternative_strategy_chance:
+            return strategies['alternative'][choice]
+        if strategy_aggression > threshold:
+            return strategies['aggressive'][choice]
+        return strategies['conservative'][choice]
+
+    if weather == "Wet":
+        if driver in ['Lewis Hamilton', 'Fernando Alonso', 'Max Verstappen']:
+            strategy_aggression *= 1.2
+        return pick(STRATEGY_OPTIONS[WET], 0.7)
+    if weather == "Mixed":
+        return pick(STRATEGY_OPTIONS[MIXED], 0.7)
+
+    strategies = STRATEGY_OPTIONS[DRY_HIGH_DEGRADATION if circuit_factors['tire_wear'] > 0.7 else DRY_NORMAL]
+    if constructor == 'Mercedes':
+        strategy_aggression *= 0.8
+    elif constructor == 'Red Bull Racing':
+        strategy_aggression *= 1.1
+    elif constructor == 'Ferrari':
+        if gamble < 0.15:
+            return "Hard → Hard (Ferrari master plan 🤔)"
+
+    if driver == 'Max Verstappen' and grid_position > 5:
+        strategy_aggression *= 1.3
+    elif driver == 'Lewis Hamilton' and circuit_factors['strategy_importance'] > 0.8:
+        strategy_aggression *= 1.1
+    return pick(strategies, 0.75)
+
+def test_vectorized_sampler_follows_the_scalar_rules():
+    drivers = list(DRIVER_PROFILES) + ['Jack Doohan', 'Unknown Driver']
+    # Aliases from the feature store must not pick up their team's profile
+    constructors = list(TEAM_STRATEGIES) + ['Red Bull', 'Haas F1 Team', 'Sauber', 'Unknown Team']
+    grids = [1, 3, 4, 6, 7, 10, 11, 20]  # Both sides of every band edge
+    weathers = ['Dry', 'Wet', 'Mixed']
+    circuits = list(CIRCUIT_STRATEGY_FACTORS) + ['Bahrain International Circuit']
+
+    entries = list(itertools.product(drivers, constructors, grids, weathers, circuits))
+    driver, constructor, grid, weather, circuit = (list(column) for column in zip(*entries))
+    n = len(entries)
+    draws = np.random.default_rng(0)
+    gamble, alternative = draws.random(n), draws.random(n)
+    choice = draws.integers(0, 3, n)
+
+    sampled = sample_tire_strategies(driver, constructor, grid, weather, circuit,
+                                     ScriptedRng(gamble, alternative, choice))
+
+    expected = [baseline_strategy(*entry, gamble[i], alternative[i], choice[i]) for i, entry in enumerate(entries)]
+    mismatches = [(entries[i], sampled[i], expected[i]) for i in range(n) if sampled[i] != expected[i]]
+    assert not mismatches, mismatches[:5]
@@ -0,0 +1,238 @@
+import numpy as np
+
+from feature_store import CIRCUITS, CONSTRUCTORS, DRIVERS
+
+# Driver personality profiles based on real F1 characteristics
+DRIVER_PROFILES = {
+    # Aggressive risk-takers
+    'Max Verstappen': {'aggression': 0.9, 'risk_tolerance': 0.85, 'adaptability': 0.9},
+    'Charles Leclerc': {'aggression': 0.85, 'risk_tolerance': 0.8, 'adaptability': 0.8},
+    'Lando Norris': {'aggression': 0.75, 'risk_tolerance': 0.7, 'adaptability': 0.85},
+    'Pierre Gasly': {'aggression': 0.8, 'risk_tolerance': 0.75, 'adaptability': 0.8},
+
+    # Strategic and calculated
+    'Lewis Hamilton': {'aggression': 0.7, 'risk_tolerance': 0.6, 'adaptability': 0.95},
+    'Fernando Alonso': {'aggression': 0.75, 'risk_tolerance': 0.8, 'adaptability': 0.95},
+    'George Russell': {'aggression': 0.6, 'risk_tolerance': 0.5, 'adaptability': 0.8},
+    'Oscar Piastri': {'aggression': 0.65, 'risk_tolerance': 0.6, 'adaptability': 0.8},
+
+    # Conservative but opportunistic
+    'Carlos Sainz': {'aggression': 0.7, 'risk_tolerance': 0.65, 'adaptability': 0.75},
+    'Alex Albon': {'aggression': 0.6, 'risk_tolerance': 0.55, 'adaptability': 0.7},
+    'Nico Hülkenberg': {'aggression': 0.65, 'risk_tolerance': 0.6, 'adaptability': 0.8},
+    'Esteban Ocon': {'aggression': 0.6, 'risk_tolerance': 0.55, 'adaptability': 0.7},
+
+    # Inexperienced but eager
+    'Kimi Antonelli': {'aggression': 0.8, 'risk_tolerance': 0.9, 'adaptability': 0.6},
+    'Oliver Bearman': {'aggression': 0.75, 'risk_tolerance': 0.8, 'adaptability': 0.65},
+    'Franco Colapinto': {'aggression': 0.7, 'risk_tolerance': 0.75, 'adaptability': 0.6},
+    'Gabriel Bortoleto': {'aggression': 0.7, 'risk_tolerance': 0.8, 'adaptability': 0.6},
+    'Isack Hadjar': {'aggression': 0.75, 'risk_tolerance': 0.8, 'adaptability': 0.6},
+    'Liam Lawson': {'aggression': 0.8, 'risk_tolerance': 0.75, 'adaptability': 0.65},
+
+    # Steady and consistent
+    'Lance Stroll': {'aggression': 0.5, 'risk_tolerance': 0.4, 'adaptability': 0.6},
+    'Yuki Tsunoda': {'aggression': 0.7, 'risk_tolerance': 0.7, 'adaptability': 0.65},
+}
+DEFAULT_DRIVER_PROFILE = {'aggression': 0.6, 'risk_tolerance': 0.6, 'adaptability': 0.6}
+
+# Team strategy philosophies based on real F1 team approaches
+TEAM_STRATEGIES = {
+    'Red Bull Racing': {'aggression': 0.85, 'risk_tolerance': 0.8, 'innovation': 0.9},
+    'Ferrari': {'aggression': 0.8, 'risk_tolerance': 0.75, 'innovation': 0.7},  # Sometimes strategic errors
+    'McLaren': {'aggression': 0.7, 'risk_tolerance': 0.65, 'innovation': 0.85},
+    'Mercedes': {'aggression': 0.6, 'risk_tolerance': 0.5, 'innovation': 0.8},  # Very calculated
+    'Aston Martin': {'aggression': 0.7, 'risk_tolerance': 0.6, 'innovation': 0.8},
+    'Alpine': {'aggression': 0.75, 'risk_tolerance': 0.7, 'innovation': 0.7},
+    'Williams': {'aggression': 0.6, 'risk_tolerance': 0.8, 'innovation': 0.6},  # Risk due to position
+    'Haas': {'aggression': 0.65, 'risk_tolerance': 0.75, 'innovation': 0.5},
+    'RB': {'aggression': 0.75, 'risk_tolerance': 0.7, 'innovation': 0.75},  # Sister team influence
+    'Kick Sauber': {'aggression': 0.7, 'risk_tolerance': 0.8, 'innovation': 0.6},
+}
+DEFAULT_TEAM_STRATEGY = {'aggression': 0.6, 'risk_tolerance': 0.6, 'innovation': 0.6}
+
+# Circuit characteristics affecting strategy
+CIRCUIT_STRATEGY_FACTORS = {
+    # Overtaking difficulty affects strategy aggression
+    'Monaco Circuit': {'overtaking_difficulty': 0.95, 'tire_wear': 0.3, 'strategy_importance': 0.9},
+    'Hungaroring': {'overtaking_difficulty': 0.85, 'tire_wear': 0.4, 'strategy_importance': 0.85},
+    'Marina Bay Street Circuit': {'overtaking_difficulty': 0.8, 'tire_wear': 0.5, 'strategy_importance': 0.8},
+
+    # High tire wear circuits
+    'Circuit de Spa-Francorchamps': {'overtaking_difficulty': 0.3, 'tire_wear': 0.8, 'strategy_importance': 0.7},
+    'Silverstone Circuit': {'overtaking_difficulty': 0.4, 'tire_wear': 0.75, 'strategy_importance': 0.7},
+    'Circuit de Barcelona-Catalunya': {'overtaking_difficulty': 0.7, 'tire_wear': 0.6, 'strategy_importance': 0.8},
+
+    # Power circuits with DRS effectiveness
+    'Monza Circuit': {'overtaking_difficulty': 0.2, 'tire_wear': 0.4, 'strategy_importance': 0.5},
+    'Baku City Circuit': {'overtaking_difficulty': 0.3, 'tire_wear': 0.5, 'strategy_importance': 0.6},
+
+    # Balanced circuits
+    'Circuit Gilles Villeneuve': {'overtaking_difficulty': 0.5, 'tire_wear': 0.6, 'strategy_importance': 0.6},
+    'Circuit of the Americas': {'overtaking_difficulty': 0.4, 'tire_wear': 0.7, 'strategy_importance': 0.65},
+}
+DEFAULT_CIRCUIT_FACTORS = {'overtaking_difficulty': 0.5, 'tire_wear': 0.6, 'strategy_importance': 0.6}
+
+# Special cases layered on top of the profiles
+WET_WEATHER_MASTERS = {'Lewis Hamilton': 1.2, 'Fernando Alonso': 1.2, 'Max Verstappen': 1.2}  # More aggressive in the wet
+BEHIND_ON_GRID_ATTACKERS = {'Max Verstappen': 1.3}  # Goes aggressive when starting behind P5
+STRATEGY_CIRCUIT_SPECIALISTS = {'Lewis Hamilton': 1.1}  # Excels at strategy-critical circuits
+DRY_TEAM_MULTIPLIERS = {'Mercedes': 0.8, 'Red Bull Racing': 1.1}  # Mercedes conservative, Red Bull aggressive
+DRY_TEAM_GAMBLES = {'Ferrari': 0.15}  # Ferrari sometimes makes questionable strategy calls
+FERRARI_MASTER_PLAN = "Hard → Hard (Ferrari master plan 🤔)"
+
+# Strategy options by scenario and style
+WET, MIXED, DRY_HIGH_DEGRADATION, DRY_NORMAL = range(4)
+CONSERVATIVE, AGGRESSIVE, ALTERNATIVE = range(3)
+
+STRATEGY_OPTIONS = {
+    WET: {
+        'conservative': [
+            "Full Wet → Intermediate → Medium",
+            "Intermediate → Medium",
+            "Full Wet → Intermediate"
+        ],
+        'aggressive': [
+            "Intermediate → Soft (risky dry gamble)",
+            "Full Wet → Medium (early switch)",
+            "Intermediate → Full Wet → Soft"
+        ],
+        'alternative': [
+            "Start on Intermediates (if others on Full Wet)",
+            "Full Wet → Hard (long stint strategy)",
+            "Intermediate → Hard → Soft"
+        ]
+    },
+    MIXED: {
+        'conservative': [
+            "Intermediate → Medium → Hard",
+            "Intermediate → Hard",
+            "Medium → Hard (if track dries quickly)"
+        ],
+        'aggressive': [
+            "Intermediate → Soft → Medium",
+            "Soft → Intermediate → Soft (double switch)",
+            "Medium → Soft (aggressive dry switch)"
+        ],
+        'alternative': [
+            "Hard → Intermediate (reverse strategy)",
+            "Intermediate → Soft → Hard",
+            "Start on Mediums (dry gamble)"
+        ]
+    },
+    DRY_HIGH_DEGRADATION: {
+        'conservative': [
+            "Medium → Hard",
+            "Hard → Medium",
+            "Medium → Medium"
+        ],
+        'aggressive': [
+            "Soft → Medium → Hard",
+            "Soft → Hard",
+            "Medium → Soft (undercut attempt)"
+        ],
+        'alternative': [
+            "Hard → Soft (reverse strategy)",
+            "Soft → Medium → Medium",
+            "Medium → Hard → Soft"
+        ]
+    },
+    DRY_NORMAL: {
+        'conservative': [
+            "Medium → Hard",
+            "Soft → Medium",
+            "Hard → Medium"
+        ],
+        'aggressive': [
+            "Soft → Soft (double stint on softs)",
+            "Soft → Hard (long second stint)",
+            "Medium → Soft (late attack)"
+        ],
+        'alternative': [
+            "Hard → Soft (opposite to field)",
+            "Soft → Medium → Soft",
+            "Medium → Medium"
+        ]
+    }
+}
+
+# Grid position bands: P1-3 protect position, P4-6 balanced, P7-10 midfield, P11+ high risk
+GRID_BAND_LIMITS = np.array([3, 6, 10])
+GRID_BAND_AGGRESSION = np.array([0.7, 0.85, 1.0, 1.3])
+GRID_BAND_ALTERNATIVE_CHANCE = np.array([0.1, 0.2, 0.35, 0.5])
+
+def _compile_tables():
+    """Attach the strategy profiles to the feature store's driver, constructor and circuit tables"""
+    DRIVERS.add_columns(DRIVER_PROFILES, DEFAULT_DRIVER_PROFILE)
+    DRIVERS.add_column('wet_multiplier', WET_WEATHER_MASTERS, 1.0)
+    DRIVERS.add_column('behind_multiplier', BEHIND_ON_GRID_ATTACKERS, 1.0)
+    DRIVERS.add_column('strategy_circuit_multiplier', STRATEGY_CIRCUIT_SPECIALISTS, 1.0)
+
+    CONSTRUCTORS.add_columns(TEAM_STRATEGIES, DEFAULT_TEAM_STRATEGY)
+    CONSTRUCTORS.add_column('dry_multiplier', DRY_TEAM_MULTIPLIERS, 1.0)
+    CONSTRUCTORS.add_column('gamble_probability', DRY_TEAM_GAMBLES, 0.0)
+
+    CIRCUITS.add_columns(CIRCUIT_STRATEGY_FACTORS, DEFAULT_CIRCUIT_FACTORS)
+
+    styles = ['conservative', 'aggressive', 'alternative']
+    options = np.array([[STRATEGY_OPTIONS[scenario][style] for style in styles]
+                        for scenario in (WET, MIXED, DRY_HIGH_DEGRADATION, DRY_NORMAL)], dtype=object)
+    return options
+
+STRATEGY_TABLE = _compile_tables()
+
+def _broadcast(values, n):
+    """Repeat a per-race scalar (e.g. one circuit or weather) to one value per entry"""
+    if isinstance(values, str):
+        return [values] * n
+    return list(values)
+
+def sample_tire_strategies(drivers, constructors, grids, weather, circuits, rng):
+    """
+    Sample a personalized tire strategy for every entry of a grid in one vectorized pass.
+    weather and circuits may be a single value for the whole grid or one value per entry.
+    Applies the same rules as the scalar version: driver personality and team philosophy,
+    grid position bands, overtaking difficulty, weather and the team/driver special cases.
+    """
+    n = len(drivers)
+    driver_ids = DRIVERS.ids_of(drivers)
+    team_ids = CONSTRUCTORS.ids_of(constructors)
+    circuit_ids = CIRCUITS.ids_of(_broadcast(circuits, n))
+    weather = np.asarray(_broadcast(weather, n), dtype=object)
+    grids = np.asarray(grids, dtype=float)
+
+    wet = weather == "Wet"
+    mixed = weather == "Mixed"
+    dry = ~(wet | mixed)
+
+    # Combined driver/team aggression, scaled by grid position band
+    aggression = (DRIVERS['aggression'][driver_ids] + CONSTRUCTORS['aggression'][team_ids]) / 2
+    band = np.searchsorted(GRID_BAND_LIMITS, grids, side='left')
+    aggression = aggression * GRID_BAND_AGGRESSION[band]
+    alternative_chance = GRID_BAND_ALTERNATIVE_CHANCE[band]
+
+    # Hard to overtake - more aggressive strategy needed
+    hard_to_pass = CIRCUITS['overtaking_difficulty'][circuit_ids] > 0.8
+    aggression = np.where(hard_to_pass, aggression * 1.2, aggression)
+    alternative_chance = np.where(hard_to_pass, alternative_chance + 0.15, alternative_chance)
+
+    # Weather and team/driver special cases
+    aggression = np.where(wet, aggression * DRIVERS['wet_multiplier'][driver_ids], aggression)
+    aggression = np.where(dry, aggression * CONSTRUCTORS['dry_multiplier'][team_ids], aggression)
+    aggression = np.where(dry & (grids > 5),
+                          aggression * DRIVERS['behind_multiplier'][driver_ids], aggression)
+    aggression = np.where(dry & (CIRCUITS['strategy_importance'][circuit_ids] > 0.8),
+                          aggression * DRIVERS['strategy_circuit_multiplier'][driver_ids], aggression)
+
+    scenario = np.where(wet, WET, np.where(mixed, MIXED, np.where(
+        CIRCUITS['tire_wear'][circuit_ids] > 0.7, DRY_HIGH_DEGRADATION, DRY_NORMAL)))
+    aggressive_threshold = np.where(dry, 0.75, 0.7)
+
+    gamble = dry & (rng.random(n) < CONSTRUCTORS['gamble_probability'][team_ids])
+    style = np.where(rng.random(n) < alternative_chance, ALTERNATIVE,
+                     np.where(aggression > aggressive_threshold, AGGRESSIVE, CONSERVATIVE))
+    choice = rng.integers(0, STRATEGY_TABLE.shape[2], n)
+
+    strategies = STRATEGY_TABLE[scenario, style, choice]
+    strategies[gamble] = FERRARI_MASTER_PLAN
+    return strategies
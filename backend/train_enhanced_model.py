@@ -1,209 +1,187 @@
 import pandas as pd
 from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor, GradientBoostingRegressor
+from sklearn.ensemble import (RandomForestClassifier, RandomForestRegressor, GradientBoostingRegressor,
+                              HistGradientBoostingClassifier, HistGradientBoostingRegressor)
 from sklearn.metrics import accuracy_score, mean_squared_error, classification_report, mean_absolute_error
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 import numpy as np
+import argparse
+import gc
+import hashlib
 import os
+import pickle
+import time
 import joblib
-import random
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import dataset_cache
+from encoding import EncodingIndex, encoder_classes
+from feature_store import (CIRCUITS, CONSTRUCTORS, DRIVERS, ENHANCED_FEATURES, FEATURE_SEASON,
+                           NUMERICAL_FEATURES, numerical_feature_indices)
+from lap_store import LapStore, merge_timing_features
+from process_stats import StageProfiler
+from results_store import ResultsStore
+from model_store import (MODEL_NAMES, SUPPORT_FILES, load_manifest, model_path, new_version_id,
+                         save_model_set)
+
 # Create output folder for models
 os.makedirs("models", exist_ok=True)
 os.makedirs("logs", exist_ok=True)
 
-def enhance_weather_features(df):
+# Humidity (%) and wind speed (km/h) ranges by weather; anything else counts as dry
+WEATHER_CONDITION_RANGES = {
+    'Wet': {'humidity': (80, 95), 'wind_speed': (10, 20)},
+    'Mixed': {'humidity': (60, 85), 'wind_speed': (5, 15)},
+    'Dry': {'humidity': (30, 70), 'wind_speed': (0, 10)}
+}
+
+STREET_CIRCUITS = ['Monaco Circuit', 'Marina Bay Street Circuit', 'Baku City Circuit', 'Jeddah Corniche Circuit']
+
+# Tire strategies by scenario, each picked with equal probability
+WET_SCENARIO, MIXED_SCENARIO, DRY_STREET_SCENARIO, DRY_SCENARIO = range(4)
+TRAINING_TIRE_STRATEGIES = {
+    WET_SCENARIO: [
+        "Full Wet → Intermediate → Medium",
+        "Intermediate → Full Wet",
+        "Full Wet → Medium",
+        "Intermediate → Soft"
+    ],
+    MIXED_SCENARIO: [
+        "Intermediate → Medium → Soft",
+        "Soft → Intermediate → Hard",
+        "Medium → Intermediate → Soft"
+    ],
+    DRY_STREET_SCENARIO: [
+        "Medium → Hard",
+        "Soft → Medium → Hard",
+        "Hard → Medium",
+        "Soft → Hard"
+    ],
+    DRY_SCENARIO: [
+        "Soft → Medium",
+        "Medium → Hard",
+        "Soft → Hard",
+        "Medium → Medium"
+    ]
+}
+
+def get_rng(rng=None):
+    return rng if rng is not None else np.random.default_rng()
+
+def category_lookup(values, table, default):
+    """
+    Map a column through a small per-category table.
+    The table is evaluated once per distinct value and then gathered by category
+    code, so the cost per row is a single array index.
+    Returns the row codes and the per-category array.
+    """
+    codes, uniques = pd.factorize(values)
+    lookup = np.array([table.get(value, default) for value in uniques])
+    return codes, lookup
+
+def sample_uniform_by_weather(weather, column, rng):
+    codes, lookup = category_lookup(
+        weather, {name: ranges[column] for name, ranges in WEATHER_CONDITION_RANGES.items()},
+        WEATHER_CONDITION_RANGES['Dry'][column])
+    low, high = lookup.reshape(-1, 2)[codes].T
+    return rng.uniform(low, high)
+
+def enhance_weather_features(df, rng=None):
     """Add more sophisticated weather-related features"""
+    rng = get_rng(rng)
     
     # Temperature ranges based on circuit locations and seasons
-    def get_temperature(circuit, date=None):
-        temp_map = {
-            'Bahrain International Circuit': random.randint(25, 35),
-            'Jeddah Corniche Circuit': random.randint(28, 38),
-            'Albert Park Circuit': random.randint(18, 28),
-            'Suzuka Circuit': random.randint(15, 25),
-            'Shanghai International Circuit': random.randint(12, 22),
-            'Miami International Autodrome': random.randint(26, 35),
-            'Imola': random.randint(16, 26),
-            'Monaco Circuit': random.randint(18, 28),
-            'Circuit de Barcelona-Catalunya': random.randint(16, 26),
-            'Circuit Gilles Villeneuve': random.randint(12, 22),
-            'Red Bull Ring': random.randint(14, 24),
-            'Silverstone Circuit': random.randint(12, 22),
-            'Hungaroring': random.randint(18, 30),
-            'Circuit de Spa-Francorchamps': random.randint(10, 20),
-            'Circuit Zandvoort': random.randint(12, 22),
-            'Monza Circuit': random.randint(16, 26),
-            'Marina Bay Street Circuit': random.randint(26, 32),
-            'Baku City Circuit': random.randint(20, 30),
-            'Circuit of the Americas': random.randint(18, 28),
-            'Autódromo Hermanos Rodríguez': random.randint(16, 24),
-            'Interlagos': random.randint(18, 28),
-            'Las Vegas Strip Circuit': random.randint(10, 25),
-            'Losail International Circuit': random.randint(22, 32),
-            'Yas Marina Circuit': random.randint(24, 32)
-        }
-        return temp_map.get(circuit, random.randint(15, 25))
+    low, high = CIRCUITS.lookup('temperature_range', df['circuit']).T
+    df['temperature'] = rng.integers(low, high, endpoint=True)
     
     # Add enhanced weather features
-    df['temperature'] = df['circuit'].apply(get_temperature)
-    df['humidity'] = np.where(df['weather'] == 'Wet', 
-                              np.random.uniform(80, 95, len(df)),
-                              np.where(df['weather'] == 'Mixed',
-                                      np.random.uniform(60, 85, len(df)),
-                                      np.random.uniform(30, 70, len(df))))
-    
-    df['wind_speed'] = np.where(df['weather'] == 'Wet',
-                               np.random.uniform(10, 20, len(df)),
-                               np.where(df['weather'] == 'Mixed',
-                                       np.random.uniform(5, 15, len(df)),
-                                       np.random.uniform(0, 10, len(df))))
-    
-    df['track_temp'] = df['temperature'] + np.random.uniform(5, 25, len(df))
+    df['humidity'] = sample_uniform_by_weather(df['weather'], 'humidity', rng)
+    df['wind_speed'] = sample_uniform_by_weather(df['weather'], 'wind_speed', rng)
+    df['track_temp'] = df['temperature'] + rng.uniform(5, 25, len(df))
     
     return df
 
-def enhance_tire_strategy(df):
+# (scenario, option) table of strategy names, padded with None, and options per scenario
+TIRE_STRATEGY_TABLE = np.array([options + [None] * (4 - len(options))
+                                for _, options in sorted(TRAINING_TIRE_STRATEGIES.items())], dtype=object)
+TIRE_STRATEGY_COUNTS = np.array([len(options) for _, options in sorted(TRAINING_TIRE_STRATEGIES.items())])
+
+def enhance_tire_strategy(df, rng=None):
     """Generate realistic tire strategies"""
+    rng = get_rng(rng)
     
-    def get_strategy(weather, circuit):
-        street_circuits = ['Monaco Circuit', 'Marina Bay Street Circuit', 'Baku City Circuit', 'Jeddah Corniche Circuit']
-        
-        if weather == "Wet":
-            return random.choice([
-                "Full Wet → Intermediate → Medium",
-                "Intermediate → Full Wet",
-                "Full Wet → Medium",
-                "Intermediate → Soft"
-            ])
-        elif weather == "Mixed":
-            return random.choice([
-                "Intermediate → Medium → Soft",
-                "Soft → Intermediate → Hard",
-                "Medium → Intermediate → Soft"
-            ])
-        else:  # Dry conditions
-            if circuit in street_circuits:
-                return random.choice([
-                    "Medium → Hard",
-                    "Soft → Medium → Hard",
-                    "Hard → Medium",
-                    "Soft → Hard"
-                ])
-            else:
-                return random.choice([
-                    "Soft → Medium",
-                    "Medium → Hard",
-                    "Soft → Hard",
-                    "Medium → Medium"
-                ])
-    
-    df['tire_strategy'] = df.apply(lambda row: get_strategy(row['weather'], row['circuit']), axis=1)
+    weather_codes, weather_scenarios = category_lookup(
+        df['weather'], {'Wet': WET_SCENARIO, 'Mixed': MIXED_SCENARIO}, DRY_SCENARIO)
+    circuit_codes, street = category_lookup(df['circuit'], dict.fromkeys(STREET_CIRCUITS, True), False)
+    
+    scenario = weather_scenarios[weather_codes]
+    scenario[(scenario == DRY_SCENARIO) & street[circuit_codes]] = DRY_STREET_SCENARIO
+    
+    option = (rng.random(len(df)) * TIRE_STRATEGY_COUNTS[scenario]).astype(np.intp)
+    df['tire_strategy'] = TIRE_STRATEGY_TABLE[scenario, option]
     return df
 
-def add_driver_performance_features(df):
+def add_driver_performance_features(df, rng=None):
     """Add realistic driver performance metrics"""
+    rng = get_rng(rng)
     
-    # Modern F1 driver experience mapping
-    driver_experience = {
-        'Lewis Hamilton': 19,           # 2007–2025
-        'Fernando Alonso': 21,          # 2001–2018, 2021–2025 (break: 2019–2020)
-        'Nico Hülkenberg': 13,          # 2010–2019, 2023–2025 (break: 2020–2022)
-        'Max Verstappen': 11,           # 2015–2025
-        'Charles Leclerc': 7,           # 2018–2025
-        'Lando Norris': 7,              # 2019–2025
-        'George Russell': 6,            # 2019–2025
-        'Pierre Gasly': 8,              # 2017–2025
-        'Esteban Ocon': 8,              # 2016, 2017–2018, 2020–2025 (missed 2019)
-        'Lance Stroll': 8,              # 2017–2025
-        'Yuki Tsunoda': 5,              # 2021–2025
-        'Alex Albon': 5,                # 2019–2020, 2022–2025 (missed 2021)
-        'Carlos Sainz': 11,             # 2015–2025
-        'Oscar Piastri': 2,             # 2023–2025
-        'Kimi Antonelli': 1,            # Debuted 2025
-        'Oliver Bearman': 1,            # Partial 2024 debut, full season 2025
-        'Jack Doohan': 1,               # Debuted 2025
-        'Gabriel Bortoleto': 1,         # Debuted 2025
-        'Isack Hadjar': 1,              # Debuted 2025
-        'Liam Lawson': 2                # Partial 2023, full 2025 (missed 2024)
-    }
-    
-    # Add experience for historical drivers with random values
-    for driver in df['driver'].unique():
-        if driver not in driver_experience:
-            driver_experience[driver] = random.randint(1, 15)
+    # Form and qualifying gap come from the feature store for its season's results only;
+    # other seasons and historical drivers get random ones
+    current = DRIVERS.known_mask(df['driver']) & (df['season'] == FEATURE_SEASON).to_numpy()
     
-    df['driver_experience'] = df['driver'].map(driver_experience)
+    # Experience, drawn once per historical driver
+    codes, drivers = pd.factorize(df['driver'])
+    experience = DRIVERS.lookup('experience', drivers)
+    unknown = ~DRIVERS.known_mask(drivers)
+    experience[unknown] = rng.integers(1, 15, unknown.sum(), endpoint=True)
+    df['driver_experience'] = experience[codes]
     
     # Recent form (lower is better - average finishing position)
-    df['recent_form'] = np.random.uniform(1, 20, len(df))
+    df['recent_form'] = np.where(current, DRIVERS.lookup('form', df['driver']), rng.uniform(1, 20, len(df)))
     
     # Qualifying gap to teammate
-    df['quali_gap_to_teammate'] = np.random.uniform(-1.5, 1.5, len(df))
+    df['quali_gap_to_teammate'] = np.where(current, DRIVERS.lookup('quali_gap', df['driver']),
+                                           rng.uniform(-1.5, 1.5, len(df)))
     
     return df
 
-def add_constructor_features(df):
+def add_constructor_features(df, rng=None):
     """Add constructor performance features"""
+    rng = get_rng(rng)
     
-    # 2024/2025 constructor standings
-    constructor_standings = {
-        'McLaren': 1, 'Ferrari': 2, 'Red Bull Racing': 3, 'Red Bull': 3,
-        'Mercedes': 4, 'Aston Martin': 5, 'Alpine': 6, 'Haas F1 Team': 7, 'Haas': 7,
-        'RB': 8, 'Williams': 9, 'Kick Sauber': 10, 'Sauber': 10
-    }
-    
-    df['constructor_standing'] = df['constructor'].map(constructor_standings).fillna(10)
-    df['budget_efficiency'] = np.random.uniform(0.7, 1.0, len(df))
+    # Current standings; teams outside the feature store share the last place
+    df['constructor_standing'] = CONSTRUCTORS.lookup('standing', df['constructor'], aliases=True)
+    # Budget efficiency describes the feature store's season; other seasons draw it at random
+    current = (CONSTRUCTORS.known_mask(df['constructor'], aliases=True)
+               & (df['season'] == FEATURE_SEASON).to_numpy())
+    df['budget_efficiency'] = np.where(current,
+                                       CONSTRUCTORS.lookup('efficiency', df['constructor'], aliases=True),
+                                       rng.uniform(0.7, 1.0, len(df)))
     
     return df
 
-def add_circuit_features(df):
+def add_circuit_features(df, rng=None):
     """Add circuit characteristics"""
+    rng = get_rng(rng)
     
-    circuit_types = {
-        'Monaco Circuit': 'Street',
-        'Marina Bay Street Circuit': 'Street',
-        'Baku City Circuit': 'Street',
-        'Jeddah Corniche Circuit': 'Street',
-        'Las Vegas Strip Circuit': 'Street',
-        'Monza Circuit': 'Power',
-        'Silverstone Circuit': 'Balanced',
-        'Hungaroring': 'Twisty',
-        'Circuit de Spa-Francorchamps': 'Power'
-    }
-    
-    df['circuit_type'] = df['circuit'].map(circuit_types).fillna('Balanced')
+    df['circuit_type'] = CIRCUITS.lookup('type', df['circuit'])
     
-    # Circuit characteristics
-    df['drs_zones'] = df['circuit'].apply(lambda x: random.randint(1, 3))
-    df['lap_length'] = df['circuit'].apply(lambda x: random.uniform(3.0, 7.0))
-    df['safety_car_laps'] = np.random.poisson(3, len(df))
-    df['avg_pit_time'] = np.random.uniform(2.0, 4.5, len(df))
+    # Circuit characteristics, random where the feature store has no layout data
+    layout_known = CIRCUITS.lookup('layout_known', df['circuit'])
+    df['drs_zones'] = np.where(layout_known, CIRCUITS.lookup('drs_zones', df['circuit']),
+                               rng.integers(1, 3, len(df), endpoint=True))
+    df['lap_length'] = np.where(layout_known, CIRCUITS.lookup('lap_length', df['circuit']),
+                                rng.uniform(3.0, 7.0, len(df)))
+    df['safety_car_laps'] = rng.poisson(3, len(df))
+    df['avg_pit_time'] = rng.uniform(2.0, 4.5, len(df))
     
     return df
 
-def load_and_enhance_data():
-    """Load and enhance F1 data"""
-    
-    # Try to load existing data
-    data_files = ["data/f1_multi_year_results.csv", "data/f1_2023_results.csv"]
-    df = None
-    
-    for file in data_files:
-        if os.path.exists(file):
-            print(f"📊 Loading data from {file}")
-            df = pd.read_csv(file)
-            break
-    
-    if df is None:
-        print("❌ No data file found. Please run fetch_data.py first")
-        return None
-    
-    print(f"📈 Loaded {len(df)} race results")
+def clean_race_results(df, rng=None):
+    """Drop unusable rows and make sure every result has a weather label"""
+    rng = get_rng(rng)
     
-    # Clean data
     df = df.dropna(subset=['driver', 'constructor', 'circuit', 'grid', 'position'])
     df['grid'] = pd.to_numeric(df['grid'], errors='coerce')
     df['position'] = pd.to_numeric(df['position'], errors='coerce')
@@ -216,162 +194,490 @@ def load_and_enhance_data():
         df['weather'] = 'Dry'  # Default
         # Add some variety
         wet_circuits = ['Circuit de Spa-Francorchamps', 'Suzuka Circuit', 'Interlagos', 'Silverstone Circuit']
-        df.loc[df['circuit'].isin(wet_circuits), 'weather'] = np.random.choice(['Wet', 'Mixed', 'Dry'], 
-                                                                               size=len(df[df['circuit'].isin(wet_circuits)]),
-                                                                               p=[0.2, 0.3, 0.5])
+        wet = df['circuit'].isin(wet_circuits)
+        df.loc[wet, 'weather'] = rng.choice(['Wet', 'Mixed', 'Dry'], size=int(wet.sum()), p=[0.2, 0.3, 0.5])
+    return df
+
+# Bump whenever a feature stage changes, so cached datasets are rebuilt
+FEATURE_VERSION = 4
+
+# Race result files, in order of preference, used when there is no results store (fetch_data.py)
+DATA_FILES = ["data/f1_multi_year_results.csv", "data/f1_2023_results.csv"]
+
+CATEGORICAL_COLUMNS = ['driver', 'constructor', 'circuit', 'weather', 'tire_strategy', 'circuit_type']
+
+# Model name -> target column
+MODEL_TARGETS = {'position': 'position', 'podium': 'podium', 'points': 'points_scored', 'winner': 'winner'}
+
+MODEL_ENGINES = ['forest', 'hist', 'both']
+
+# HistGradientBoosting handles at most this many categories per column
+HIST_MAX_CATEGORIES = 255
+
+# Incremental updates: trees added to each ensemble, and how many of the most
+# recent previously trained results the new trees also see
+INCREMENTAL_TREES = 20
+INCREMENTAL_WINDOW_ROWS = 2000
+
+# Feature engineering steps applied in order by load_and_enhance_data
+ENHANCEMENT_STAGES = [
+    enhance_weather_features,
+    enhance_tire_strategy,
+    add_driver_performance_features,
+    add_constructor_features,
+    add_circuit_features
+]
+
+def results_source():
+    """The season-partitioned results store if there is one, else the first available CSV, or None"""
+    store = ResultsStore()
+    if store.exists():
+        return store.path
+    return next((file for file in DATA_FILES if os.path.exists(file)), None)
+
+def source_seasons(source):
+    """Every season in the results store or CSV, in order"""
+    if os.path.isdir(source):
+        return ResultsStore(source).seasons()
+    return sorted(pd.read_csv(source, usecols=['season'])['season'].unique().tolist())
+
+def select_seasons(source, last_seasons=None):
+    """The last_seasons most recent seasons in the source, or None for every season"""
+    if not last_seasons:
+        return None
+    return source_seasons(source)[-last_seasons:]
+
+def read_race_results(seasons=None):
+    """
+    Race results of the given seasons (None for all) as (source, raw DataFrame), or
+    (None, None). The results store only opens the selected season partitions.
+    """
+    source = results_source()
+    if source is None:
+        print("❌ No data file found. Please run fetch_data.py first")
+        return None, None
+    
+    print(f"📊 Loading data from {source}")
+    if os.path.isdir(source):
+        return source, ResultsStore(source).read(seasons)
+    df = pd.read_csv(source)
+    if seasons is not None:
+        df = df[df['season'].isin(seasons)].reset_index(drop=True)
+    return source, df
+
+def enhance_race_results(df, rng=None):
+    """Clean raw results and run every feature stage"""
+    rng = get_rng(rng)
+    df = clean_race_results(df, rng)
+    for stage in ENHANCEMENT_STAGES:
+        df = stage(df, rng)
+    return df
+
+def load_enhanced_dataset(seed=None, use_cache=True, last_seasons=None):
+    """
+    The cleaned, enhanced and downcast dataset plus a description of its source.
+    Loaded memory-mapped from the columnar cache when the source content, the
+    season selection, the seed and FEATURE_VERSION match, otherwise rebuilt from
+    the source and cached. last_seasons limits the data to the most recent seasons.
+    Each result gets its lap and pit stop summary from the lap store (NaN without
+    timing), so the key also covers the lap store's row counts.
+    Returns (DataFrame, meta) or (None, None).
+    """
+    data_file = results_source()
+    if data_file is None:
+        print("❌ No data file found. Please run fetch_data.py first")
+        return None, None
+    seasons = select_seasons(data_file, last_seasons)
+    selection = f"seasons-{seasons[0]}-{seasons[-1]}" if seasons else None
+    timing = LapStore()
+    lap_rows = {table: timing.rows(table) for table in ('laps', 'pitstops')}
+    
+    def build():
+        _, raw = read_race_results(seasons)
+        print(f"📈 Loaded {len(raw)} race results")
+        df = enhance_race_results(raw.copy(), np.random.default_rng(seed))
+        df = merge_timing_features(df, timing)
+        return df, {'data_file': data_file, 'raw_rows': len(raw), 'raw_fingerprint': dataset_fingerprint(raw)}
+    
+    df, meta, report = dataset_cache.cached_build(data_file, FEATURE_VERSION, seed, build, use_cache=use_cache,
+                                                  selection=selection, lap_rows=lap_rows)
+    meta = dict(meta, seasons=seasons)
+    if report['source'] == 'cache':
+        print(f"📦 Loaded cached dataset for {data_file}: {meta['raw_rows']} race results")
+        print(f"   ⏱️ {report['seconds'] * 1000:.1f}ms and {report['memory_mb']:.1f} MB "
+              f"(built from the source in {meta['build_seconds'] * 1000:.1f}ms and "
+              f"{meta['csv_memory_mb']:.1f} MB), RSS +{report['rss_delta_mb']} MB")
+    else:
+        print(f"   📦 Built and cached typed dataset: {report['memory_mb']:.1f} MB "
+              f"(was {report['csv_memory_mb']:.1f} MB) in {report['seconds']:.2f}s")
+    return df, meta
+
+def load_and_enhance_data(rng=None):
+    """Load and enhance F1 data"""
     
-    # Add enhanced features
-    df = enhance_weather_features(df)
-    df = enhance_tire_strategy(df)
-    df = add_driver_performance_features(df)
-    df = add_constructor_features(df)
-    df = add_circuit_features(df)
+    _, df = read_race_results()
+    if df is None:
+        return None
     
+    print(f"📈 Loaded {len(df)} race results")
+    df = enhance_race_results(df, rng)
     print(f"✅ Enhanced dataset with {len(df.columns)} features")
     return df
 
-def train_enhanced_models():
-    """Train enhanced ML models"""
+def dataset_fingerprint(raw):
+    """Hash of the (season, round, driver) keys, used to check that trained rows haven't changed"""
+    keys = pd.util.hash_pandas_object(raw[['season', 'round', 'driver']].astype(str), index=False)
+    return hashlib.sha1(keys.to_numpy().tobytes()).hexdigest()
+
+def add_targets(df):
+    df['podium'] = (df['position'] <= 3).astype(int)
+    df['points_scored'] = (df['position'] <= 10).astype(int)
+    df['winner'] = (df['position'] == 1).astype(int)
+    return df
+
+def label_values(column):
+    """Values to fit a LabelEncoder on; categoricals contribute each used category once"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.remove_unused_categories().cat.categories.astype(str)
+    return column.astype(str)
+
+def encode_column(encoding_index, col, column):
+    """Encode one categorical column, looking up each category once for categorical dtypes"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        codes = encoding_index.encode(col, column.cat.categories.astype(str))
+        return codes[column.cat.codes.to_numpy()]
+    return encoding_index.encode(col, column.astype(str))
+
+def encode_categoricals(df, label_encoders):
+    # Encode through the same index the API and CLI use at serving time
+    encoding_index = EncodingIndex.from_label_encoders(label_encoders)
+    for col in CATEGORICAL_COLUMNS:
+        df[col + '_encoded'] = encode_column(encoding_index, col, df[col])
+    return df
+
+def build_feature_matrix(df, features, label_encoders, dtype=np.float32):
+    """
+    The feature columns as one contiguous array, filled column by column.
+    Categoricals are encoded straight into the array instead of adding *_encoded
+    columns to df. float32 is the dtype the tree models train on, so fitting
+    doesn't make another converted copy per model.
+    """
+    encoding_index = EncodingIndex.from_label_encoders(label_encoders)
+    X = np.empty((len(df), len(features)), dtype=dtype)
+    for i, feature in enumerate(features):
+        col = feature[:-len('_encoded')] if feature.endswith('_encoded') else None
+        X[:, i] = encode_column(encoding_index, col, df[col]) if col in label_encoders else df[feature]
+    return X
+
+def log_memory_profile(stages, version, mode, path="logs/training_memory_log.csv"):
+    """Append one row per training stage to the memory log"""
+    rows = pd.DataFrame(stages)
+    rows.insert(0, 'mode', mode)
+    rows.insert(0, 'version', version)
+    rows.insert(0, 'timestamp', datetime.now().isoformat())
+    rows.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+
+def build_manifest(mode, data_file, raw_rows, raw_fingerprint, rows_trained, models, label_encoders, metrics,
+                   parent=None, seasons=None):
+    """
+    Describe a model set: what it was trained on and how, for incremental updates.
+    seasons is the season selection the rows came from (None for every season).
+    """
+    return {
+        'version': new_version_id(),
+        'created': datetime.now().isoformat(),
+        'mode': mode,
+        'parent': parent,
+        'data_file': data_file,
+        'seasons': seasons,
+        'raw_rows': raw_rows,
+        'raw_fingerprint': raw_fingerprint,
+        'rows_trained': int(rows_trained),
+        'trees': {name: ensemble_size(model) for name, model in models.items() if model is not None},
+        'engines': {name: type(model).__name__ for name, model in models.items() if model is not None},
+        'encoders': {col: len(encoder_classes(encoder)) for col, encoder in label_encoders.items()},
+        'metrics': {name: round(float(value), 4) for name, value in metrics.items()}
+    }
+
+def default_jobs_per_model(max_workers=None):
+    """Split the machine's cores evenly between the models that train at the same time"""
+    cores = os.cpu_count() or 1
+    return max(1, cores // (max_workers or cores))
+
+def native_categorical_mask(feature_names, label_encoders):
+    """
+    Columns HistGradientBoosting can split on as categories instead of ordinal
+    codes. It supports at most HIST_MAX_CATEGORIES values per column, so larger
+    vocabularies (e.g. every driver since 1950) stay ordinal.
+    """
+    mask = []
+    for feature in feature_names:
+        col = feature[:-len('_encoded')] if feature.endswith('_encoded') else None
+        mask.append(col in label_encoders and len(encoder_classes(label_encoders[col])) <= HIST_MAX_CATEGORIES)
+    return np.array(mask)
+
+def forest_candidates(train_winner, jobs_per_model):
+    """
+    RandomForest models for every target plus the GradientBoosting position model.
+    The slowest (single-threaded) GradientBoosting job comes first so it starts right away.
+    """
+    candidates = [
+        ('position_gb', 'position', 'GradientBoosting',
+         GradientBoostingRegressor(n_estimators=200, max_depth=8, random_state=42)),
+        ('position_rf', 'position', 'RandomForest',
+         RandomForestRegressor(n_estimators=200, max_depth=15, random_state=42, n_jobs=jobs_per_model)),
+        ('podium_rf', 'podium', 'RandomForest',
+         RandomForestClassifier(n_estimators=200, max_depth=15, random_state=42, n_jobs=jobs_per_model)),
+        ('points_rf', 'points', 'RandomForest',
+         RandomForestClassifier(n_estimators=200, max_depth=15, random_state=42, n_jobs=jobs_per_model))
+    ]
+    if train_winner:
+        candidates.append(('winner_rf', 'winner', 'RandomForest',
+                           RandomForestClassifier(n_estimators=200, max_depth=15, random_state=42,
+                                                  class_weight='balanced', n_jobs=jobs_per_model)))
+    return candidates
+
+def hist_candidates(train_winner, categorical_mask):
+    """
+    HistGradientBoosting models for every target. They bin features once and grow
+    shallow leaf-wise trees, and use OpenMP threads rather than n_jobs.
+    """
+    params = dict(max_iter=300, learning_rate=0.1, max_leaf_nodes=31, early_stopping=False,
+                  categorical_features=categorical_mask, random_state=42)
+    candidates = [
+        ('position_hgb', 'position', 'HistGradientBoosting', HistGradientBoostingRegressor(**params)),
+        ('podium_hgb', 'podium', 'HistGradientBoosting', HistGradientBoostingClassifier(**params)),
+        ('points_hgb', 'points', 'HistGradientBoosting', HistGradientBoostingClassifier(**params))
+    ]
+    if train_winner:
+        candidates.append(('winner_hgb', 'winner', 'HistGradientBoosting',
+                           HistGradientBoostingClassifier(class_weight='balanced', **params)))
+    return candidates
+
+def build_candidate_models(train_winner, jobs_per_model, engine='forest', categorical_mask=None):
+    """Every model to fit for the chosen engine, as (job name, model name, engine label, estimator)"""
+    candidates = []
+    if engine in ('forest', 'both'):
+        candidates += forest_candidates(train_winner, jobs_per_model)
+    if engine in ('hist', 'both'):
+        candidates += hist_candidates(train_winner, categorical_mask)
+    return candidates
+
+def ensemble_size(model):
+    """Number of trees (forests, GradientBoosting) or boosting iterations (HistGradientBoosting)"""
+    return int(model.n_estimators if hasattr(model, 'n_estimators') else model.max_iter)
+
+def grow_ensemble(model, add_trees):
+    """Enable warm start so the next fit adds add_trees trees/iterations to the existing ones"""
+    size_param = 'n_estimators' if hasattr(model, 'n_estimators') else 'max_iter'
+    model.set_params(warm_start=True, **{size_param: ensemble_size(model) + add_trees})
+
+def engine_report(candidates, fitted, timings, scores, X_test, batch_size=20, repeats=30):
+    """Fit time, latency per batch_size-row prediction, pickled size and test score of every candidate"""
+    batch = X_test[:batch_size]
+    report = []
+    for job, name, label, _ in candidates:
+        model = fitted[job]
+        model.predict(batch)
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            model.predict(batch)
+            samples.append(time.perf_counter() - start)
+        report.append({
+            'job': job,
+            'model': name,
+            'engine': label,
+            'fit_seconds': round(timings[job], 3),
+            'latency_ms': round(float(np.median(samples)) * 1000, 3),
+            'size_mb': round(len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)) / (1024 * 1024), 2),
+            'metric': 'rmse' if name == 'position' else 'accuracy',
+            'score': round(float(scores[job]), 4)
+        })
+    return report
+
+def fit_candidate(estimator, X_train, y_train):
+    start = time.perf_counter()
+    estimator.fit(X_train, y_train)
+    return estimator, time.perf_counter() - start
+
+def fit_candidates(candidates, X_train, targets, train_idx, max_workers=None):
+    """
+    Fit all candidates concurrently on the shared training rows.
+    Threads share X_train without copying, and tree building releases the GIL.
+    Returns the fitted models, per-model seconds and total wall-clock seconds.
+    """
+    start = time.perf_counter()
+    workers = max_workers or min(len(candidates), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {job: pool.submit(fit_candidate, estimator, X_train, targets[MODEL_TARGETS[name]][train_idx])
+                   for job, name, _, estimator in candidates}
+        results = {job: future.result() for job, future in futures.items()}
+    
+    fitted = {job: model for job, (model, _) in results.items()}
+    timings = {job: seconds for job, (_, seconds) in results.items()}
+    return fitted, timings, time.perf_counter() - start
+
+def train_enhanced_models(seed=None, max_workers=None, jobs_per_model=None, engine='forest', use_cache=True,
+                          memory_lean=False, profile_memory=False, last_seasons=None):
+    """
+    Train enhanced ML models.
+    engine picks the candidates: 'forest' (RandomForest/GradientBoosting), 'hist'
+    (HistGradientBoosting) or 'both', keeping the best candidate per target.
+    max_workers models are fitted at a time, each forest using jobs_per_model cores
+    (by default the cores are split evenly between the concurrent models).
+    use_cache=False always rebuilds the dataset from the results.
+    last_seasons trains on the most recent seasons only.
+    memory_lean builds the features as one float32 array and frees the dataset
+    before fitting. Time and RSS of every stage go to logs/training_memory_log.csv,
+    plus tracemalloc peaks with profile_memory.
+    """
     
     print("🚀 Starting Enhanced F1 ML Training...")
+    profiler = StageProfiler(trace=profile_memory)
     
     # Load and prepare data
-    df = load_and_enhance_data()
+    profiler.start('load')
+    df, source = load_enhanced_dataset(seed, use_cache, last_seasons)
     if df is None:
+        profiler.finish()
         return None
     
+    print(f"✅ Enhanced dataset with {len(df.columns)} features")
+    
     # Create target variables
-    df['podium'] = (df['position'] <= 3).astype(int)
-    df['points_scored'] = (df['position'] <= 10).astype(int)
-    df['winner'] = (df['position'] == 1).astype(int)
+    profiler.start('encode')
+    df = add_targets(df)
     
     # Encode categorical variables
     label_encoders = {}
-    categorical_cols = ['driver', 'constructor', 'circuit', 'weather', 'tire_strategy', 'circuit_type']
     
     print("🔄 Encoding categorical variables...")
-    for col in categorical_cols:
+    for col in CATEGORICAL_COLUMNS:
         le = LabelEncoder()
-        df[col + '_encoded'] = le.fit_transform(df[col].astype(str))
+        le.fit(label_values(df[col]))
         label_encoders[col] = le
         print(f"   • {col}: {len(le.classes_)} unique values")
     
     # Define feature set
-    enhanced_features = [
-        'grid', 'constructor_encoded', 'circuit_encoded', 'driver_encoded', 
-        'weather_encoded', 'tire_strategy_encoded', 'temperature', 'humidity',
-        'wind_speed', 'track_temp', 'driver_experience', 'recent_form',
-        'quali_gap_to_teammate', 'constructor_standing', 'budget_efficiency',
-        'circuit_type_encoded', 'drs_zones', 'lap_length', 'safety_car_laps',
-        'avg_pit_time'
-    ]
-    
-    X = df[enhanced_features]
-    
-    # Scale numerical features
-    numerical_features = [
-        'temperature', 'humidity', 'wind_speed', 'track_temp', 
-        'driver_experience', 'recent_form', 'quali_gap_to_teammate',
-        'budget_efficiency', 'lap_length', 'avg_pit_time'
-    ]
-    
+    profiler.start('features')
+    enhanced_features = ENHANCED_FEATURES
+    numerical_idx = numerical_feature_indices(enhanced_features)
     scaler = StandardScaler()
-    X_scaled = X.copy()
-    X_scaled[numerical_features] = scaler.fit_transform(X[numerical_features])
-    
-    models = {}
     
-    print("\n🎯 Training Models...")
+    # One shared split for every target (rows are the same for all models)
+    dataset_size = len(df)
+    train_idx, test_idx = train_test_split(np.arange(dataset_size), test_size=0.2, random_state=42)
+    targets = {target: df[target].to_numpy() for target in ['position', 'podium', 'points_scored', 'winner']}
+    winner_count = int(targets['winner'].sum())
+    
+    if memory_lean:
+        # Scale in place, split, and free the dataset before the models are fitted
+        X_scaled = build_feature_matrix(df, enhanced_features, label_encoders)
+        X_scaled[:, numerical_idx] = scaler.fit_transform(X_scaled[:, numerical_idx])
+        X_train, X_test = X_scaled[train_idx], X_scaled[test_idx]
+        del df, X_scaled
+        gc.collect()
+    else:
+        df = encode_categoricals(df, label_encoders)
+        X = df[enhanced_features]
+        
+        # Scale numerical features
+        X_scaled = X.copy()
+        X_scaled[NUMERICAL_FEATURES] = scaler.fit_transform(X[NUMERICAL_FEATURES])
+        X_train, X_test = X_scaled.iloc[train_idx], X_scaled.iloc[test_idx]
+    
+    # Winner model only if there is enough data
+    categorical_mask = native_categorical_mask(enhanced_features, label_encoders)
+    if engine in ('hist', 'both'):
+        ordinal = [col for col in CATEGORICAL_COLUMNS if col + '_encoded' in enhanced_features
+                   and not categorical_mask[enhanced_features.index(col + '_encoded')]]
+        if ordinal:
+            print(f"   ⚠️ More than {HIST_MAX_CATEGORIES} values, kept ordinal for HistGradientBoosting: {', '.join(ordinal)}")
+    candidates = build_candidate_models(winner_count > 50,
+                                        jobs_per_model or default_jobs_per_model(max_workers),
+                                        engine, categorical_mask)
+    
+    print(f"\n🎯 Training {len(candidates)} Models ({engine} engine)...")
+    profiler.start('fit')
+    fitted, timings, total_seconds = fit_candidates(candidates, X_train, targets, train_idx, max_workers)
+    
+    profiler.start('evaluate')
     
-    # 1. Position Prediction (Regression)
-    print("   📍 Training Position Prediction Model...")
-    y_pos = df['position']
-    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y_pos, test_size=0.2, random_state=42)
+    models = {}
+    metrics = {}
+    scores = {}
+    
+    # Pick the best candidate for each target on the shared test rows
+    for name, icon, label in [('position', "📍", "Position"), ('podium', "🥉", "Podium"),
+                              ('points', "🏁", "Points"), ('winner', "🏆", "Winner")]:
+        print(f"   {icon} {label} Prediction Model...")
+        jobs = [(job, engine_label) for job, model_name, engine_label, _ in candidates if model_name == name]
+        if not jobs:
+            print(f"      ⚠️ Insufficient winner data ({winner_count} winners), skipping winner model")
+            models[name] = None
+            continue
+        
+        y_test = targets[MODEL_TARGETS[name]][test_idx]
+        for job, engine_label in jobs:
+            y_pred = fitted[job].predict(X_test)
+            if name == 'position':
+                scores[job] = np.sqrt(mean_squared_error(y_test, y_pred))
+                mae = mean_absolute_error(y_test, y_pred)
+                print(f"      {engine_label} - RMSE: {scores[job]:.3f}, MAE: {mae:.3f}")
+            else:
+                scores[job] = accuracy_score(y_test, y_pred)
+                print(f"      {engine_label} - Accuracy: {scores[job]:.3f}")
+        
+        # Lowest RMSE for the position model, highest accuracy for the classifiers
+        best_job, best_label = (min if name == 'position' else max)(jobs, key=lambda item: scores[item[0]])
+        models[name] = fitted[best_job]
+        if name == 'position':
+            metrics['position_rmse'] = scores[best_job]
+            print(f"      ✅ Best Position Model: {best_label} (RMSE {scores[best_job]:.3f})")
+        else:
+            metrics[f"{name}_accuracy"] = scores[best_job]
+            print(f"      ✅ Best {label} Model: {best_label} (Accuracy {scores[best_job]:.3f})")
     
-    # Try both RandomForest and GradientBoosting
-    models_to_try = {
-        'RandomForest': RandomForestRegressor(n_estimators=200, max_depth=15, random_state=42, n_jobs=-1),
-        'GradientBoosting': GradientBoostingRegressor(n_estimators=200, max_depth=8, random_state=42)
-    }
+    best_score = metrics['position_rmse']
     
-    best_model = None
-    best_score = float('inf')
+    print("\n⏱️ Training Time (wall clock):")
+    for job, seconds in sorted(timings.items(), key=lambda item: -item[1]):
+        print(f"   {job:<14} {seconds:7.2f}s")
+    print(f"   {'total':<14} {total_seconds:7.2f}s")
     
-    for name, model in models_to_try.items():
-        model.fit(X_train, y_train)
-        y_pred = model.predict(X_test)
-        rmse = np.sqrt(mean_squared_error(y_test, y_pred))
-        mae = mean_absolute_error(y_test, y_pred)
-        print(f"      {name} - RMSE: {rmse:.3f}, MAE: {mae:.3f}")
-        
-        if rmse < best_score:
-            best_score = rmse
-            best_model = model
-    
-    models['position'] = best_model
-    print(f"      ✅ Best Position Model: RMSE {best_score:.3f}")
-    
-    # 2. Podium Prediction
-    print("   🥉 Training Podium Prediction Model...")
-    y_podium = df['podium']
-    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y_podium, test_size=0.2, random_state=42)
-    
-    clf_podium = RandomForestClassifier(n_estimators=200, max_depth=15, random_state=42, n_jobs=-1)
-    clf_podium.fit(X_train, y_train)
-    y_pred = clf_podium.predict(X_test)
-    
-    accuracy = accuracy_score(y_test, y_pred)
-    print(f"      ✅ Podium Accuracy: {accuracy:.3f}")
-    models['podium'] = clf_podium
-    
-    # 3. Points Scoring Prediction
-    print("   🏁 Training Points Prediction Model...")
-    y_points = df['points_scored']
-    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y_points, test_size=0.2, random_state=42)
-    
-    clf_points = RandomForestClassifier(n_estimators=200, max_depth=15, random_state=42, n_jobs=-1)
-    clf_points.fit(X_train, y_train)
-    y_pred = clf_points.predict(X_test)
-    
-    accuracy = accuracy_score(y_test, y_pred)
-    print(f"      ✅ Points Accuracy: {accuracy:.3f}")
-    models['points'] = clf_points
-    
-    # 4. Winner Prediction (if enough data)
-    winners_df = df[df['winner'] == 1]
-    print(f"   🏆 Training Winner Prediction Model ({len(winners_df)} winners)...")
-    
-    if len(winners_df) > 50:
-        y_winner = df['winner']
-        X_train, X_test, y_train, y_test = train_test_split(X_scaled, y_winner, test_size=0.2, random_state=42)
-        
-        clf_winner = RandomForestClassifier(n_estimators=200, max_depth=15, random_state=42, 
-                                          class_weight='balanced', n_jobs=-1)
-        clf_winner.fit(X_train, y_train)
-        y_pred = clf_winner.predict(X_test)
-        
-        accuracy = accuracy_score(y_test, y_pred)
-        print(f"      ✅ Winner Accuracy: {accuracy:.3f}")
-        models['winner'] = clf_winner
-    else:
-        print("      ⚠️ Insufficient winner data, skipping winner model")
-        models['winner'] = None
+    report = engine_report(candidates, fitted, timings, scores, X_test)
+    print("\n📋 Engine Report (latency per 20-row batch):")
+    print(f"   {'job':<14} {'engine':<22} {'fit s':>8} {'latency ms':>11} {'size MB':>9} {'score':>14}")
+    for row in report:
+        print(f"   {row['job']:<14} {row['engine']:<22} {row['fit_seconds']:>8.2f} {row['latency_ms']:>11.2f} "
+              f"{row['size_mb']:>9.2f} {row['metric']:>8} {row['score']:.3f}")
     
-    # Save models
+    # Save models as a new versioned set and make it the current one
+    profiler.start('save')
     print("\n💾 Saving Models...")
-    for name, model in models.items():
-        if model is not None:
-            filename = f"models/{name}_enhanced_model.pkl"
-            joblib.dump(model, filename)
-            print(f"   ✅ Saved {filename}")
-    
-    joblib.dump(label_encoders, "models/enhanced_label_encoders.pkl")
-    joblib.dump(scaler, "models/feature_scaler.pkl")
-    joblib.dump(enhanced_features, "models/feature_names.pkl")
+    manifest = build_manifest('full', source['data_file'], source['raw_rows'], source['raw_fingerprint'],
+                              dataset_size, models, label_encoders, metrics, seasons=source['seasons'])
+    manifest['engine_report'] = report
+    version_dir = save_model_set(models, label_encoders, scaler, enhanced_features, manifest)
+    print(f"   ✅ Saved version {manifest['version']} to {version_dir} and published it to models/")
+    print(f"   ✅ Exported {', '.join(manifest['exported']) or 'no models'} for shared loading")
+    pickle_only = [name for name, model in models.items() if model is not None and name not in manifest['exported']]
+    if pickle_only:
+        print(f"   ⚠️ {', '.join(pickle_only)} can't be compiled (HistGradientBoosting) and will load from pickle")
+    
+    stages = profiler.finish()
+    print(f"\n🧠 Memory by Stage ({'lean' if memory_lean else 'standard'} mode):")
+    print(f"   {'stage':<10} {'seconds':>8} {'RSS MB':>8} {'peak RSS MB':>12} {'traced peak MB':>15}")
+    for row in stages:
+        traced = f"{row['traced_peak_mb']:.1f}" if row['traced_peak_mb'] is not None else '-'
+        print(f"   {row['stage']:<10} {row['seconds']:>8.2f} {row['rss_mb'] or 0:>8.1f} "
+              f"{row['peak_rss_mb'] or 0:>12.1f} {traced:>15}")
+    log_memory_profile(stages, manifest['version'], 'lean' if memory_lean else 'standard')
     
     # Feature importance analysis
     print("\n📊 Feature Importance Analysis:")
-    if models['position']:
+    if hasattr(models['position'], 'feature_importances_'):
         feature_importance = pd.DataFrame({
             'feature': enhanced_features,
             'importance': models['position'].feature_importances_
@@ -385,7 +691,7 @@ def train_enhanced_models():
     print("\n🎉 Training Complete!")
     print("=" * 50)
     print("Enhanced F1 ML Models Successfully Trained")
-    print(f"Dataset Size: {len(df):,} race results")
+    print(f"Dataset Size: {dataset_size:,} race results")
     print(f"Features: {len(enhanced_features)} enhanced features")
     print(f"Models Trained: {len([m for m in models.values() if m is not None])}")
     print("=" * 50)
@@ -393,12 +699,12 @@ def train_enhanced_models():
     # Save training log
     training_log = {
         'timestamp': datetime.now().isoformat(),
-        'dataset_size': len(df),
+        'dataset_size': dataset_size,
         'features': len(enhanced_features),
         'models_trained': len([m for m in models.values() if m is not None]),
         'position_rmse': best_score,
-        'podium_accuracy': accuracy_score(y_test, clf_podium.predict(X_test)),
-        'points_accuracy': accuracy_score(y_test, clf_points.predict(X_test))
+        'podium_accuracy': metrics['podium_accuracy'],
+        'points_accuracy': metrics['points_accuracy']
     }
     
     log_df = pd.DataFrame([training_log])
@@ -406,14 +712,127 @@ def train_enhanced_models():
     
     return models, label_encoders, scaler, enhanced_features
 
+def update_enhanced_models(add_trees=INCREMENTAL_TREES, window_rows=INCREMENTAL_WINDOW_ROWS, seed=None,
+                           models_dir="models"):
+    """
+    Incremental training: grow the current ensembles with warm-start trees fitted on
+    the results added since the manifest's version (plus the most recent
+    window_rows older results for context) and save them as a new versioned set.
+    Encoders gain codes for unseen categories without renumbering existing ones and
+    the scaler is kept, so the existing trees stay valid.
+    Returns False when there is nothing new to train on.
+    """
+    start = time.perf_counter()
+    print("🔁 Starting Incremental F1 ML Update...")
+    
+    manifest = load_manifest(models_dir)
+    if manifest is None:
+        print("❌ No model manifest found. Please run a full training first")
+        return None
+    
+    # Same season selection as the set was trained on, plus any seasons added since
+    seasons = manifest.get('seasons')
+    if seasons and results_source() is not None:
+        seasons = [season for season in source_seasons(results_source()) if season >= seasons[0]]
+    data_file, raw = read_race_results(seasons)
+    if raw is None:
+        return None
+    
+    seen = manifest['raw_rows']
+    if len(raw) < seen or dataset_fingerprint(raw.iloc[:seen]) != manifest['raw_fingerprint']:
+        print("❌ Previously trained results have changed. Please run a full training instead")
+        return None
+    if len(raw) == seen:
+        print(f"✅ Models are up to date (version {manifest['version']}, {seen:,} results)")
+        return False
+    
+    new_count = len(raw) - seen
+    print(f"📈 {new_count} new race results since version {manifest['version']}")
+    
+    # Features for the new rows and the recent context window only
+    recent = raw.iloc[max(0, seen - window_rows):].copy()
+    recent['is_new'] = np.arange(len(recent)) >= len(recent) - new_count
+    df = add_targets(enhance_race_results(recent, np.random.default_rng(seed)))
+    new_rows = df['is_new'].to_numpy()
+    
+    models = {name: joblib.load(model_path(models_dir, name))
+              if os.path.exists(model_path(models_dir, name)) else None for name in MODEL_NAMES}
+    label_encoders, scaler, feature_names = (joblib.load(os.path.join(models_dir, SUPPORT_FILES[key]))
+                                             for key in ['label_encoders', 'scaler', 'feature_names'])
+    
+    print("🔄 Updating encoders...")
+    encoding_index = EncodingIndex.from_label_encoders(label_encoders)
+    for col in CATEGORICAL_COLUMNS:
+        added = encoding_index.extend(col, df[col].astype(str))
+        if added:
+            print(f"   • {col}: +{len(added)} new ({', '.join(added[:5])}{'...' if len(added) > 5 else ''})")
+    # Extended encodings are saved as their CategoryIndex, keeping the new codes after the old ones
+    label_encoders = dict(encoding_index)
+    
+    df = encode_categoricals(df, label_encoders)
+    X_scaled = df[feature_names].copy()
+    X_scaled[NUMERICAL_FEATURES] = scaler.transform(df[NUMERICAL_FEATURES])
+    
+    # How the current models do on the new races they haven't seen
+    X_new, df_new = X_scaled[new_rows], df[new_rows]
+    metrics = {'position_rmse': np.sqrt(mean_squared_error(df_new['position'], models['position'].predict(X_new)))}
+    for name in ['podium', 'points']:
+        metrics[f"{name}_accuracy"] = accuracy_score(df_new[MODEL_TARGETS[name]], models[name].predict(X_new))
+    print(f"   📍 Before update on new results - RMSE: {metrics['position_rmse']:.3f}, "
+          f"Podium: {metrics['podium_accuracy']:.3f}, Points: {metrics['points_accuracy']:.3f}")
+    
+    print(f"\n🌲 Adding {add_trees} trees per model...")
+    for name, model in models.items():
+        if model is None:
+            continue
+        y = df[MODEL_TARGETS[name]]
+        if hasattr(model, 'classes_') and y.nunique() < len(model.classes_):
+            print(f"   ⚠️ {name}: not every class appears in the update window, keeping the current model")
+            continue
+        
+        fit_start = time.perf_counter()
+        grow_ensemble(model, add_trees)
+        model.fit(X_scaled, y)
+        model.set_params(warm_start=False)
+        print(f"   ✅ {name}: {ensemble_size(model)} trees ({time.perf_counter() - fit_start:.2f}s)")
+    
+    print("\n💾 Saving Models...")
+    manifest = build_manifest('incremental', data_file, len(raw), dataset_fingerprint(raw),
+                              manifest['rows_trained'] + new_rows.sum(), models, label_encoders, metrics,
+                              parent=manifest['version'], seasons=seasons)
+    version_dir = save_model_set(models, label_encoders, scaler, feature_names, manifest, models_dir)
+    print(f"   ✅ Saved version {manifest['version']} to {version_dir} and published it to {models_dir}/")
+    print(f"\n🎉 Incremental update complete in {time.perf_counter() - start:.1f}s")
+    
+    return models, label_encoders, scaler, feature_names
+
 if __name__ == "__main__":
-    # Set random seeds for reproducibility
-    np.random.seed(42)
-    random.seed(42)
+    parser = argparse.ArgumentParser(description="Train the enhanced F1 prediction models")
+    parser.add_argument("--workers", type=int, default=None, help="Models trained at the same time")
+    parser.add_argument("--jobs-per-model", type=int, default=None, help="Cores each forest may use")
+    parser.add_argument("--no-cache", action="store_true", help="Rebuild the dataset from the results instead of the cache")
+    parser.add_argument("--engine", default="forest", choices=MODEL_ENGINES,
+                        help="Model family to train; 'both' keeps the best per target")
+    parser.add_argument("--memory-lean", action="store_true",
+                        help="Build float32 features without intermediate copies and free the dataset before fitting")
+    parser.add_argument("--last-seasons", type=int, default=None, help="Train on the N most recent seasons only")
+    parser.add_argument("--profile-memory", action="store_true", help="Also record tracemalloc peaks per stage")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Grow the current models with the results added since they were trained")
+    parser.add_argument("--add-trees", type=int, default=INCREMENTAL_TREES, help="Trees added per model (incremental)")
+    parser.add_argument("--window-rows", type=int, default=INCREMENTAL_WINDOW_ROWS,
+                        help="Earlier results the new trees also train on (incremental)")
+    args = parser.parse_args()
     
     try:
-        # Run the enhanced training
-        results = train_enhanced_models()
+        # Run the enhanced training (seeded for reproducibility)
+        if args.incremental:
+            results = update_enhanced_models(args.add_trees, args.window_rows, seed=42)
+        else:
+            results = train_enhanced_models(seed=42, max_workers=args.workers, jobs_per_model=args.jobs_per_model,
+                                            engine=args.engine, use_cache=not args.no_cache,
+                                            memory_lean=args.memory_lean, profile_memory=args.profile_memory,
+                                            last_seasons=args.last_seasons)
         
         if results:
             models, label_encoders, scaler, features = results
@@ -447,7 +866,7 @@ if __name__ == "__main__":
             
             # Scale the sample
             sample_array = np.array(sample_features).reshape(1, -1)
-            numerical_indices = [6, 7, 8, 9, 10, 11, 12, 15, 17, 19]
+            numerical_indices = numerical_feature_indices(features)
             sample_scaled = sample_array.copy()
             sample_scaled[:, numerical_indices] = scaler.transform(sample_array[:, numerical_indices])
             
@@ -470,14 +889,14 @@ if __name__ == "__main__":
             print("   2. Access predictions at http://localhost:5059/api/predict")
             print("   3. Check model status at http://localhost:5059/api/health")
             
-        else:
+        elif results is None:
             print("❌ Training failed. Please check the error messages above.")
             
     except Exception as e:
         print(f"❌ Training failed with error: {e}")
         print("\n🔧 Troubleshooting steps:")
         print("   1. Ensure you have run fetch_data.py to generate training data")
-        print("   2. Check that data/f1_multi_year_results.csv exists")
+        print("   2. Check that data/results/ or data/f1_multi_year_results.csv exists")
         print("   3. Verify all required packages are installed:")
         print("      pip install pandas scikit-learn joblib numpy")
         print("   4. Check the logs/ folder for detailed error information")